@@ -0,0 +1,113 @@
+# Measures the memory taken by trees of generated programs: the memory
+# still allocated after parsing (the tree, with lists and strings it holds)
+# and the size of node objects alone, with their attribute dicts if they
+# have any. Both are reported per node, for trees made of node objects and
+# for flat trees (my_parser.flat_ast), together with sizes of serialized
+# trees and the time taken to serialize them.
+#
+# python -m benchmarks.ast_memory --sizes 100 1000
+
+import pickle
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+import my_parser.nodes as nodes
+
+from benchmarks.generator import generate_program
+from benchmarks.suite import count_nodes
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import StringSource
+from my_parser.flat_ast import FlatTree
+from my_parser.parser import Parser
+
+KILOBYTE = 1 << 10
+
+
+def node_objects_size(program):
+
+    # like count_nodes, sums sizes of nodes instead of counting them
+    size = 0
+    pending = [program]
+
+    while pending:
+        item = pending.pop()
+
+        if isinstance(item, (list, tuple)):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif type(item).__module__ == nodes.__name__:
+            size += sys.getsizeof(item)
+            if hasattr(item, '__dict__'):
+                size += sys.getsizeof(vars(item))
+                pending.extend(vars(item).values())
+            for name in getattr(type(item), '__slots__', ()):
+                pending.append(getattr(item, name, None))
+
+    return size
+
+
+def flat_tree_size(tree):
+
+    # columns of the node table, without the side table of literals
+    columns = [tree.kinds, tree.childStarts, tree.children, tree.literalStarts, tree.literalIndexes]
+    return sum(column.itemsize * len(column) for column in columns)
+
+
+def serialize(function, tree):
+    start = time.perf_counter()
+    data = function(tree)
+    return len(data), time.perf_counter() - start
+
+
+def run(sizes):
+    for size in sizes:
+        text = generate_program(int(size * KILOBYTE))
+
+        tracemalloc.start()
+        program = Parser.from_string(text, lexerClass=RegexLexer).parse()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        count = count_nodes(program)
+        objects = node_objects_size(program)
+
+        print(f'{size:>8g} KB  {count:>10,} nodes  tree {retained / KILOBYTE:>12,.0f} KB '
+              f'({retained / count:>6.1f} B/node)  node objects {objects / KILOBYTE:>12,.0f} KB '
+              f'({objects / count:>6.1f} B/node)')
+
+        tracemalloc.start()
+        tree = FlatTree()
+        Parser(64, 256, StringSource(text), RegexLexer, nodeFactory=tree).parse()
+        flatRetained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # node counts of both trees differ, as flat trees count lists and
+        # dicts too, so both are given per node object of the parsed tree
+        columns = flat_tree_size(tree)
+
+        print(f'{size:>8g} KB  {len(tree):>10,} flat   tree {flatRetained / KILOBYTE:>12,.0f} KB '
+              f'({flatRetained / count:>6.1f} B/node)  node table   {columns / KILOBYTE:>12,.0f} KB '
+              f'({columns / count:>6.1f} B/node)')
+
+        for name, function, value in [('objects', lambda item: pickle.dumps(item, pickle.HIGHEST_PROTOCOL), program),
+                                      ('flat', FlatTree.to_bytes, tree)]:
+            try:
+                length, elapsed = serialize(function, value)
+            except RecursionError:
+                print(f'{size:>8g} KB  {name:<7} tree nested too deep to be pickled')
+                continue
+
+            print(f'{size:>8g} KB  {name:<7} serialized {length / KILOBYTE:>12,.0f} KB in {elapsed:.3f} s')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[100, 1000])
+
+    args = arg_parser.parse_args()
+
+    run(args.sizes)
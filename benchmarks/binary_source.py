@@ -0,0 +1,59 @@
+# Compares the ASCII fast path of BinaryFileSource with its UTF-8 decoding
+# path, and with the text mode TextSource. The UTF-8 input is the same text
+# with a comment containing non-ASCII chars in every block, so that no block
+# can take the fast path.
+#
+# python -m benchmarks.binary_source --size 10
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from benchmarks.lexer_engines import count_tokens, generate_source, MEGABYTE
+from benchmarks.source_backends import read_all
+from lexer.lexer import LexerMain
+from lexer.source_read import BinaryFileSource, DEFAULT_BLOCK_SIZE, TextSource
+
+NON_ASCII_COMMENT = '// zażółć gęślą jaźń\n'
+
+
+def generate_utf8_source(text):
+    lines = text.splitlines(keepends=True)
+    every = max(1, len(lines) * DEFAULT_BLOCK_SIZE // len(text) // 2)
+
+    return ''.join(line + NON_ASCII_COMMENT if index % every == 0 else line for index, line in enumerate(lines))
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(size):
+    ascii_text = generate_source(int(size * MEGABYTE))
+    inputs = [('ascii', ascii_text), ('utf-8', generate_utf8_source(ascii_text))]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, text in inputs:
+            path = os.path.join(directory, f'{name}.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+
+            for source in [BinaryFileSource, TextSource]:
+                chars, elapsed = measure(read_all, source(path))
+                print(f'{name:<6} {source.__name__:<17} read  {chars / elapsed:>14,.0f} char/s   ({elapsed:.2f} s)')
+
+                tokens, elapsed = measure(count_tokens, LexerMain(64, 256, source(path)))
+                print(f'{name:<6} {source.__name__:<17} lex   {tokens / elapsed:>14,.0f} tokens/s ({elapsed:.2f} s)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=float, default=10)
+
+    args = arg_parser.parse_args()
+
+    run(args.size)
@@ -0,0 +1,73 @@
+# Compares parsing of expressions by the chain of recursive descent methods
+# (Parser) with precedence climbing (PrattParser). Tokens are read before
+# measuring, so that only the parser is measured.
+#
+# python -m benchmarks.expression_parser --size 1000
+
+import time
+from argparse import ArgumentParser
+
+from benchmarks.generator import ProgramGenerator
+from lexer.regex_lexer import RegexLexer
+from lexer.token_stream import TokenStream
+from my_parser.parser import parser_engines
+
+KILOBYTE = 1 << 10
+
+
+# Returns tokens from a list, read by a lexer beforehand.
+class TokenListReader(TokenStream):
+    def __init__(self, tokens):
+        self.symbolTable = None
+        self.tokens = iter(tokens)
+        self.token = tokens[0]
+        self.startOffset = 0
+        self.endOffset = 0
+
+    def read_token(self):
+        return next(self.tokens)
+
+
+def generate_expressions(size, seed=0):
+
+    # one function with assignments of long, deeply nested expressions
+    generator = ProgramGenerator(seed, maxExpressionDepth=10)
+    lines = ['{\nVoid function1()\n{\n']
+    length = 0
+
+    while length < size:
+        line = f'    {generator.variable()} = {generator.assignable()};\n'
+        lines.append(line)
+        length += len(line)
+
+    lines.append('}\n}\n')
+    return ''.join(lines)
+
+
+def read_tokens(text):
+    lexer = RegexLexer.from_string(text)
+    tokens = list(lexer)
+    tokens.append(lexer.token)
+    return tokens
+
+
+def run(size, engine_names):
+    tokens = read_tokens(generate_expressions(int(size * KILOBYTE)))
+
+    for name in engine_names:
+        start = time.perf_counter()
+        parser_engines[name](None, None, lexer=TokenListReader(tokens)).parse()
+        elapsed = time.perf_counter() - start
+
+        print(f'{size:>8g} KB  {name:<8} {len(tokens) / elapsed:>14,.0f} tokens/s  ({elapsed:.2f} s)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=float, default=1000)
+    arg_parser.add_argument('--engines', nargs='+', choices=list(parser_engines), default=list(parser_engines))
+
+    args = arg_parser.parse_args()
+
+    run(args.size, args.engines)
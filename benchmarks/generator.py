@@ -0,0 +1,227 @@
+# Generates random, syntactically valid programs of a given size, following
+# the grammar accepted by Parser: classes with member variables and methods,
+# functions with nested while and if statements, blocks, function and method
+# calls, long string literals and deeply nested expressions. Programs are
+# meant for measuring the lexer and the parser, not for interpreting.
+#
+# python -m benchmarks.generator --size 1000 > program.txt
+
+import random
+import string
+from argparse import ArgumentParser
+
+parameter_types = ['Integer', 'String', 'Double', 'Boolean']
+function_types = parameter_types + ['Void']
+
+arithmetic_operators = ['+', '-', '*', '/']
+relation_operators = ['<', '<=', '>', '>=']
+equality_operators = ['==', '!=']
+
+string_chars = string.ascii_letters + string.digits + ' .,:;-_'
+
+
+class ProgramGenerator:
+    def __init__(self, seed=0, maxBlockDepth=4, maxExpressionDepth=6, maxStringLength=200):
+        self.random = random.Random(seed)
+        self.maxBlockDepth = maxBlockDepth
+        self.maxExpressionDepth = maxExpressionDepth
+        self.maxStringLength = maxStringLength
+
+        # functions and classes can not be redefined, so their names are numbered
+        self.definitions = 0
+
+    def generate(self, size):
+
+        # Returns a program of at least size chars (a little more, as the
+        # last definition is always complete).
+        parts = ['{\n']
+        length = 2
+
+        while length < size:
+            if self.random.random() < 0.2:
+                definition = self.class_definition()
+            else:
+                definition = self.function_definition()
+
+            parts.append(definition)
+            length += len(definition)
+
+        parts.append('}\n')
+        return ''.join(parts)
+
+    def name(self, prefix):
+        return f'{prefix}{self.random.randrange(100)}'
+
+    def new_definition_name(self, prefix):
+        self.definitions += 1
+        return f'{prefix}{self.definitions}'
+
+    def class_definition(self):
+        lines = [f'class {self.new_definition_name("Klasa")}\n{{\n']
+
+        for _ in range(self.random.randint(1, 4)):
+            lines.append(f'    {self.random.choice(parameter_types)} {self.name("a")}')
+            if self.random.random() < 0.5:
+                lines.append(f' = {self.expression(2)}')
+            lines.append(';\n')
+
+        for _ in range(self.random.randint(1, 3)):
+            lines.append(self.function(self.name('method'), 1))
+
+        lines.append('}\n\n')
+        return ''.join(lines)
+
+    def function_definition(self):
+        return self.function(self.new_definition_name('function'), 0) + '\n'
+
+    def function(self, name, indent):
+        parameters = ', '.join(f'{self.random.choice(parameter_types)} {"* " if self.random.random() < 0.3 else ""}'
+                               f'{self.name("p")}' for _ in range(self.random.randint(0, 3)))
+
+        header = f'{"    " * indent}{self.random.choice(function_types)} {name}({parameters})\n'
+        return header + self.block(indent, 0)
+
+    def block(self, indent, depth):
+
+        # blocks always have at least one instruction, empty ones are not
+        # allowed as function bodies and nested blocks
+        prefix = '    ' * indent
+        lines = [f'{prefix}{{\n']
+
+        for _ in range(self.random.randint(1, 6)):
+            lines.append(self.instruction(indent + 1, depth))
+
+        lines.append(f'{prefix}}}\n')
+        return ''.join(lines)
+
+    def instruction(self, indent, depth):
+        prefix = '    ' * indent
+        choice = self.random.random()
+
+        if depth < self.maxBlockDepth:
+            if choice < 0.12:
+                instruction = f'{prefix}while ({self.condition(0)})\n' + self.block(indent, depth + 1)
+                return instruction
+            if choice < 0.24:
+                instruction = f'{prefix}if ({self.condition(0)})\n' + self.block(indent, depth + 1)
+                if self.random.random() < 0.5:
+                    instruction += f'{prefix}else\n' + self.block(indent, depth + 1)
+                return instruction
+            if choice < 0.28:
+                return self.block(indent, depth + 1)
+
+        if choice < 0.40:
+            initial = f' = {self.assignable()}' if self.random.random() < 0.7 else ''
+            return f'{prefix}{self.random.choice(parameter_types)} {self.name("v")}{initial};\n'
+        if choice < 0.48:
+            return f'{prefix}return {self.assignable()};\n'
+        if choice < 0.58:
+            return f'{prefix}{self.call(0)};\n'
+
+        # comments are not instructions, so one is always followed by an assignment
+        comment = f'{prefix}// {self.string_value(60)}\n' if choice < 0.62 else ''
+        return f'{comment}{prefix}{self.variable()} = {self.assignable()};\n'
+
+    def assignable(self):
+        if self.random.random() < 0.3:
+            return self.condition(0)
+
+        return self.expression(0)
+
+    def variable(self):
+        name = self.name('v')
+        if self.random.random() < 0.2:
+            name += f'.{self.name("a")}'
+
+        return name
+
+    def call(self, depth):
+        arguments = ', '.join(self.expression(depth + 1) for _ in range(self.random.randint(0, 3)))
+
+        if self.random.random() < 0.3:
+            return f'{self.name("o")}.{self.name("method")}({arguments})'
+
+        return f'{self.name("function")}({arguments})'
+
+    def condition(self, depth):
+
+        # or of ands of equalities of relations, like in the parser
+        parts = [self.and_condition(depth) for _ in range(self.random.choice([1, 1, 2]))]
+        return ' | '.join(parts)
+
+    def and_condition(self, depth):
+        parts = [self.equality(depth) for _ in range(self.random.choice([1, 1, 2]))]
+        return ' & '.join(parts)
+
+    def equality(self, depth):
+        left = self.relation(depth)
+
+        if self.random.random() < 0.3:
+            return f'{left} {self.random.choice(equality_operators)} {self.relation(depth)}'
+
+        return left
+
+    def relation(self, depth):
+        choice = self.random.random()
+
+        if choice < 0.1:
+            return self.random.choice(['true', 'false'])
+
+        negation = '!' if choice < 0.2 else ''
+        left = self.expression(depth)
+
+        if self.random.random() < 0.6:
+            return f'{negation}{left} {self.random.choice(relation_operators)} {self.expression(depth)}'
+
+        return f'{negation}{left}'
+
+    def expression(self, depth):
+        parts = [self.primary(depth)]
+
+        for _ in range(self.random.randint(0, 2)):
+            parts.append(self.random.choice(arithmetic_operators))
+            parts.append(self.primary(depth))
+
+        return ' '.join(parts)
+
+    def primary(self, depth):
+        choice = self.random.random()
+
+        # deeper expressions are more and more likely to end with a literal
+        if depth < self.maxExpressionDepth and choice < 0.2 - depth * 0.03:
+            return f'({self.condition(depth + 1) if choice < 0.05 else self.expression(depth + 1)})'
+        if depth < self.maxExpressionDepth and choice < 0.25:
+            return self.call(depth)
+        if choice < 0.55:
+            return str(self.random.randrange(1, 100000))
+        if choice < 0.65:
+            return f'{self.random.randrange(100)}.{self.random.randrange(1000)}'
+        if choice < 0.75:
+            return f'"{self.string_value(self.random.choice([10, 30, self.maxStringLength]))}"'
+
+        return self.variable()
+
+    def string_value(self, maxLength):
+        length = self.random.randint(0, maxLength)
+        value = ''.join(self.random.choice(string_chars) for _ in range(length))
+
+        # escaped quote chars take two chars of the literal
+        if length > 10 and self.random.random() < 0.2:
+            value = value[:5] + '\\"' + value[7:]
+
+        return value
+
+
+def generate_program(size, seed=0):
+    return ProgramGenerator(seed).generate(size)
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=int, default=1000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+
+    args = arg_parser.parse_args()
+
+    print(generate_program(args.size, args.seed), end='')
@@ -0,0 +1,76 @@
+# Measures the memory still allocated after parsing generated programs,
+# with node objects made for every occurrence and with equal leaves and
+# expressions shared (my_parser.hash_consing), together with the part of
+# requested nodes, which were shared, for every interned node class.
+#
+# python -m benchmarks.hash_consing --sizes 100 1000
+
+import gc
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+import my_parser.nodes as nodes
+
+from benchmarks.generator import generate_program
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import StringSource
+from my_parser.hash_consing import NodeInterner
+from my_parser.parser import Parser
+
+KILOBYTE = 1 << 10
+
+
+def measure(text, nodeFactory):
+
+    # returns memory retained by the tree (the interning table is dropped)
+    # and the time taken to parse
+    tracemalloc.start()
+    start = time.perf_counter()
+    program = Parser(64, 256, StringSource(text), RegexLexer, nodeFactory=nodeFactory).parse()
+    elapsed = time.perf_counter() - start
+    if isinstance(nodeFactory, NodeInterner):
+        nodeFactory.clear()
+
+    # the parser and the lexer, left in reference cycles, are not counted
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return program, retained, elapsed
+
+
+def run(sizes, verbose):
+
+    # one-time allocations (of caches of the lexer, parser and interpreter
+    # itself) are made before measuring
+    for nodeFactory in [nodes, NodeInterner()]:
+        measure(generate_program(KILOBYTE), nodeFactory)
+
+    for size in sizes:
+        text = generate_program(int(size * KILOBYTE))
+
+        _, plain, plainTime = measure(text, nodes)
+
+        interner = NodeInterner()
+        _, shared, sharedTime = measure(text, interner)
+
+        print(f'{size:>8g} KB  plain {plain / KILOBYTE:>12,.0f} KB in {plainTime:.3f} s  '
+              f'shared {shared / KILOBYTE:>12,.0f} KB in {sharedTime:.3f} s  '
+              f'saved {1 - shared / plain:>6.1%}  dedup ratio {interner.dedup_ratio():>6.1%}')
+
+        if verbose:
+            for name, (requested, made) in sorted(interner.stats().items()):
+                print(f'{"":>10}  {name:<22} {requested:>10,} requested {made:>10,} made '
+                      f'({1 - made / requested:>6.1%} shared)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[100, 1000])
+    arg_parser.add_argument('--verbose', action="store_true")
+
+    args = arg_parser.parse_args()
+
+    run(args.sizes, args.verbose)
@@ -0,0 +1,58 @@
+# Compares parsing a whole generated program with parsing it incrementally
+# after small edits: one digit of an integer literal is replaced, so only
+# the function or class holding it is parsed again.
+#
+# python -m benchmarks.incremental_parser --size 1000 --edits 100
+
+import random
+import re
+import time
+from argparse import ArgumentParser
+
+from benchmarks.generator import generate_program
+from lexer.source_read import StringSource
+from my_parser.incremental_parser import IncrementalParser
+from my_parser.parser import Parser
+
+KILOBYTE = 1 << 10
+
+
+def run(size, edits, seed):
+    text = generate_program(int(size * KILOBYTE), seed)
+
+    start = time.perf_counter()
+    Parser(64, 256, StringSource(text)).parse()
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parser = IncrementalParser(text)
+    initial = time.perf_counter() - start
+
+    # digits of integer literals, which are not part of identifiers or
+    # string literals, can be replaced without making the program invalid
+    digits = [found.start() for found in re.finditer(r'(?<=[ (])[1-9](?=[0-9]*[ ;,)])', text)]
+    chosen = random.Random(seed).sample(digits, min(edits, len(digits)))
+
+    changed = 0
+    start = time.perf_counter()
+    for offset in chosen:
+        changed += len(parser.edit(offset, 1, '9' if parser.text[offset] != '9' else '8'))
+    elapsed = time.perf_counter() - start
+
+    print(f'full parse:       {full:8.3f} s')
+    print(f'initial parse:    {initial:8.3f} s')
+    print(f'edits:            {len(chosen):8,}  ({changed / max(len(chosen), 1):.2f} definitions changed per edit)')
+    print(f'per edit:         {elapsed / max(len(chosen), 1):8.3f} s  '
+          f'({full * len(chosen) / elapsed if elapsed else 0:.1f}x faster than a full parse)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=float, default=1000)
+    arg_parser.add_argument('--edits', type=int, default=100)
+    arg_parser.add_argument('--seed', type=int, default=0)
+
+    args = arg_parser.parse_args()
+
+    run(args.size, args.edits, args.seed)
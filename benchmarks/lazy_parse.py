@@ -0,0 +1,65 @@
+# Compares eager parsing of generated programs with lazy parsing, which only
+# matches braces of function bodies: time to the parsed program and memory
+# still allocated after parsing, then the time of parsing all lazy bodies,
+# like a run calling every function would.
+#
+# python -m benchmarks.lazy_parse --sizes 1000 10000
+
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from benchmarks.generator import generate_program
+from lexer.source_read import StringSource
+from my_parser.parser import Parser
+
+KILOBYTE = 1 << 10
+
+
+def measure(text, lazy):
+    start = time.perf_counter()
+    program = Parser(64, 256, StringSource(text), lazy=lazy).parse()
+    elapsed = time.perf_counter() - start
+
+    # tracing slows everything down, so memory is measured in a separate run
+    tracemalloc.start()
+    traced = Parser(64, 256, StringSource(text), lazy=lazy).parse()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+
+    return program, elapsed, retained
+
+
+def parse_bodies(program):
+    start = time.perf_counter()
+
+    for function in program.functions_dict.values():
+        function.instructions
+    for classdef in program.classes_dict.values():
+        for method in classdef.member_methods:
+            method.instructions
+
+    return time.perf_counter() - start
+
+
+def run(sizes, seed):
+    for size in sizes:
+        text = generate_program(int(size * KILOBYTE), seed)
+
+        for name, lazy in [('eager', False), ('lazy', True)]:
+            program, elapsed, retained = measure(text, lazy)
+            bodies = f'  bodies {parse_bodies(program):.2f} s' if lazy else ''
+
+            print(f'{size:>8g} KB  {name:<6} {elapsed:8.2f} s  {retained / KILOBYTE:>12,.0f} KB{bodies}')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[1000])
+    arg_parser.add_argument('--seed', type=int, default=0)
+
+    args = arg_parser.parse_args()
+
+    run(args.sizes, args.seed)
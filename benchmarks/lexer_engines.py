@@ -0,0 +1,60 @@
+# Measures tokenization throughput (tokens per second) of every lexer
+# engine on generated inputs of a given size.
+#
+# python -m benchmarks.lexer_engines --sizes 1 10
+
+import os
+import time
+from argparse import ArgumentParser
+
+from lexer.regex_lexer import lexer_engines
+from lexer.source_read import StringSource
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'test_files', 'test_code.txt')
+
+MEGABYTE = 1 << 20
+
+
+def generate_source(size):
+    with open(SAMPLE_PATH, 'r') as sample_file:
+        sample = sample_file.read()
+
+    return sample * (size // len(sample) + 1)
+
+
+def count_tokens(lexer):
+    count = 0
+
+    while not lexer.is_eot_token():
+        lexer.get_token()
+        count += 1
+
+    return count
+
+
+def run(sizes, engine_names):
+    results = []
+
+    for size in sizes:
+        text = generate_source(int(size * MEGABYTE))
+
+        for name in engine_names:
+            start = time.perf_counter()
+            tokens = count_tokens(lexer_engines[name](64, 256, StringSource(text)))
+            elapsed = time.perf_counter() - start
+
+            results.append((size, name, tokens, elapsed))
+            print(f'{size:>8} MB  {name:<10} {tokens / elapsed:>14,.0f} tokens/s  ({elapsed:.2f} s)')
+
+    return results
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[1, 10])
+    arg_parser.add_argument('--engines', nargs='+', choices=list(lexer_engines), default=list(lexer_engines))
+
+    args = arg_parser.parse_args()
+
+    run(args.sizes, args.engines)
@@ -0,0 +1,46 @@
+# Measures how parallel tokenization scales with the number of worker
+# processes, compared with the sequential LexerMain on the same text.
+#
+# python -m benchmarks.parallel_lexer --size 100 --workers 1 2 4 8
+
+import os
+import time
+from argparse import ArgumentParser
+
+from benchmarks.lexer_engines import generate_source, MEGABYTE
+from lexer.lexer import LexerMain
+from lexer.parallel_lexer import tokenize_parallel
+from lexer.source_read import StringSource
+from lexer.token_buffer import TokenBuffer
+
+
+def run(size, workers):
+    text = generate_source(int(size * MEGABYTE))
+
+    start = time.perf_counter()
+    expected = TokenBuffer.from_lexer(LexerMain(64, 256, StringSource(text)))
+    sequential = time.perf_counter() - start
+
+    print(f'tokens:           {len(expected):,}')
+    print(f'sequential:       {sequential:8.2f} s')
+
+    for count in workers:
+        start = time.perf_counter()
+        buffer = tokenize_parallel(text, workers=count)
+        elapsed = time.perf_counter() - start
+
+        if buffer.types != expected.types or buffer.starts != expected.starts:
+            raise AssertionError(f'{count} workers produced different tokens')
+
+        print(f'{count:>3} workers:      {elapsed:8.2f} s  ({sequential / elapsed:.2f}x)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=float, default=10)
+    arg_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+
+    args = arg_parser.parse_args()
+
+    run(args.size, sorted(set(args.workers)))
@@ -0,0 +1,50 @@
+# Measures how parallel parsing of top-level definitions scales with the
+# number of worker processes, compared with the sequential Parser on the
+# same generated program.
+#
+# python -m benchmarks.parallel_parser --size 10000 --workers 1 2 4 8
+
+import os
+import time
+from argparse import ArgumentParser
+
+from benchmarks.generator import generate_program
+from lexer.source_read import StringSource
+from my_parser.parallel_parser import parse_parallel
+from my_parser.parser import Parser
+
+KILOBYTE = 1 << 10
+
+
+def run(size, workers, seed):
+    text = generate_program(int(size * KILOBYTE), seed)
+
+    start = time.perf_counter()
+    expected = Parser(64, 256, StringSource(text)).parse()
+    sequential = time.perf_counter() - start
+
+    print(f'definitions:      {len(expected.functions_dict) + len(expected.classes_dict):,}')
+    print(f'sequential:       {sequential:8.2f} s')
+
+    for count in workers:
+        start = time.perf_counter()
+        program = parse_parallel(text, workers=count)
+        elapsed = time.perf_counter() - start
+
+        if list(program.functions_dict) != list(expected.functions_dict) or \
+                list(program.classes_dict) != list(expected.classes_dict):
+            raise AssertionError(f'{count} workers produced different definitions')
+
+        print(f'{count:>3} workers:      {elapsed:8.2f} s  ({sequential / elapsed:.2f}x)')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=float, default=1000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+
+    args = arg_parser.parse_args()
+
+    run(args.size, sorted(set(args.workers)), args.seed)
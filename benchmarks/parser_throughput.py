@@ -0,0 +1,74 @@
+# Measures parsing throughput (tokens and nodes per second) of every parser
+# on generated programs. Tokens are read before measuring, so that only the
+# parser is measured. Results can be saved and compared, like the ones of
+# benchmarks.suite.
+#
+# python -m benchmarks.parser_throughput --sizes 1000 10000 --output before.json
+# python -m benchmarks.parser_throughput --sizes 1000 10000 --compare before.json
+
+import json
+import time
+from argparse import ArgumentParser
+
+from benchmarks.expression_parser import read_tokens, TokenListReader
+from benchmarks.generator import generate_program
+from benchmarks.suite import count_nodes
+from my_parser.parser import parser_engines
+
+KILOBYTE = 1 << 10
+
+
+def run(sizes, engine_names, repeats):
+    results = []
+
+    for size in sizes:
+        tokens = read_tokens(generate_program(int(size * KILOBYTE)))
+
+        for name in engine_names:
+
+            # the best of several runs, as timings of a busy machine are noisy
+            elapsed = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                program = parser_engines[name](None, None, lexer=TokenListReader(tokens)).parse()
+                elapsed = min(elapsed or float('inf'), time.perf_counter() - start)
+
+            count = count_nodes(program)
+            results.append({'kilobytes': size, 'parser': name, 'tokens': len(tokens), 'nodes': count,
+                            'seconds': elapsed})
+            print(f'{size:>8g} KB  {name:<8} {len(tokens) / elapsed:>14,.0f} tokens/s '
+                  f'{count / elapsed:>14,.0f} nodes/s  ({elapsed:.2f} s)')
+
+    return results
+
+
+def compare(results, previous):
+    previousResults = {(result['kilobytes'], result['parser']): result for result in previous}
+
+    for result in results:
+        old = previousResults.get((result['kilobytes'], result['parser']))
+        if old is not None:
+            print(f'{result["kilobytes"]:>8g} KB  {result["parser"]:<8} '
+                  f'{old["seconds"] / result["seconds"]:>6.2f}x speed')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[1000, 10000])
+    arg_parser.add_argument('--engines', nargs='+', choices=list(parser_engines), default=list(parser_engines))
+    arg_parser.add_argument('--repeats', type=int, default=3)
+    arg_parser.add_argument('--output', type=str, default=None)
+    arg_parser.add_argument('--compare', type=str, default=None)
+
+    args = arg_parser.parse_args()
+
+    results = run(args.sizes, args.engines, args.repeats)
+
+    if args.compare:
+        with open(args.compare, 'r') as previous_file:
+            compare(results, json.load(previous_file))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
@@ -0,0 +1,83 @@
+# Measures reading throughput (characters per second) of every text
+# source backend on generated inputs of a given size.
+#
+# python -m benchmarks.source_backends --sizes 1 10 100
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from lexer.source_read import TextSource, StringSource, BufferedFileSource, MmapFileSource, BinaryFileSource
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'test_files', 'test_code.txt')
+
+MEGABYTE = 1 << 20
+
+
+def write_sample_file(directory, size):
+    with open(SAMPLE_PATH, 'r') as sample_file:
+        sample = sample_file.read()
+
+    path = os.path.join(directory, f'sample_{size}.txt')
+    repeats = size // len(sample) + 1
+
+    with open(path, 'w') as file:
+        file.write((sample * repeats)[:size])
+
+    return path
+
+
+def read_all(textSource):
+    count = 0
+    read_char = textSource.read_char
+    is_end_of_text = textSource.is_end_of_text
+
+    while not is_end_of_text():
+        read_char()
+        count += 1
+
+    return count
+
+
+def open_string_source(path):
+    with open(path, 'r') as file:
+        return StringSource(file.read())
+
+
+backends = {
+    'TextSource': TextSource,
+    'BufferedFileSource': BufferedFileSource,
+    'MmapFileSource': MmapFileSource,
+    'BinaryFileSource': BinaryFileSource,
+    'StringSource': open_string_source,
+}
+
+
+def run(sizes, backend_names):
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = write_sample_file(directory, int(size * MEGABYTE))
+
+            for name in backend_names:
+                start = time.perf_counter()
+                chars = read_all(backends[name](path))
+                elapsed = time.perf_counter() - start
+
+                results.append((size, name, chars, elapsed))
+                print(f'{size:>8} MB  {name:<20} {chars / elapsed:>14,.0f} char/s  ({elapsed:.2f} s)')
+
+    return results
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[1, 10, 100])
+    arg_parser.add_argument('--backends', nargs='+', choices=list(backends), default=list(backends))
+
+    args = arg_parser.parse_args()
+
+    run(args.sizes, args.backends)
@@ -0,0 +1,168 @@
+# Runs the lexer and the parser on generated programs of growing sizes and
+# measures tokens per second of LexerMain, nodes per second of Parser.parse
+# and peak memory of both. Results are saved as JSON, so that they can be
+# compared with an earlier run. A stage is flagged, when its time grows
+# faster than linearly with the input size.
+#
+# python -m benchmarks.suite --sizes 1 10 100 1000 --output results.json
+# python -m benchmarks.suite --compare results.json
+
+import json
+import math
+import platform
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+import my_parser.nodes as nodes
+
+from benchmarks.generator import generate_program
+from benchmarks.lexer_engines import count_tokens
+from lexer.lexer import LexerMain
+from lexer.source_read import StringSource
+from my_parser.parser import Parser
+
+KILOBYTE = 1 << 10
+
+# sizes in KB; 100000 (100 MB) takes a long time, so it has to be asked for
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000]
+
+# Time of a linear stage grows with exponent 1. Smaller sizes are dominated
+# by constant costs, so they are not used for the estimate.
+MAX_GROWTH_EXPONENT = 1.15
+MIN_FITTED_SIZE = 10
+
+
+def lex(text):
+    return count_tokens(LexerMain(64, 256, StringSource(text)))
+
+
+def parse(text):
+    return count_nodes(Parser(64, 256, StringSource(text)).parse())
+
+
+def count_nodes(program):
+
+    # Walks the tree without recursion, as nested expressions may be deep.
+    # Attributes of nodes are read from __dict__ or __slots__.
+    count = 0
+    pending = [program]
+
+    while pending:
+        item = pending.pop()
+
+        if isinstance(item, (list, tuple)):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif type(item).__module__ == nodes.__name__:
+            count += 1
+            if hasattr(item, '__dict__'):
+                pending.extend(vars(item).values())
+            for name in getattr(type(item), '__slots__', ()):
+                pending.append(getattr(item, name, None))
+
+    return count
+
+
+stages = {'lexer': (lex, 'tokens'), 'parser': (parse, 'nodes')}
+
+
+def measure(function, text):
+    start = time.perf_counter()
+    count = function(text)
+    elapsed = time.perf_counter() - start
+
+    # tracing slows everything down, so memory is measured in a separate run
+    tracemalloc.start()
+    function(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return count, elapsed, peak
+
+
+def growth_exponent(results, stage):
+
+    # slope of the least squares line of log(time) against log(size)
+    points = [(math.log(result['size']), math.log(result['stages'][stage]['seconds']))
+              for result in results
+              if result['kilobytes'] >= MIN_FITTED_SIZE and result['stages'][stage]['seconds'] > 0]
+
+    if len(points) < 2:
+        return None
+
+    meanX = sum(x for x, _ in points) / len(points)
+    meanY = sum(y for _, y in points) / len(points)
+    variance = sum((x - meanX) ** 2 for x, _ in points)
+
+    if variance == 0:
+        return None
+
+    return sum((x - meanX) * (y - meanY) for x, y in points) / variance
+
+
+def run(sizes, seed):
+    results = []
+
+    for size in sizes:
+        text = generate_program(int(size * KILOBYTE), seed)
+        result = {'kilobytes': size, 'size': len(text), 'stages': {}}
+
+        for name, (function, unit) in stages.items():
+            count, elapsed, peak = measure(function, text)
+
+            result['stages'][name] = {unit: count, 'seconds': elapsed, 'peak_memory': peak}
+            print(f'{size:>8g} KB  {name:<7} {count / elapsed:>14,.0f} {unit}/s  '
+                  f'{peak / KILOBYTE:>12,.0f} KB peak  ({elapsed:.2f} s)')
+
+        results.append(result)
+
+    growth = {}
+    for name in stages:
+        growth[name] = growth_exponent(results, name)
+        if growth[name] is not None and growth[name] > MAX_GROWTH_EXPONENT:
+            print(f'{name}: time grows super-linearly with input size (exponent {growth[name]:.2f})')
+
+    return {'python': platform.python_version(), 'seed': seed, 'results': results, 'growth': growth}
+
+
+def compare(report, previous):
+
+    # throughput change of every stage, for sizes present in both reports
+    previousResults = {result['kilobytes']: result for result in previous['results']}
+
+    for result in report['results']:
+        old = previousResults.get(result['kilobytes'])
+        if old is None:
+            continue
+
+        for name in stages:
+            new, before = result['stages'][name], old['stages'].get(name)
+            if before is None:
+                continue
+
+            speedup = before['seconds'] / new['seconds']
+            memory = new['peak_memory'] / before['peak_memory'] if before['peak_memory'] else 1
+            print(f'{result["kilobytes"]:>8g} KB  {name:<7} {speedup:>6.2f}x speed  {memory:>6.2f}x peak memory')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=DEFAULT_SIZES)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--output', type=str, default=None)
+    arg_parser.add_argument('--compare', type=str, default=None)
+
+    args = arg_parser.parse_args()
+
+    report = run(args.sizes, args.seed)
+
+    if args.compare:
+        with open(args.compare, 'r') as previous_file:
+            compare(report, json.load(previous_file))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
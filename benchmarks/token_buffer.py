@@ -0,0 +1,74 @@
+# Compares memory used by a list of token objects with the columnar
+# TokenBuffer for the same tokenized text, and the time of a full pass
+# over both.
+#
+# python -m benchmarks.token_buffer --size 1
+
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from benchmarks.lexer_engines import generate_source, MEGABYTE
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import StringSource
+from lexer.token_buffer import TokenBuffer
+from lexer.types import TokenType
+
+
+def tokenize_to_list(text):
+    lexer = RegexLexer(64, 256, StringSource(text))
+    tokens = []
+
+    while not lexer.is_eot_token():
+        tokens.append(lexer.get_token())
+
+    return tokens
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    result = function(*args)
+
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, current, elapsed
+
+
+def count_identifiers(tokens):
+    return sum(1 for token in tokens if token.type == TokenType.VALUE_ID)
+
+
+def run(size):
+    text = generate_source(int(size * MEGABYTE))
+
+    tokens, list_memory, list_time = measure(tokenize_to_list, text)
+    buffer, buffer_memory, buffer_time = measure(TokenBuffer.from_string, text)
+
+    print(f'tokens:           {len(tokens):,}')
+    print(f'token list:       {list_memory / MEGABYTE:8.2f} MB  ({list_time:.2f} s)')
+    print(f'token buffer:     {buffer_memory / MEGABYTE:8.2f} MB  ({buffer_time:.2f} s)')
+    print(f'                  {list_memory / buffer_memory:8.2f}x less memory')
+
+    for name, stream in [('token list', tokens), ('token buffer', buffer)]:
+        start = time.perf_counter()
+        count_identifiers(stream)
+        print(f'pass over {name:<13} {time.perf_counter() - start:.3f} s')
+
+    start = time.perf_counter()
+    identifier = TokenType.VALUE_ID.value
+    buffer.types.count(identifier)
+    print(f'pass over types array   {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    arg_parser = ArgumentParser()
+
+    arg_parser.add_argument('--size', type=float, default=1)
+
+    args = arg_parser.parse_args()
+
+    run(args.size)
@@ -5,6 +5,7 @@ class LexerError(Exception):
     def __init__(self, illegal_char, position: Position, additional_msg):
         self.illegal_char = illegal_char
         self.position = position
+        self.additional_msg = additional_msg
         self.message = f'Unable to recognize: "{self.illegal_char}" at: {self.position.print_location()}' \
                        + additional_msg
         super().__init__(self.message)
@@ -14,6 +15,7 @@ class ParserError(Exception):
     def __init__(self, illegal_token, position: Position, additional_msg):
         self.illegal_token = illegal_token
         self.position = position
+        self.additional_msg = additional_msg
         self.message = f'Unexpected: "{self.illegal_token}" at: {self.position.print_location()}' \
                        + additional_msg
         super().__init__(self.message)
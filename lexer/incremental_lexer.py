@@ -0,0 +1,152 @@
+# Keeps a tokenized source text up to date while it is being edited. After
+# an edit only a part of the text is tokenized again: from the start of the
+# last token before the edit, until a new token starts where an old token
+# (following the edit) would start after shifting. Tokenizing from a token
+# start depends only on the text after it, so from that point the old
+# tokens are still valid and only their offsets are shifted.
+#
+# The text is kept as a list of lines, and offsets after the edit are
+# shifted lazily (see lexer.token.move_pending_shift), so an edit costs time
+# proportional to the edited lines and the re-tokenized part of the text.
+
+from error.error_handlers import LexerError
+from lexer.lexer import LexerMain
+from lexer.source_read import LinesSource
+from lexer.token import LineIndex
+from lexer.token_buffer import TokenBuffer
+from lexer.types import TokenType
+
+
+def split_lines(text):
+
+    # lines with their new line chars; the last one (maybe empty) has none
+    lines = text.split('\n')
+    for index in range(len(lines) - 1):
+        lines[index] += '\n'
+
+    return lines
+
+
+class IncrementalLexer:
+    def __init__(self, text, maxIdentLength=64, maxStringLength=256, lexerClass=LexerMain):
+
+        self.maxIdentLength = maxIdentLength
+        self.maxStringLength = maxStringLength
+        self.lexerClass = lexerClass
+
+        self.lines = split_lines(text)
+        self.lineIndex = LineIndex.from_text(text)
+        self.buffer = TokenBuffer(self.lineIndex)
+
+        # tokens are out of date after an edit, which made the text invalid
+        self.upToDate = False
+
+        self.tokenize()
+
+    @property
+    def text(self):
+        return ''.join(self.lines)
+
+    def char_at(self, offset):
+        line = self.lineIndex.find_line(offset)
+        return self.lines[line][offset - self.lineIndex.line_start(line)]
+
+    def tokenize(self):
+
+        buffer = TokenBuffer(self.lineIndex)
+        for token, start, end in self.tokens_from(0):
+            buffer.append_token(token, start, end)
+
+        self.buffer = buffer
+        self.upToDate = True
+
+    def tokens_from(self, offset):
+
+        # Yields tokens with their offsets, up to the end of text token.
+        line = self.lineIndex.find_line(offset)
+        source = LinesSource(self.lines, line, offset - self.lineIndex.line_start(line))
+        lexer = self.lexerClass(self.maxIdentLength, self.maxStringLength, source, trackPositions=False)
+
+        while True:
+            try:
+                token = lexer.get_token()
+
+            # the lexer reports positions in the text tokenized from offset
+            except LexerError as error:
+                position = self.lineIndex.position(lexer.lineIndex.offset(error.position) + offset)
+                raise LexerError(error.illegal_char, position, error.additional_msg)
+
+            start = lexer.startOffset + offset
+            end = lexer.endOffset + offset
+
+            # LexerMain returns the previous token again for an unknown char,
+            # without moving forward.
+            if start == end and token.type != TokenType.EOT:
+                raise LexerError(self.char_at(start), self.lineIndex.position(start), "")
+
+            yield token, start, end
+
+            if token.type == TokenType.EOT:
+                return
+
+    def edit(self, offset, deleted, inserted):
+
+        # Replaces deleted chars at offset with the inserted text. Returns
+        # (first, oldStop, newStop): old tokens from first up to oldStop
+        # were replaced with new tokens from first up to newStop.
+        editEnd = offset + deleted
+        shift = len(inserted) - deleted
+
+        # lines holding the edit are replaced with the edited ones
+        lineIndex = self.lineIndex
+        first = lineIndex.find_line(offset)
+        last = lineIndex.find_line(editEnd)
+        firstStart = lineIndex.line_start(first)
+        lastStart = lineIndex.line_start(last)
+
+        edited = split_lines(self.lines[first][:offset - firstStart] + inserted +
+                             self.lines[last][editEnd - lastStart:])
+
+        # the next line already starts after the new line char of the last one
+        if last + 1 < len(self.lines):
+            edited.pop()
+
+        self.lines[first:last + 1] = edited
+        lineIndex.replace(offset, deleted, inserted)
+
+        # after an error whole text is tokenized again
+        if not self.upToDate:
+            oldStop = len(self.buffer)
+            self.tokenize()
+            return 0, oldStop, len(self.buffer)
+
+        buffer = self.buffer
+        tokenCount = len(buffer)
+
+        # the last token before the edit may be extended by it
+        first = buffer.find_token(offset) - 1
+        restart = buffer.start(first) if first >= 0 else 0
+        first = max(first, 0)
+
+        tokens = TokenBuffer()
+        stop = first
+
+        try:
+            for token, start, end in self.tokens_from(restart):
+
+                while stop < tokenCount and (buffer.start(stop) < editEnd or buffer.start(stop) + shift < start):
+                    stop += 1
+
+                # old tokens, from this one on, are the same
+                if buffer.start(stop) + shift == start:
+                    break
+
+                tokens.append_token(token, start, end)
+
+        except LexerError:
+            self.upToDate = False
+            raise
+
+        buffer.replace(first, stop, tokens, shift)
+
+        return first, stop, first + len(tokens)
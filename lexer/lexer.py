@@ -3,23 +3,53 @@
 import string
 
 from error.error_handlers import LexerError
-from lexer.token import Position, new_token, move_forward
+from lexer.source_read import StringSource
+from lexer.symbol_table import SymbolTable
+from lexer.token import LineIndex, Position, TokenWithSpan, new_token
+from lexer.token_stream import TokenStream
 from lexer.types import TokenType, token_type_repr
 
+# Whitespace chars, checked with a single set lookup. Empty char (end of
+# text) is a part of string.whitespace, so it is kept here too.
+whitespace_chars = frozenset(string.whitespace) | {''}
 
 # Main lexer class, containing all methods needed to generate a valid
 # lexical tokens tree from a source text. InputLexer and FileLexer
 # classes are used as a source text handlers, generalising and simplyfying
 # file processing.
-class LexerMain:
-    def __init__(self, maxIdentLength, maxStringLength, textSource=None):
+class LexerMain(TokenStream):
+    def __init__(self, maxIdentLength, maxStringLength, textSource=None, trackPositions=True, symbolTable=None):
 
         self.maxIdentLength = maxIdentLength
         self.maxStringLength = maxStringLength
         self.textSource = textSource
 
-        self.readCursorPosition = Position(row=1, column=-1)
+        # identifier values are interned in a table shared with the parser
+        self.symbolTable = symbolTable if symbolTable is not None else SymbolTable()
+
+        # without positions, tokens with no value are shared instances
+        self.trackPositions = trackPositions
+
+        # offset of current_char in the source text. Row and column are
+        # computed from it only for token starts and error messages.
+        self.offset = -1
+        self.lineIndex = LineIndex()
         self.start = Position(row=1, column=-1)
+        self.startOffset = 0
+        self.endOffset = 0
+
+        # Values of strings, comments and identifiers are spans of the source
+        # text. In-memory sources hold the whole text, so spans point into it.
+        # For other sources chars of the current lexeme are collected, which
+        # are joined once at its end.
+        if isinstance(textSource, StringSource):
+            self.spanText = textSource.text
+            self.spanBase = textSource.index
+        else:
+            self.spanText = None
+            self.spanBase = 0
+        self.lexemeStart = 0
+        self.lexemeChars = None
 
         self.token = new_token(TokenType.UNKNOWN, 0, Position(1, 0), Position(1, 0))
         self.tokenValue = ''
@@ -27,35 +57,86 @@ class LexerMain:
 
         self.get_next_char()
 
+    @classmethod
+    def from_string(cls, text, maxIdentLength=64, maxStringLength=256):
+        return cls(maxIdentLength, maxStringLength, StringSource(text))
+
+    @property
+    def readCursorPosition(self):
+        return self.lineIndex.position(self.offset)
+
     def get_next_char(self):
 
         if not self.textSource.is_end_of_text():
             self.current_char = self.textSource.read_char()
+            self.offset += 1
 
-            readCursorPosition = self.readCursorPosition
-            readCursorPosition = move_forward(self.current_char, readCursorPosition.column, readCursorPosition.row, )
-            self.readCursorPosition = readCursorPosition
+            if self.current_char == '\n':
+                self.lineIndex.add_line(self.offset + 1)
+            if self.lexemeChars is not None:
+                self.lexemeChars.append(self.current_char)
             return True
         else:
             return False
 
-    def is_eot_token(self):
-        return self.token.type == TokenType.EOT
+    def skip_to(self, offset):
+
+        # Moves reading forward to the char at offset of an in-memory text,
+        # without tokenizing chars in between. Their new lines are still
+        # added to the line index, so positions of later tokens stay right.
+        text = self.spanText
+        base = self.spanBase
+
+        new_line = text.find('\n', base + self.offset + 1, base + offset)
+        while new_line != -1:
+            self.lineIndex.add_line(new_line + 1 - base)
+            new_line = text.find('\n', new_line + 1, base + offset)
+
+        self.textSource.index = base + offset
+        self.offset = offset - 1
+        self.get_next_char()
+
+    def begin_lexeme(self):
+
+        # current char is the first char of a lexeme
+        self.lexemeStart = self.offset
+        if self.spanText is None:
+            self.lexemeChars = [self.current_char]
+
+    def end_lexeme(self, stop):
 
-    def get_token(self):
+        # Returns text, start and end of the span from the lexeme start up to
+        # (but without) the char at stop offset.
+        if self.spanText is not None:
+            return self.spanText, self.lexemeStart + self.spanBase, stop + self.spanBase
+
+        value = ''.join(self.lexemeChars[:stop - self.lexemeStart])
+        self.lexemeChars = None
+        return value, 0, len(value)
+
+    def read_token(self):
+
+        token = self.generate_token()
+
+        # offset right after the token
+        self.endOffset = self.offset
+        return token
+
+    def generate_token(self):
 
         self.tokenValue = ''
 
         self.skip_whitespaces()
 
-        self.start = self.readCursorPosition
+        self.start = self.readCursorPosition if self.trackPositions else None
+        self.startOffset = self.offset
 
         if self.generate_eot_token():
             return self.token
         if self.generate_comment_token():
             if self.token.type == TokenType.DIV:
                 return self.token
-            return self.get_token()
+            return self.generate_token()
         if self.generate_string_token():
             return self.token
         if self.generate_keyword_or_ident_token():
@@ -69,7 +150,7 @@ class LexerMain:
 
     def skip_whitespaces(self):
 
-        while str(self.current_char) in string.whitespace and not self.textSource.is_end_of_text():
+        while self.current_char in whitespace_chars and not self.textSource.is_end_of_text():
             self.get_next_char()
 
     def generate_unknown_token_placeholder(self):
@@ -80,7 +161,8 @@ class LexerMain:
     def generate_eot_token(self):
 
         if self.textSource.is_end_of_text():
-            self.token = new_token(TokenType.EOT, self.tokenValue, self.readCursorPosition, self.readCursorPosition)
+            stop = self.readCursorPosition
+            self.token = new_token(TokenType.EOT, self.tokenValue, stop, stop)
             return self.token
 
     def generate_comment_token(self):
@@ -98,12 +180,12 @@ class LexerMain:
         else:
             # second char is "/". Returns valid VALUE_COMMENT token, generated from // chars to end of line.
             self.get_next_char()
+            self.begin_lexeme()
 
             while self.current_char != '\n' and not self.textSource.is_end_of_text():
-                self.tokenValue += self.current_char
                 self.get_next_char()
 
-            self.token = new_token(TokenType.VALUE_COMMENT, self.tokenValue, self.start)
+            self.token = TokenWithSpan(TokenType.VALUE_COMMENT, *self.end_lexeme(self.offset), self.start)
 
         return self.token
 
@@ -114,30 +196,33 @@ class LexerMain:
             return None
 
         self.get_next_char()
+        self.begin_lexeme()
         stringLength = self.maxStringLength
 
         # gets all chars until second, unescaped quote char appears
         while self.current_char != '\"' and stringLength > 0 and not self.textSource.is_end_of_text():
 
-            # escapes quote char or anything else, if needed. Doesnt write slash char to
-            # the string value.
+            # escapes quote char or anything else, if needed. Escapes are
+            # processed when the value is accessed.
             if self.current_char == "\\":
                 self.get_next_char()
 
-            self.tokenValue += self.current_char
             self.get_next_char()
 
             stringLength -= 1
 
         # Encountered a string that exceeds max allowed length. Raises an error.
         if stringLength <= 0:
+            self.lexemeChars = None
             stop = self.readCursorPosition
             raise LexerError(self.current_char, stop, " (Exceeded maximum length of a string literal)")
 
+        span = self.end_lexeme(self.offset)
+
         # escapes second quote char
         self.get_next_char()
 
-        self.token = new_token(TokenType.VALUE_STRING, self.tokenValue, self.start)
+        self.token = TokenWithSpan(TokenType.VALUE_STRING, *span, self.start)
 
         return self.token
 
@@ -148,26 +233,34 @@ class LexerMain:
             return None
 
         identLength = self.maxIdentLength
+        self.begin_lexeme()
+        stop = None
 
         # gets all valid chars until max length is reached and value is cut short
         while (self.current_char.isalnum() or self.current_char == '_') and identLength > 0:
-            self.tokenValue += self.current_char
             if not self.get_next_char():
+
+                # end of text, the current char is the last char of the identifier
+                stop = self.offset + 1
                 break
             identLength -= 1
 
         # Encountered an identifier that exceeds max allowed length. Raises an error.
         if identLength <= 0:
+            self.lexemeChars = None
             stop = self.readCursorPosition
             raise LexerError(self.current_char, stop, " (Exceeded maximum length of a identifier literal)")
 
+        text, spanStart, spanEnd = self.end_lexeme(self.offset if stop is None else stop)
+        self.tokenValue = text[spanStart:spanEnd]
+
         # checks whether or not token might be a keyword or not
         value = token_type_repr.get(self.tokenValue)
 
         if value:
             self.token = new_token(value, self.tokenValue, self.start)
         else:
-            self.token = new_token(TokenType.VALUE_ID, self.tokenValue, self.start)
+            self.token = new_token(TokenType.VALUE_ID, self.symbolTable.intern(self.tokenValue), self.start)
 
         return self.token
 
@@ -6,8 +6,11 @@
 
 from argparse import ArgumentParser
 
-from lexer.lexer import LexerMain
-from lexer.source_read import TextSource
+from lexer.parallel_lexer import tokenize_parallel
+from lexer.regex_lexer import lexer_engines
+from lexer.source_read import open_source
+
+BATCH_SIZE = 1024
 
 if __name__ == '__main__':
 
@@ -17,17 +20,37 @@ if __name__ == '__main__':
     parser.add_argument('--file_path', type=str, default='test_files/test_code.txt')
     parser.add_argument('--ident_length', type=int, default=64)
     parser.add_argument('--string_length', type=int, default=256)
+    parser.add_argument('--engine', choices=list(lexer_engines), default='default')
+    parser.add_argument('--validate', action="store_true")
+    parser.add_argument('--jobs', type=int, default=1)
 
     args = parser.parse_args()
 
-    textSource = TextSource(args.file_path)
+    textSource = open_source(args.file_path)
+
+    if args.jobs > 1:
+        # the whole text is tokenized up front, by several processes
+        buffer = tokenize_parallel(textSource.read_rest(), args.ident_length, args.string_length,
+                                   workers=args.jobs, lexerClass=lexer_engines[args.engine])
+        lexer = buffer.reader()
+    else:
+        # validation only checks that the text can be tokenized, so token
+        # positions are not tracked and tokens without a value are shared.
+        lexer = lexer_engines[args.engine](args.ident_length, args.string_length, textSource,
+                                           trackPositions=not args.validate)
+
+    if args.validate:
+        count = 0
+        batch = lexer.get_tokens(BATCH_SIZE)
+        while batch:
+            count += len(batch)
+            batch = lexer.get_tokens(BATCH_SIZE)
 
-    lexer = LexerMain(args.ident_length, args.string_length, textSource)
+        print(f'Valid text, {count} tokens.')
 
-    while not lexer.is_eot_token():
+    for token in lexer:
 
         if args.verbose:
-            token = lexer.get_token()
             print(f'{token},  token type: {token.type},  {token.print_location()}')
         else:
-            print(lexer.get_token())
+            print(token)
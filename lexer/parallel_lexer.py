@@ -0,0 +1,127 @@
+# Tokenizes very large source texts on several processes. The text is split
+# into chunks right after new line chars, which a cheap pre-scan proves to
+# lie outside of string literals (comments always end at a new line, so
+# only strings can span several lines). Every chunk is tokenized by its own
+# lexer into a TokenBuffer with offsets shifted by the chunk start, and the
+# buffers are stitched together in order. Rows and columns of the stitched
+# tokens are computed from one LineIndex of the whole text, so the result is
+# identical to the sequential LexerMain output.
+
+import os
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from error.error_handlers import LexerError
+from lexer.lexer import LexerMain
+from lexer.source_read import StringSource
+from lexer.token import LineIndex, Position
+from lexer.token_buffer import TokenBuffer
+from lexer.types import TokenType
+
+# string literals and comments, matched the same way as the lexers read them
+prescan_pattern = re.compile(r'"(?:[^"\\]|\\[\s\S]?)*"?|//[^\n]*')
+
+
+def find_string_spans(text):
+
+    # Only string literals containing a new line can make a split unsafe.
+    spans = []
+    for found in prescan_pattern.finditer(text):
+        start, end = found.span()
+        if text.find('\n', start, end) != -1:
+            spans.append((start, end))
+
+    return spans
+
+
+def find_split_offsets(text, chunkCount):
+
+    # Returns offsets of chunk starts (after the first one, which is 0).
+    # Every offset follows a new line char outside of a string literal.
+    spans = find_string_spans(text)
+    spanStarts = [start for start, _ in spans]
+
+    offsets = []
+    position = 0
+
+    for chunk in range(1, chunkCount):
+        position = max(position, len(text) * chunk // chunkCount)
+
+        while True:
+            new_line = text.find('\n', position)
+            if new_line == -1:
+                return offsets
+
+            index = bisect_right(spanStarts, new_line) - 1
+            if index >= 0 and new_line < spans[index][1]:
+                position = spans[index][1]
+                continue
+
+            position = new_line + 1
+            break
+
+        if position < len(text):
+            offsets.append(position)
+
+    return offsets
+
+
+def tokenize_chunk(text, base, maxIdentLength, maxStringLength, lexerClass):
+
+    # Runs in a worker process. LexerErrors can not be sent back as they are
+    # (they are not picklable), so their contents are returned instead.
+    lexer = lexerClass(maxIdentLength, maxStringLength, StringSource(text), trackPositions=False)
+    buffer = TokenBuffer()
+
+    try:
+        while True:
+            token = lexer.get_token()
+            if token.type == TokenType.EOT:
+                return buffer, None
+
+            # LexerMain returns the previous token again for an unknown char,
+            # without moving forward.
+            if lexer.startOffset == lexer.endOffset:
+                position = lexer.lineIndex.position(lexer.startOffset)
+                return None, (text[lexer.startOffset], position.row, position.column, "")
+
+            buffer.append_token(token, lexer.startOffset + base, lexer.endOffset + base)
+
+    except LexerError as error:
+        return None, (error.illegal_char, error.position.row, error.position.column, error.additional_msg)
+
+
+def tokenize_parallel(text, maxIdentLength=64, maxStringLength=256, workers=None, chunkCount=None,
+                      lexerClass=LexerMain):
+
+    workers = workers or os.cpu_count() or 1
+    chunkCount = chunkCount or workers
+
+    starts = [0] + find_split_offsets(text, chunkCount)
+    stops = starts[1:] + [len(text)]
+    arguments = [(text[start:stop], start, maxIdentLength, maxStringLength, lexerClass)
+                 for start, stop in zip(starts, stops)]
+
+    if workers == 1:
+        results = [tokenize_chunk(*chunk) for chunk in arguments]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(tokenize_chunk, *zip(*arguments)))
+
+    lineIndex = LineIndex.from_text(text)
+    buffer = TokenBuffer(lineIndex)
+
+    for start, (chunkBuffer, error) in zip(starts, results):
+
+        # the first error in the text is raised, like in the sequential lexer
+        if error is not None:
+            char, row, column, additional_msg = error
+            rowShift = bisect_left(lineIndex.lineStarts, start)
+            raise LexerError(char, Position(row + rowShift, column), additional_msg)
+
+        buffer.extend(chunkBuffer)
+
+    buffer.append(TokenType.EOT, len(text), len(text))
+
+    return buffer
@@ -0,0 +1,223 @@
+# Contains an alternative lexer engine, which reads the whole source text
+# at once and recognizes lexemes with a single compiled master regular
+# expression, built from token_type_repr. Produces the same token stream
+# and raises the same LexerErrors as LexerMain.
+
+import re
+import string
+
+from error.error_handlers import LexerError
+from lexer.lexer import LexerMain
+from lexer.source_read import StringSource
+from lexer.symbol_table import SymbolTable
+from lexer.token import LineIndex, Position, Token, TokenWithSpan, TokenWithValue, escape_pattern, new_token, \
+    shared_tokens
+from lexer.token_stream import TokenStream
+from lexer.types import TokenType, token_type_repr
+
+
+def _build_special_chars_pattern():
+
+    # single special chars and two char operators, longest first, so that
+    # "<=" is matched before "<". Quote char starts a string literal and is
+    # handled separately.
+    special_chars = [key for key in token_type_repr
+                     if not any(char.isalnum() or char.isspace() for char in key) and key != '"']
+    special_chars.sort(key=len, reverse=True)
+
+    return '|'.join(re.escape(key) for key in special_chars)
+
+
+# Whitespace other than new line chars is matched as a prefix of every
+# lexeme, new lines are matched separately to keep track of rows.
+inline_whitespace = re.escape(string.whitespace.replace('\n', ''))
+
+master_pattern = re.compile(
+    r'[' + inline_whitespace + r']*(?:'
+    r'(?P<new_line>\n[' + re.escape(string.whitespace) + r']*)'
+    r'|(?P<comment>//[^\n]*)'
+    r'|(?P<string>"(?P<string_value>(?:[^"\\]|\\[\s\S]?)*)"?)'
+    r'|(?P<ident>[^\W\d]\w*)'
+    r'|(?P<zero>0(?:\.(?P<zero_decimal>[0-9]*))?)'
+    r'|(?P<number>(?P<integer>[1-9][0-9]*)(?:\.(?P<decimal>[0-9]*))?)'
+    r'|(?P<special>' + _build_special_chars_pattern() + r')'
+    r'|(?P<end_of_text>\Z))'
+)
+
+
+class RegexLexer(TokenStream):
+    def __init__(self, maxIdentLength, maxStringLength, textSource=None, trackPositions=True, symbolTable=None):
+
+        self.maxIdentLength = maxIdentLength
+        self.maxStringLength = maxStringLength
+        self.textSource = textSource
+        self.symbolTable = symbolTable if symbolTable is not None else SymbolTable()
+        self.trackPositions = trackPositions
+
+        self.text = textSource.read_rest()
+        self._lineIndex = None
+
+        # offsets of the last returned token
+        self.startOffset = 0
+        self.endOffset = 0
+
+        self.token = new_token(TokenType.UNKNOWN, 0, Position(1, 0), Position(1, 0))
+        self.tokens = self.generate_tokens()
+
+    @classmethod
+    def from_string(cls, text, maxIdentLength=64, maxStringLength=256):
+        return cls(maxIdentLength, maxStringLength, StringSource(text))
+
+    def read_token(self):
+        return next(self.tokens)
+
+    @property
+    def lineIndex(self):
+        if self._lineIndex is None:
+            self._lineIndex = LineIndex.from_text(self.text)
+
+        return self._lineIndex
+
+    def position_at(self, offset):
+        return self.lineIndex.position(offset)
+
+    def char_at(self, offset):
+        return self.text[offset:offset + 1]
+
+    def generate_tokens(self):
+
+        text = self.text
+        keywords = token_type_repr.get
+        intern = self.symbolTable.intern
+        maxIdentLength = self.maxIdentLength
+        VALUE_ID = TokenType.VALUE_ID
+        VALUE_INT = TokenType.VALUE_INT
+        trackPositions = self.trackPositions
+
+        position = 0
+        row = 1
+        line_start = 0
+
+        # finditer skips unknown chars, so every gap between two matches is
+        # reported as an error.
+        for found in master_pattern.finditer(text):
+
+            if found.start() != position:
+                raise LexerError(text[position], self.position_at(position), "")
+
+            kind = found.lastgroup
+            end = found.end()
+
+            if kind == 'new_line':
+                row += text.count('\n', position, end)
+                line_start = text.rfind('\n', position, end) + 1
+
+                position = end
+                continue
+
+            if kind == 'comment' or kind == 'end_of_text':
+                position = end
+                continue
+
+            position = found.start(kind)
+            start = Position(row, position - line_start) if trackPositions else None
+
+            if kind == 'ident':
+                value = found.group(kind)
+
+                # Encountered an identifier that exceeds max allowed length. Raises an error.
+                if len(value) >= maxIdentLength:
+                    stop = position + maxIdentLength
+                    raise LexerError(self.char_at(stop), self.position_at(stop),
+                                     " (Exceeded maximum length of a identifier literal)")
+
+                token_type = keywords(value)
+                if token_type is None:
+                    token = TokenWithValue(VALUE_ID, intern(value), start)
+                else:
+                    token = new_token(token_type, value, start)
+
+            elif kind == 'special':
+                token_type = keywords(found.group(kind))
+                token = Token(token_type, start) if trackPositions else shared_tokens[token_type]
+
+            elif kind == 'string':
+                token = self.generate_string_token(found, start)
+
+                # string literals may span multiple lines
+                new_lines = text.count('\n', position, end)
+                if new_lines:
+                    row += new_lines
+                    line_start = text.rfind('\n', position, end) + 1
+
+            elif kind == 'zero':
+                decimal = found.group('zero_decimal')
+
+                if decimal is not None:
+                    token = new_token(TokenType.VALUE_DOUBLE, 0, start, int(decimal or 0), len(decimal))
+                elif text[end:end + 1].isdigit():
+                    raise LexerError('0', self.position_at(end), "")
+                else:
+                    token = new_token(TokenType.VALUE_INT, 0, start)
+
+            else:
+                integer = int(found.group('integer'))
+                decimal = found.group('decimal')
+
+                if decimal is not None:
+                    token = new_token(TokenType.VALUE_DOUBLE, integer, start, int(decimal or 0), len(decimal))
+                else:
+                    token = TokenWithValue(VALUE_INT, integer, start)
+
+            self.startOffset = position
+            self.endOffset = end
+            position = end
+            yield token
+
+        if position < len(text):
+            raise LexerError(text[position], self.position_at(position), "")
+
+        # End of text is returned on every following call, like in LexerMain.
+        stop = Position(row, position - line_start)
+        self.startOffset = self.endOffset = position
+        while True:
+            yield new_token(TokenType.EOT, '', stop, stop)
+
+    def generate_string_token(self, found, start):
+
+        value_start, value_end = found.span('string_value')
+
+        if self.text.find('\\', value_start, value_end) == -1:
+            length = value_end - value_start
+
+            # Encountered a string that exceeds max allowed length. Raises an error.
+            if length >= self.maxStringLength:
+                stop = value_start + self.maxStringLength
+                raise LexerError(self.char_at(stop), self.position_at(stop),
+                                 " (Exceeded maximum length of a string literal)")
+
+            return TokenWithSpan(TokenType.VALUE_STRING, self.text, value_start, value_end, start)
+
+        # escaped char counts as a single char of a string literal
+        escapes = sum(1 for escape in escape_pattern.finditer(self.text, value_start, value_end) if escape.group(1))
+        length = value_end - value_start - escapes
+
+        if length >= self.maxStringLength:
+            stop = value_start
+            remaining = self.maxStringLength
+
+            while remaining > 0:
+                stop += 2 if self.text[stop] == '\\' else 1
+                remaining -= 1
+
+            stop = min(stop, len(self.text))
+            raise LexerError(self.char_at(stop), self.position_at(stop),
+                             " (Exceeded maximum length of a string literal)")
+
+        return TokenWithSpan(TokenType.VALUE_STRING, self.text, value_start, value_end, start)
+
+
+lexer_engines = {
+    'default': LexerMain,
+    'regex': RegexLexer,
+}
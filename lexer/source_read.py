@@ -2,6 +2,21 @@
 
 # Contains basic file access class and methods.
 
+import codecs
+import io
+import mmap
+import sys
+
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# Single byte characters, used by byte based sources to skip the decoder
+# for plain ASCII text.
+ascii_chars = [chr(code) for code in range(128)]
+
+# state of an incremental decoder with no pending bytes or "\r" char
+clean_decoder_state = (b'', 0)
+
+
 class TextSource:
     def __init__(self, path):
 
@@ -16,15 +31,26 @@ class TextSource:
     def __del__(self):
         self.file.close()
 
+    # In testing mode the whole text is assigned at once and read by index,
+    # so reading a character doesn't copy the rest of the text.
+    @property
+    def text(self):
+        return self._text[self.index:]
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.index = 0
+
     def read_char(self):
 
-        if self.text != "" and not self._is_testing:
-            char = self.text
-            self.text = self.file.read(1)
+        if self._is_testing:
+            char = self._text[self.index]
+            self.index += 1
             return char
-        elif self._is_testing:
-            char = self.text[0]
-            self.text = self.text[1:]
+        elif self._text != "":
+            char = self._text
+            self._text = self.file.read(1)
             return char
         else:
             self.eof = True
@@ -32,6 +58,281 @@ class TextSource:
 
     def is_end_of_text(self):
         if self._is_testing:
-            return len(self.text) == 0
+            return self.index >= len(self._text)
+
+        return self.eof
+
+    def read_rest(self):
+
+        if self._is_testing:
+            rest = self._text[self.index:]
+            self.index = len(self._text)
+            return rest
+
+        rest = self._text + self.file.read()
+        self._text = ""
+        self.eof = True
+        return rest
+
+
+# In-memory text source. Holds the whole text and advances an integer
+# cursor over it, so reading a character never copies the text. Accepts
+# both str and bytes (decoded as UTF-8).
+class StringSource:
+    def __init__(self, text):
+
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            text = bytes(text).decode('utf-8')
+
+        self.eof = False
+        self.text = text
+        self.index = 0
+
+    def read_char(self):
+
+        if self.index < len(self.text):
+            char = self.text[self.index]
+            self.index += 1
+            return char
+
+        self.eof = True
+        return ''
+
+    def is_end_of_text(self):
+        return self.eof
+
+    def read_rest(self):
+        rest = self.text[self.index:]
+        self.index = len(self.text)
+        self.eof = True
+        return rest
+
+
+# In-memory text source over a text kept as a list of lines (each with its
+# new line char), starting at a given line and column. Lets a text, which
+# is edited line by line, be read without joining it into one string.
+class LinesSource:
+    def __init__(self, lines, line=0, column=0):
+
+        self.eof = False
+        self.lines = lines
+        self.line = line
+        self.block = lines[line] if line < len(lines) else ''
+        self.index = column
+
+    def read_char(self):
+
+        while self.index >= len(self.block):
+            if self.line + 1 >= len(self.lines):
+                self.eof = True
+                return ''
+
+            self.line += 1
+            self.block = self.lines[self.line]
+            self.index = 0
+
+        char = self.block[self.index]
+        self.index += 1
+        return char
+
+    def is_end_of_text(self):
+        return self.eof
+
+    def read_rest(self):
+        rest = self.block[self.index:] + ''.join(self.lines[self.line + 1:])
+        self.line = len(self.lines)
+        self.block = ''
+        self.index = 0
+        self.eof = True
+        return rest
+
+
+# File source reading the file in large blocks instead of one character
+# at a time. Characters are taken from the current block by index, so
+# memory usage is bounded by the block size.
+class BufferedFileSource:
+    def __init__(self, path, blockSize=DEFAULT_BLOCK_SIZE):
+
+        self.eof = False
+        self.blockSize = blockSize
+        self.file = open(path, 'r')
+        self.block = self.file.read(self.blockSize)
+        self.index = 0
+
+    def __del__(self):
+        if getattr(self, 'file', None) is not None:
+            self.file.close()
+
+    def read_char(self):
+
+        if self.index >= len(self.block):
+            self.block = self.file.read(self.blockSize)
+            self.index = 0
+
+            if self.block == '':
+                self.eof = True
+                return ''
+
+        char = self.block[self.index]
+        self.index += 1
+        return char
+
+    def is_end_of_text(self):
+        return self.eof
 
+    def read_rest(self):
+        rest = self.block[self.index:] + self.file.read()
+        self.block = ''
+        self.index = 0
+        self.eof = True
+        return rest
+
+
+# File source mapping the whole file into memory. Bytes are read by index
+# and decoded only when a non-ASCII (UTF-8 multibyte) character appears.
+class MmapFileSource:
+    def __init__(self, path):
+
+        self.eof = False
+        self.file = open(path, 'rb')
+        self.index = 0
+
+        # empty files can not be mapped
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.data = b''
+
+    def __del__(self):
+        if isinstance(getattr(self, 'data', None), mmap.mmap):
+            self.data.close()
+        if getattr(self, 'file', None) is not None:
+            self.file.close()
+
+    def read_char(self):
+
+        index = self.index
+
+        if index >= len(self.data):
+            self.eof = True
+            return ''
+
+        byte = self.data[index]
+        if byte < 0x80:
+            self.index = index + 1
+            return ascii_chars[byte]
+
+        # UTF-8 lead byte tells how many bytes the character takes.
+        if byte >= 0xF0:
+            length = 4
+        elif byte >= 0xE0:
+            length = 3
+        else:
+            length = 2
+
+        self.index = index + length
+        return self.data[index:index + length].decode('utf-8')
+
+    def is_end_of_text(self):
+        return self.eof
+
+    def read_rest(self):
+        rest = self.data[self.index:].decode('utf-8')
+        self.index = len(self.data)
+        self.eof = True
+        return rest
+
+
+# Source reading a binary stream, like the standard input or a pipe, in
+# blocks as soon as they become available. Bytes are decoded incrementally,
+# so a multibyte char or a "\r\n" pair split between blocks is handled, and
+# only the current block is kept in memory. Blocks of plain ASCII skip the
+# UTF-8 decoder and new line translation.
+class StreamSource:
+    def __init__(self, stream, blockSize=DEFAULT_BLOCK_SIZE):
+
+        self.eof = False
+        self.stream = stream
+        self.blockSize = blockSize
+        self.decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+
+        # read1 returns whatever is available, instead of waiting for a full block
+        self.read_bytes = getattr(stream, 'read1', stream.read)
+
+        # chars of the current block are taken from an iterator over it
+        self.chars = iter('')
+
+    def read_block(self):
+
+        # Returns '' only at the end of the stream. Bytes of an incomplete
+        # char decode to nothing, so the next bytes are read then.
+        while True:
+            data = self.read_bytes(self.blockSize)
+
+            if data.isascii() and b'\r' not in data and self.decoder.getstate() == clean_decoder_state:
+                return data.decode('ascii')
+
+            block = self.decoder.decode(data, final=not data)
+
+            if block or not data:
+                return block
+
+    def read_char(self):
+
+        char = next(self.chars, '')
+        if char:
+            return char
+
+        block = self.read_block()
+        if block == '':
+            self.eof = True
+            return ''
+
+        self.chars = iter(block)
+        return next(self.chars)
+
+    def is_end_of_text(self):
         return self.eof
+
+    def read_rest(self):
+        blocks = [''.join(self.chars)]
+
+        block = self.read_block()
+        while block:
+            blocks.append(block)
+            block = self.read_block()
+
+        self.chars = iter('')
+        self.eof = True
+        return ''.join(blocks)
+
+
+# File source reading bytes in large blocks, with the ASCII fast path of
+# StreamSource and UTF-8 decoding of blocks with other chars. Columns of
+# positions count chars, as the lexer gets decoded chars in both cases.
+class BinaryFileSource(StreamSource):
+    def __init__(self, path, blockSize=DEFAULT_BLOCK_SIZE):
+        super().__init__(open(path, 'rb'), blockSize)
+
+    def __del__(self):
+        if getattr(self, 'stream', None) is not None:
+            self.stream.close()
+
+
+# Opens the source text given on the command line, "-" stands for the
+# standard input.
+def open_source(path):
+    if path == '-':
+        return StreamSource(sys.stdin.buffer)
+
+    return BinaryFileSource(path)
+
+
+# Reads the whole source text given on the command line as bytes, "-"
+# stands for the standard input.
+def read_source_bytes(path):
+    if path == '-':
+        return sys.stdin.buffer.read()
+
+    with open(path, 'rb') as file:
+        return file.read()
@@ -0,0 +1,42 @@
+# Contains a per compilation table of identifier names. Every identifier
+# value made by a lexer is interned in it, so equal names share a single
+# string object and dict lookups of them take the identity fast path.
+# Additionally, each name gets a small integer id, in the order in which
+# names first appear in the source text.
+
+import sys
+
+
+class SymbolTable:
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def intern(self, name):
+        symbolId = self.ids.get(name)
+        if symbolId is not None:
+            return self.names[symbolId]
+
+        # names are also interned globally, so they are the same objects as
+        # string constants (like "main") in the interpreter code
+        name = sys.intern(name)
+        self.ids[name] = len(self.names)
+        self.names.append(name)
+        return name
+
+    def symbol_id(self, name):
+        symbolId = self.ids.get(name)
+        if symbolId is None:
+            self.intern(name)
+            symbolId = len(self.names) - 1
+
+        return symbolId
+
+    def name_of(self, symbolId):
+        return self.names[symbolId]
@@ -6,22 +6,18 @@
 # class is implemented here, serving as a way to simplify future
 # source text cursor position handling.
 
+import re
+from bisect import bisect_left, bisect_right
+
 from lexer.types import TokenType
 
 
 # Implements simple source text cursor position handling, like:
 # location printing, printing the representation of itself,
 # copying its data elsewhere, and overloading addition operators.
-def move_forward(char, column, row):
-    column += 1
-    if char == '\n':
-        row += 1
-        column = -1
-
-    return Position(row, column)
-
-
 class Position:
+    __slots__ = ('row', 'column')
+
     def __init__(self, row, column):
         self.row = row
         self.column = column
@@ -42,11 +38,122 @@ class Position:
         return Position(self.row, self.column)
 
 
+# Sorted offsets into an edited text (token and line starts) are kept with
+# a pending shift: all offsets following an edit move by the same number of
+# chars, so instead of changing each of them, offsets from shiftFrom on are
+# stored without the shift, which is added when they are read. When the next
+# edit lies elsewhere, the pending shift is moved there, which changes only
+# offsets in between. Edits cost time proportional to their distance from
+# the previous edit, not to the size of the text after them.
+def move_pending_shift(offsets, shiftFrom, shift, index):
+
+    # offsets may be a list or an array, slices keep their type
+    if not shift:
+        return
+
+    if index > shiftFrom:
+        moved = offsets[shiftFrom:index]
+        for position, offset in enumerate(moved):
+            moved[position] = offset + shift
+        offsets[shiftFrom:index] = moved
+    elif index < shiftFrom:
+        moved = offsets[index:shiftFrom]
+        for position, offset in enumerate(moved):
+            moved[position] = offset - shift
+        offsets[index:shiftFrom] = moved
+
+
+def bisect_left_shifted(offsets, offset, shiftFrom, shift):
+    if shiftFrom < len(offsets) and offset > offsets[shiftFrom] + shift:
+        return bisect_left(offsets, offset - shift, shiftFrom)
+
+    return bisect_left(offsets, offset, 0, shiftFrom)
+
+
+def bisect_right_shifted(offsets, offset, shiftFrom, shift):
+    if shiftFrom < len(offsets) and offset >= offsets[shiftFrom] + shift:
+        return bisect_right(offsets, offset - shift, shiftFrom)
+
+    return bisect_right(offsets, offset, 0, shiftFrom)
+
+
+# Keeps offsets at which lines of a source text start. Lets the lexer
+# track a plain integer offset and compute the Position of a character
+# only when it is needed (token start or error message). A new line char
+# belongs to the next row, with column -1.
+class LineIndex:
+    def __init__(self, firstRow=1, firstLineStart=0):
+        self.firstRow = firstRow
+        self.lineStarts = [firstLineStart]
+
+        # line starts from shiftFrom on are stored without shift added
+        self.shiftFrom = 0
+        self.shift = 0
+
+    @classmethod
+    def from_text(cls, text, firstRow=1, firstLineStart=0):
+        lineIndex = cls(firstRow, firstLineStart)
+        lineIndex.lineStarts.extend(new_line.end() for new_line in re.finditer('\n', text))
+
+        return lineIndex
+
+    def __len__(self):
+        return len(self.lineStarts)
+
+    def add_line(self, lineStart):
+        self.lineStarts.append(lineStart - self.shift)
+
+    def line_start(self, index):
+        lineStart = self.lineStarts[index]
+        return lineStart + self.shift if index >= self.shiftFrom else lineStart
+
+    def find_line(self, offset):
+
+        # index of the line holding the char at offset
+        return bisect_right_shifted(self.lineStarts, offset, self.shiftFrom, self.shift) - 1
+
+    def replace(self, offset, deleted, inserted):
+
+        # Updates line starts after deleting a number of chars at offset and
+        # inserting a text there. Lines of the following text are shifted.
+        lineStarts = self.lineStarts
+        first = bisect_right_shifted(lineStarts, offset, self.shiftFrom, self.shift)
+        stop = bisect_right_shifted(lineStarts, offset + deleted, self.shiftFrom, self.shift)
+
+        move_pending_shift(lineStarts, self.shiftFrom, self.shift, stop)
+
+        newLines = [offset + new_line.end() for new_line in re.finditer('\n', inserted)]
+        lineStarts[first:stop] = newLines
+
+        self.shiftFrom = first + len(newLines)
+        self.shift += len(inserted) - deleted
+
+    def position(self, offset):
+        lineStarts = self.lineStarts
+
+        if self.shift:
+            index = self.find_line(offset + 1)
+            return Position(self.firstRow + index, offset - self.line_start(index))
+
+        # most positions are asked for on the last read line
+        if offset + 1 >= lineStarts[-1]:
+            index = len(lineStarts) - 1
+        else:
+            index = bisect_right(lineStarts, offset + 1) - 1
+
+        return Position(self.firstRow + index, offset - lineStarts[index])
+
+    def offset(self, position):
+        return self.line_start(position.row - self.firstRow) + position.column
+
+
 # Class which serves as a base, single tokens representation.
 # Handles tokens representation, checking for equality of its type
 # with other tokens, and printing its position. Token creating by
 # regex rules is handled in _find_matching_token in LexerMain class.
 class Token:
+    __slots__ = ('type', 'start')
+
     def __init__(self, type_, start=None):
         self.type = type_
         self.start = start
@@ -69,8 +176,11 @@ class Token:
 # and identifiers of classes, functions, variables etc.
 # Overhauls BaseToken representations and equality methods.
 class TokenWithValue(Token):
+    __slots__ = ('value',)
+
     def __init__(self, type_: TokenType, value, start: Position = None):
-        super().__init__(type_, start)
+        self.type = type_
+        self.start = start
         self.value = value
 
     def __repr__(self):
@@ -82,10 +192,44 @@ class TokenWithValue(Token):
         return False
 
 
+# Escaped char in a string literal, a backslash followed by any char.
+escape_pattern = re.compile(r'\\([\s\S]?)')
+
+
+# Token with a value kept as a span of the source text, which is sliced
+# out only when the value is accessed for the first time. Escaped chars are
+# processed in the same single pass, only if the span has a backslash.
+class TokenWithSpan(TokenWithValue):
+    __slots__ = ('text', 'spanStart', 'spanEnd', '_value')
+
+    def __init__(self, type_: TokenType, text, spanStart, spanEnd, start: Position = None):
+        self.type = type_
+        self.start = start
+        self.text = text
+        self.spanStart = spanStart
+        self.spanEnd = spanEnd
+        self._value = None
+
+    @property
+    def value(self):
+        if self._value is None:
+            value = self.text[self.spanStart:self.spanEnd]
+            if self.type == TokenType.VALUE_STRING and '\\' in value:
+                value = escape_pattern.sub(r'\1', value)
+
+            self._value = value
+            self.text = None
+
+        return self._value
+
+
 class TokenWithDoubleValue(Token):
+    __slots__ = ('value', 'decimalValue', 'denominator')
+
     def __init__(self, type_: TokenType, value, start: Position = None, decimalValue=0,
                  denominator=0):
-        super().__init__(type_, start)
+        self.type = type_
+        self.start = start
         self.value = value
         self.decimalValue = decimalValue
         self.denominator = denominator
@@ -101,11 +245,16 @@ class TokenWithDoubleValue(Token):
         return False
 
 
+# Tokens without a value and without a position are all the same, so a
+# single shared instance of each is used, when positions are not tracked.
+shared_tokens = {token_type: Token(token_type) for token_type in TokenType if not token_type.hasValue}
+
+
 # Main tokens generation function. Checks whether or not the tokens type,
 # found with regex rules, is meant to have a value, and creates according
 # tokens.
 def new_token(token_type, value, start, decimalValue=0, denominator=0):
-    if token_type.is_token_with_value():
+    if token_type.hasValue:
 
         if token_type == TokenType.VALUE_STRING:
             value = str(value)
@@ -117,5 +266,7 @@ def new_token(token_type, value, start, decimalValue=0, denominator=0):
             return TokenWithDoubleValue(token_type, value, start, decimalValue, denominator)
 
         return TokenWithValue(token_type, value, start)
+    elif start is None:
+        return shared_tokens[token_type]
     else:
         return Token(token_type, start)
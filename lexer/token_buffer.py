@@ -0,0 +1,293 @@
+# Contains a columnar (struct of arrays) storage for a whole tokenized
+# source text. Instead of one Token object (and a Position) per lexeme,
+# token types, start and end offsets and value indexes are kept in compact
+# arrays, with literal values stored once in a side table. Tokens are
+# accessed through lightweight TokenView objects, which present the same
+# interface as Token, TokenWithValue and TokenWithDoubleValue.
+
+from array import array
+
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import StringSource
+from lexer.symbol_table import SymbolTable
+from lexer.token import LineIndex, bisect_left_shifted, move_pending_shift, new_token
+from lexer.token_stream import MAX_LOOKAHEAD, TokenStream
+from lexer.types import TokenType
+
+# TokenType values are small integers, so they are stored as single bytes.
+token_types = {token_type.value: token_type for token_type in TokenType}
+
+NO_VALUE = -1
+
+
+class TokenBuffer:
+    def __init__(self, lineIndex=None, symbolTable=None):
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.valueIndexes = array('l')
+
+        # starts and ends of tokens from shiftFrom on are stored without the
+        # shift of edits before them (see lexer.token.move_pending_shift)
+        self.shiftFrom = 0
+        self.shift = 0
+
+        # literal values side table. Equal values are stored only once.
+        self.values = []
+        self.valueIds = {}
+
+        self.lineIndex = lineIndex if lineIndex is not None else LineIndex()
+        self.symbolTable = symbolTable if symbolTable is not None else SymbolTable()
+
+    @classmethod
+    def from_lexer(cls, lexer):
+
+        # Tokenizes the whole text up to (and including) the end of text token.
+        buffer = cls(symbolTable=lexer.symbolTable)
+
+        while True:
+            token = lexer.get_token()
+            buffer.append_token(token, lexer.startOffset, lexer.endOffset)
+
+            if token.type == TokenType.EOT:
+                break
+
+        buffer.lineIndex = lexer.lineIndex
+
+        return buffer
+
+    @classmethod
+    def from_string(cls, text, maxIdentLength=64, maxStringLength=256, lexerClass=RegexLexer):
+        return cls.from_lexer(lexerClass(maxIdentLength, maxStringLength, StringSource(text)))
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError('token index out of range')
+
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield TokenView(self, index)
+
+    def append(self, token_type, start, end, value=None):
+        self.types.append(token_type.value)
+        self.starts.append(start - self.shift)
+        self.ends.append(end - self.shift)
+        self.valueIndexes.append(NO_VALUE if value is None else self.add_value(token_type, value))
+
+    def append_token(self, token, start, end):
+        if token.type == TokenType.VALUE_DOUBLE:
+            value = (token.value, token.decimalValue, token.denominator)
+        elif token.type.is_token_with_value():
+            value = token.value
+        else:
+            value = None
+
+        self.append(token.type, start, end, value)
+
+    def extend(self, other):
+
+        # Appends all tokens of another buffer, with offsets kept as they are.
+        self.flush()
+        other.flush()
+        valueIndexes = self.import_values(other)
+
+        self.types.extend(other.types)
+        self.starts.extend(other.starts)
+        self.ends.extend(other.ends)
+        self.valueIndexes.extend(valueIndexes)
+
+    def replace(self, first, stop, other, shift=0):
+
+        # Replaces tokens from first up to stop with all tokens of another
+        # buffer, and shifts offsets of the tokens following them. The shift
+        # is left pending, so only tokens between this and the previous
+        # replaced range are changed.
+        other.flush()
+        valueIndexes = self.import_values(other)
+
+        self.move_shift(stop)
+
+        self.types[first:stop] = other.types
+        self.starts[first:stop] = other.starts
+        self.ends[first:stop] = other.ends
+        self.valueIndexes[first:stop] = valueIndexes
+
+        self.shiftFrom = first + len(other)
+        self.shift += shift
+
+    def move_shift(self, index):
+        move_pending_shift(self.starts, self.shiftFrom, self.shift, index)
+        move_pending_shift(self.ends, self.shiftFrom, self.shift, index)
+        self.shiftFrom = index
+
+    def flush(self):
+
+        # adds the pending shift to offsets of all tokens
+        self.move_shift(len(self))
+        self.shift = 0
+
+    def start(self, index):
+        start = self.starts[index]
+        return start + self.shift if index >= self.shiftFrom else start
+
+    def end(self, index):
+        end = self.ends[index]
+        return end + self.shift if index >= self.shiftFrom else end
+
+    def find_token(self, offset):
+
+        # index of the first token starting at offset or after it
+        return bisect_left_shifted(self.starts, offset, self.shiftFrom, self.shift)
+
+    def import_values(self, other):
+
+        # Moves values of another buffer to this buffer's table and returns
+        # its value indexes mapped to this table. NO_VALUE (-1) picks the
+        # last item of the mapping, so it is mapped to itself.
+        valueIndexes = [NO_VALUE] * (len(other.values) + 1)
+        for (token_type, _), valueIndex in other.valueIds.items():
+            valueIndexes[valueIndex] = self.add_value(token_types[token_type], other.values[valueIndex])
+
+        return array('l', [valueIndexes[index] for index in other.valueIndexes])
+
+    def add_value(self, token_type, value):
+
+        # type is a part of the key, so that an identifier "1" and integer 1
+        # never share a value.
+        key = (token_type.value, value)
+        valueIndex = self.valueIds.get(key)
+
+        if valueIndex is None:
+            if token_type == TokenType.VALUE_ID:
+                value = self.symbolTable.intern(value)
+
+            valueIndex = len(self.values)
+            self.values.append(value)
+            self.valueIds[key] = valueIndex
+
+        return valueIndex
+
+    def reader(self):
+        return TokenBufferReader(self)
+
+
+# Lightweight view of a single token stored in a TokenBuffer. Values and
+# positions are looked up in the buffer only when they are accessed.
+class TokenView:
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return token_types[self.buffer.types[self.index]]
+
+    @property
+    def start(self):
+        return self.buffer.lineIndex.position(self.buffer.start(self.index))
+
+    @property
+    def startOffset(self):
+        return self.buffer.start(self.index)
+
+    @property
+    def endOffset(self):
+        return self.buffer.end(self.index)
+
+    def _raw_value(self, name):
+        valueIndex = self.buffer.valueIndexes[self.index]
+        if valueIndex == NO_VALUE:
+            raise AttributeError(f'{self.type.to_string()} token has no attribute {name}')
+
+        return self.buffer.values[valueIndex]
+
+    @property
+    def value(self):
+        value = self._raw_value('value')
+        if self.type == TokenType.VALUE_DOUBLE:
+            return value[0]
+
+        return value
+
+    @property
+    def decimalValue(self):
+        return self._double_part(1, 'decimalValue')
+
+    @property
+    def denominator(self):
+        return self._double_part(2, 'denominator')
+
+    def _double_part(self, part, name):
+        if self.type != TokenType.VALUE_DOUBLE:
+            raise AttributeError(f'{self.type.to_string()} token has no attribute {name}')
+
+        return self._raw_value(name)[part]
+
+    def token(self):
+
+        # Creates a regular token object with the same type, value and position.
+        token_type = self.type
+        valueIndex = self.buffer.valueIndexes[self.index]
+        value = self.buffer.values[valueIndex] if valueIndex != NO_VALUE else None
+
+        if token_type == TokenType.VALUE_DOUBLE:
+            return new_token(token_type, value[0], self.start, value[1], value[2])
+
+        return new_token(token_type, value, self.start)
+
+    def __repr__(self):
+        return self.token().__repr__()
+
+    def __eq__(self, other):
+        return self.token() == other
+
+    def print_location(self):
+        return f'at: {self.start.print_location()}'
+
+
+# Serves tokens from a TokenBuffer one by one, with the same get_token and
+# is_eot_token methods as the lexers, so that the Parser can consume an
+# already tokenized text. Tokens are already stored, so lookahead reads
+# them directly from the buffer.
+class TokenBufferReader(TokenStream):
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.index = 0
+        self.token = None
+        self.symbolTable = buffer.symbolTable
+
+    def is_eot_token(self):
+        return self.token is not None and self.token.type == TokenType.EOT
+
+    def get_token(self):
+
+        # end of text token is returned on every following call
+        index = self.index
+        if index < len(self.buffer) - 1:
+            self.index = index + 1
+
+        self.token = TokenView(self.buffer, index)
+        return self.token
+
+    def peek(self, k=1):
+        if not 0 < k <= MAX_LOOKAHEAD:
+            raise ValueError(f'lookahead has to be between 1 and {MAX_LOOKAHEAD} tokens')
+
+        return TokenView(self.buffer, min(self.index + k - 1, len(self.buffer) - 1))
+
+    @property
+    def startOffset(self):
+        return self.token.startOffset
+
+    @property
+    def endOffset(self):
+        return self.token.endOffset
@@ -0,0 +1,72 @@
+# Contains a base class of the lexers, which adds the iterator protocol,
+# fetching tokens in batches and a bounded lookahead on top of their
+# read_token method. Tokens read ahead are kept in a ring buffer together
+# with their offsets, and get_token returns them later without lexing them
+# again.
+
+from collections import deque
+
+from lexer.types import TokenType
+
+MAX_LOOKAHEAD = 16
+
+
+class TokenStream:
+    lookahead = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+
+        # end of text token is the last one
+        if self.is_eot_token():
+            raise StopIteration
+
+        return self.get_token()
+
+    def is_eot_token(self):
+        return self.token.type == TokenType.EOT
+
+    def get_token(self):
+
+        if self.lookahead:
+            self.token, self.startOffset, self.endOffset = self.lookahead.popleft()
+            return self.token
+
+        self.token = self.read_token()
+        return self.token
+
+    def get_tokens(self, count):
+
+        # Returns a list of the next count tokens, shorter if the end of
+        # text token is reached.
+        tokens = []
+        get_token = self.get_token
+
+        while len(tokens) < count and not self.is_eot_token():
+            tokens.append(get_token())
+
+        return tokens
+
+    def peek(self, k=1):
+
+        # Returns the k-th next token, without moving forward.
+        if not 0 < k <= MAX_LOOKAHEAD:
+            raise ValueError(f'lookahead has to be between 1 and {MAX_LOOKAHEAD} tokens')
+
+        if self.lookahead is None:
+            self.lookahead = deque(maxlen=MAX_LOOKAHEAD)
+
+        if len(self.lookahead) < k:
+
+            # reading ahead changes offsets of the current token
+            current = self.token, self.startOffset, self.endOffset
+
+            while len(self.lookahead) < k:
+                token = self.read_token()
+                self.lookahead.append((token, self.startOffset, self.endOffset))
+
+            self.token, self.startOffset, self.endOffset = current
+
+        return self.lookahead[k - 1][0]
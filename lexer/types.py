@@ -9,16 +9,21 @@ import enum
 
 class TokenType(enum.Enum):
 
+    # Members are singletons, compared by identity, so they are hashed by
+    # identity too. It is much faster than hashing their names, which makes
+    # dicts keyed on token types cheap to look up.
+    __hash__ = object.__hash__
+
+    # flags, names and precedences below are precomputed once for every
+    # type, right after token_type_repr is defined.
     def is_token_with_value(self):
-        return True if self.name.startswith("VALUE_") else False
+        return self.hasValue
 
     def is_token_a_keyword(self):
-        return True if self.name.startswith("K_") else False
+        return self.isKeyword
 
     def to_string(self):
-        for key, value in token_type_repr.items():
-            if self == value:
-                return key
+        return self.reprName
 
     # new line characters, tabulators, and whitespaces.
     IGNORE = enum.auto()
@@ -135,13 +140,51 @@ token_type_repr = {
     'Identifier': TokenType.VALUE_ID,
 
 }
-parameter_types = [TokenType.K_INTEGER,
-                   TokenType.K_STRING,
-                   TokenType.K_DOUBLE,
-                   TokenType.K_BOOLEAN]
-
-function_types = [TokenType.K_INTEGER,
-                  TokenType.K_STRING,
-                  TokenType.K_DOUBLE,
-                  TokenType.K_BOOLEAN,
-                  TokenType.K_VOID]
+
+for token_type in TokenType:
+    token_type.hasValue = token_type.name.startswith("VALUE_")
+    token_type.isKeyword = token_type.name.startswith("K_")
+    token_type.reprName = None
+
+# keys are assigned in reverse order, so that the first key of a type
+# wins. Types without a key are represented by None.
+for key, value in reversed(token_type_repr.items()):
+    value.reprName = key
+
+# Precedence levels of binary operators, from the loosest binding one.
+# Other token types have precedence 0, which is lower than any level.
+OR_PRECEDENCE = 1
+AND_PRECEDENCE = 2
+EQUALITY_PRECEDENCE = 3
+RELATION_PRECEDENCE = 4
+ADD_PRECEDENCE = 5
+MUL_PRECEDENCE = 6
+
+binary_operator_precedence = {
+    TokenType.VERTICAL_LINE: OR_PRECEDENCE,
+    TokenType.AMPERSAND: AND_PRECEDENCE,
+    TokenType.EQUAL: EQUALITY_PRECEDENCE,
+    TokenType.NOT_EQUAL: EQUALITY_PRECEDENCE,
+    TokenType.LESS: RELATION_PRECEDENCE,
+    TokenType.LESS_EQUAL: RELATION_PRECEDENCE,
+    TokenType.GREATER: RELATION_PRECEDENCE,
+    TokenType.GREATER_EQUAL: RELATION_PRECEDENCE,
+    TokenType.PLUS_OR_CONC: ADD_PRECEDENCE,
+    TokenType.MINUS: ADD_PRECEDENCE,
+    TokenType.MUL_OR_REFER: MUL_PRECEDENCE,
+    TokenType.DIV: MUL_PRECEDENCE,
+}
+
+for token_type in TokenType:
+    token_type.precedence = binary_operator_precedence.get(token_type, 0)
+
+parameter_types = frozenset([TokenType.K_INTEGER,
+                             TokenType.K_STRING,
+                             TokenType.K_DOUBLE,
+                             TokenType.K_BOOLEAN])
+
+function_types = frozenset([TokenType.K_INTEGER,
+                            TokenType.K_STRING,
+                            TokenType.K_DOUBLE,
+                            TokenType.K_BOOLEAN,
+                            TokenType.K_VOID])
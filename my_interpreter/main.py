@@ -2,10 +2,15 @@
 
 from argparse import ArgumentParser
 
-from my_parser.parser import Parser
+from my_parser.ast_cache import AstCache, DEFAULT_CACHE_DIR
+from my_parser.flat_ast import FlatTree
+from my_parser.hash_consing import NodeInterner
+from my_parser.parallel_parser import parse_parallel
+from my_parser.parser import parser_engines
 
 import my_interpreter.lib_methods as lib
-from lexer.source_read import TextSource
+from lexer.regex_lexer import lexer_engines
+from lexer.source_read import open_source, read_source_bytes
 from my_interpreter.visitor import Visitor, Interpreter
 
 if __name__ == '__main__':
@@ -14,14 +19,93 @@ if __name__ == '__main__':
     arg_parser.add_argument('--file_path', type=str, default='../test_files/test_interpreter_code.txt')
     arg_parser.add_argument('--ident_length', type=int, default=64)
     arg_parser.add_argument('--string_length', type=int, default=256)
+    arg_parser.add_argument('--engine', choices=list(lexer_engines), default='default')
+    arg_parser.add_argument('--parser', choices=list(parser_engines), default='default')
+    arg_parser.add_argument('--no-cache', action="store_true")
+    arg_parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR)
+    arg_parser.add_argument('--cache-stats', action="store_true")
+    arg_parser.add_argument('--flat-ast', action="store_true")
+    arg_parser.add_argument('--hash-consing', action="store_true")
+    arg_parser.add_argument('--hash-consing-stats', action="store_true")
+    arg_parser.add_argument('--jobs', type=int, default=1)
+
+    # Function bodies are parsed up front by default, so that all syntax
+    # errors are reported before the program is run.
+    parse_mode = arg_parser.add_mutually_exclusive_group()
+    parse_mode.add_argument('--lazy-parse', dest='lazy_parse', action="store_true")
+    parse_mode.add_argument('--strict-parse', dest='lazy_parse', action="store_false")
 
     args = arg_parser.parse_args()
+    stats = None
+
+    # Options, which the tree of a parse mode can not work with, are refused
+    # instead of being ignored: flat, lazily parsed and shared trees are
+    # parsed by one process and are not cached, and lazy bodies are parsed
+    # into plain node objects only.
+    given = {'--jobs': args.jobs > 1, '--cache-stats': args.cache_stats, '--flat-ast': args.flat_ast,
+             '--hash-consing': args.hash_consing}
+    modes = {'--lazy-parse': (args.lazy_parse, ['--flat-ast', '--hash-consing', '--jobs', '--cache-stats']),
+             '--flat-ast': (args.flat_ast, ['--hash-consing', '--jobs', '--cache-stats']),
+             '--hash-consing': (args.hash_consing, ['--jobs', '--cache-stats'])}
+
+    for mode, (selected, options) in modes.items():
+        conflicting = [option for option in options if given[option]]
+        if selected and conflicting:
+            arg_parser.error(f'{mode} can not be used with {", ".join(conflicting)}')
+
+    if args.hash_consing_stats and not args.hash_consing:
+        arg_parser.error('--hash-consing-stats can only be used with --hash-consing')
+
+    interner = None
+
+    if args.lazy_parse:
+        # bodies are parsed on the first call of their functions; lazily
+        # parsed trees are not cached
+        textSource = open_source(args.file_path)
+
+        parser = parser_engines[args.parser](args.ident_length, args.string_length, textSource,
+                                             lexer_engines[args.engine], lazy=True)
 
-    textSource = TextSource(args.file_path)
+        tree = parser.parse()
+    elif args.flat_ast:
+        # the tree is kept in a flat node table, run through views of nodes;
+        # flat trees are not cached
+        textSource = open_source(args.file_path)
+        flatTree = FlatTree()
 
-    parser = Parser(args.ident_length, args.string_length, textSource)
+        parser_engines[args.parser](args.ident_length, args.string_length, textSource,
+                                    lexer_engines[args.engine], nodeFactory=flatTree).parse()
 
-    tree = parser.parse()
+        tree = flatTree.program()
+    elif args.hash_consing:
+        # equal leaves and expressions are made once and shared; such trees
+        # are not cached
+        textSource = open_source(args.file_path)
+        interner = NodeInterner()
+
+        tree = parser_engines[args.parser](args.ident_length, args.string_length, textSource,
+                                           lexer_engines[args.engine], nodeFactory=interner).parse()
+
+        # only the counts are needed after parsing
+        interner.clear()
+    elif args.no_cache and args.jobs > 1:
+        # top-level definitions are parsed by several processes
+        tree = parse_parallel(open_source(args.file_path).read_rest(), args.ident_length, args.string_length,
+                              args.jobs, parserClass=parser_engines[args.parser],
+                              lexerClass=lexer_engines[args.engine])
+    elif args.no_cache:
+        textSource = open_source(args.file_path)
+
+        parser = parser_engines[args.parser](args.ident_length, args.string_length, textSource,
+                                             lexer_engines[args.engine])
+
+        tree = parser.parse()
+    else:
+        # an unchanged source text is not tokenized and parsed again
+        cache = AstCache(args.cache_dir)
+        tree = cache.parse(read_source_bytes(args.file_path), args.ident_length, args.string_length,
+                           parser_engines[args.parser], lexer_engines[args.engine], args.jobs)
+        stats = cache.save_stats()
 
     visitor = Visitor(tree)
 
@@ -30,3 +114,11 @@ if __name__ == '__main__':
     program.interpret()
 
     print(f'Returned {program.return_val}.')
+
+    if args.cache_stats and stats is not None:
+        print(f'AST cache: {stats["hits"]} hits, {stats["misses"]} misses.')
+
+    if args.hash_consing_stats:
+        print(f'Hash consing: {interner.dedup_ratio():.1%} of nodes shared.')
+        for name, (requested, made) in sorted(interner.stats().items()):
+            print(f'    {name}: {requested} requested, {made} made.')
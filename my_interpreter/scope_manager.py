@@ -1,5 +1,10 @@
 import error.error_handlers as error
 
+# Marks a name missing in a scope. Names are interned by the lexer, so
+# a single dict lookup per scope is enough, and it mostly compares names
+# by identity.
+undeclared = object()
+
 
 class Scope:
     def __init__(self, name):
@@ -18,10 +23,10 @@ class Scope:
         self.methods[name] = value
 
     def get_method(self, name):
-        if name not in self.methods.keys():
+        method = self.methods.get(name, undeclared)
+        if method is undeclared:
             raise error.UndeclaredMethod()
 
-        method = self.methods[name]
         return method
 
 
@@ -35,14 +40,14 @@ class ScopeManager:
 
     def add_var_or_attr(self, name, variable):
         for scope in self.scope_stack[-1]:
-            if name in scope.vars_or_attrs.keys():
+            if name in scope.vars_or_attrs:
                 raise error.OverwriteError(name)
 
         self.scope_stack[-1][-1].add_var_or_attr(name, variable)
 
     def update_var_or_attr(self, name, variable):
         for scope in self.scope_stack[-1]:
-            if name in scope.vars_or_attrs.keys():
+            if name in scope.vars_or_attrs:
                 scope.vars_or_attrs[name] = variable
                 return True
 
@@ -50,8 +55,9 @@ class ScopeManager:
 
     def get_var_or_attr(self, name):
         for scope in self.scope_stack[-1]:
-            if name in scope.vars_or_attrs.keys():
-                return scope.get_var_or_attr(name)
+            variable = scope.vars_or_attrs.get(name, undeclared)
+            if variable is not undeclared:
+                return variable
 
         raise error.UndeclaredSymbol()
 
@@ -69,15 +75,16 @@ class ScopeManager:
 
     def add_method(self, name, method):
         for scope in self.scope_stack[-1]:
-            if name in scope.methods.keys():
+            if name in scope.methods:
                 raise error.OverwriteError(name)
 
         self.scope_stack[-1][-1].add_method(name, method)
 
     def get_method(self, name):
         for scope in self.scope_stack[-1]:
-            if name in scope.methods.keys():
-                return scope.get_method(name)
+            method = scope.methods.get(name, undeclared)
+            if method is not undeclared:
+                return method
 
         raise error.UndeclaredSymbol(name)
 
@@ -274,21 +274,25 @@ class Visitor:
             raise error.NotTheSameTypesError(f'Unexpected: {node}')
 
         # check if there are referable parameters, before switching the context.
+        # Arguments are filtered by position: removing them by value skipped
+        # arguments following a removed one, and equal arguments may be one
+        # shared node (see my_parser.hash_consing).
         to_refer_list = []
+        referred_list = []
         for refer_vars, param in zip(is_refer_list, function.params):
             if param.is_refer:
                 to_refer_list.append(self.scope_manager.get_var_or_attr(param.name))
-            else:
-                is_refer_list.remove(refer_vars)
+                referred_list.append(refer_vars)
+        is_refer_list = referred_list
 
         # switch the context to a previous one
         self.scope_manager.switch_to_parent_scope()
 
         # update variables and object members which have been passed to function as references.
         for var, value in zip(is_refer_list, to_refer_list):
-            if type(var) == my_parser.nodes.Variable:
+            if isinstance(var, my_parser.nodes.Variable):
                 self.scope_manager.update_var_or_attr(var.name, value)
-            if type(var) == my_parser.nodes.ObjectVariable:
+            if isinstance(var, my_parser.nodes.ObjectVariable):
                 object_ = self.scope_manager.get_var_or_attr(var.parent_name)
                 object_.member_variables[var.name[0]] = value
 
@@ -353,12 +357,16 @@ class Visitor:
             raise error.NotTheSameTypesError(f'Unexpected: {node}')
 
         # check if there are referable parameters, before switching the context.
+        # Arguments are filtered by position: removing them by value skipped
+        # arguments following a removed one, and equal arguments may be one
+        # shared node (see my_parser.hash_consing).
         to_refer_list = []
+        referred_list = []
         for refer_vars, param in zip(is_refer_list, function.params):
             if param.is_refer:
                 to_refer_list.append(self.scope_manager.get_var_or_attr(param.name))
-            else:
-                is_refer_list.remove(refer_vars)
+                referred_list.append(refer_vars)
+        is_refer_list = referred_list
 
         # get method variable values from local scope before switching.
         member_vars_values = []
@@ -374,7 +382,7 @@ class Visitor:
 
         # update variables and object members which have been passed to function as references.
         for var, value in zip(is_refer_list, to_refer_list):
-            if type(var) == my_parser.nodes.Variable:
+            if isinstance(var, my_parser.nodes.Variable):
                 self.scope_manager.update_var_or_attr(var.name, value)
 
     def _visit_return_stat_operation(self, node: nodes.ReturnStat):
@@ -404,11 +412,11 @@ class Visitor:
 
         node.right.accept(self)
 
-        if type(self.scope_manager.last_operation_result) == my_parser.nodes.Class:
+        if isinstance(self.scope_manager.last_operation_result, my_parser.nodes.Class):
             self._visit_new_object(node)
             return
 
-        if type(node.left) == my_parser.nodes.ObjectVariable:
+        if isinstance(node.left, my_parser.nodes.ObjectVariable):
             object_ = self.scope_manager.get_var_or_attr(node.left.parent_name)
             if object_:
                 object_.member_variables[node.left.name[0]] = self.scope_manager.last_operation_result
@@ -491,7 +499,7 @@ class Visitor:
 
     @staticmethod
     def _return_var_name(node):
-        if type(node) != my_parser.nodes.ObjectVariable:
+        if not isinstance(node, my_parser.nodes.ObjectVariable):
             return node.name
 
         temp = node.parent_name
@@ -503,18 +511,18 @@ class Visitor:
 
     def _return_type_based_on_val(self, node):
         value = node
-        if type(node) == my_parser.nodes.Integer or type(node) == my_parser.nodes.String:
+        if isinstance(node, my_parser.nodes.Integer) or isinstance(node, my_parser.nodes.String):
             value = node.value
-        elif type(node) == my_parser.nodes.Boolean:
+        elif isinstance(node, my_parser.nodes.Boolean):
             if node.value == "true":
                 value = True
             else:
                 value = False
-        elif type(node) == my_parser.nodes.Float:
+        elif isinstance(node, my_parser.nodes.Float):
             value = node.value + node.decimalValue / 10 ** node.denominator
-        elif type(node) == my_parser.nodes.Variable:
+        elif isinstance(node, my_parser.nodes.Variable):
             value = self.scope_manager.get_var_or_attr(node.name)
-        elif type(node) == my_parser.nodes.Parameter:
+        elif isinstance(node, my_parser.nodes.Parameter):
             value = self._return_default_val_of_variable(node)
 
         if isinstance(value, float):
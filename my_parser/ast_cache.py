@@ -0,0 +1,183 @@
+# Keeps trees built by the parser in a cache directory, so that a source
+# text which has not changed is neither tokenized nor parsed again. Trees
+# are pickled, under a key made of a hash of the source text, lexer limits
+# and a format version. The version has to be increased whenever classes
+# of my_parser.nodes change in a way that makes older trees invalid.
+#
+# Loading a pickled tree can run arbitrary code, so trees are only loaded
+# from a private directory: owned by the current user, and not writable by
+# anyone else (the same holds for every entry). The cache directory is made
+# with such permissions; other directories given as the cache directory are
+# not used. The cache never stops a program from running: entries which can
+# not be read are misses, and entries or stats which can not be written are
+# skipped.
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import stat
+import tempfile
+
+from lexer.lexer import LexerMain
+from lexer.source_read import StreamSource
+from my_parser.parallel_parser import parse_parallel
+from my_parser.parser import Parser
+
+FORMAT_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+                                 'my_interpreter', 'ast')
+
+STATS_FILE = 'stats.json'
+
+
+def is_private(status):
+
+    # owned by the current user and not writable by others. Systems without
+    # user ids (Windows) rely on permissions of the user's profile.
+    if not hasattr(os, 'getuid'):
+        return True
+
+    return status.st_uid == os.getuid() and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class AstCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data, maxIdentLength, maxStringLength):
+        digest = hashlib.sha256(data)
+        digest.update(f'\0{maxIdentLength}\0{maxStringLength}\0{FORMAT_VERSION}'.encode())
+
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.ast')
+
+    def is_usable(self):
+
+        # The directory is made if it does not exist yet. Returns False, if
+        # it can not be made, or it is not private.
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            return is_private(os.stat(self.directory))
+        except OSError:
+            return False
+
+    def load(self, key):
+
+        # Returns the cached tree, or None. Unreadable entries (cut short by
+        # a full disk, for example) are removed, entries in directories or
+        # files writable by others are not loaded.
+        try:
+            if not self.is_usable():
+                raise FileNotFoundError(self.directory)
+
+            with open(self.path(key), 'rb') as file:
+                if not is_private(os.fstat(file.fileno())):
+                    raise FileNotFoundError(self.path(key))
+
+                program = pickle.load(file)
+
+        except FileNotFoundError:
+            program = None
+        except Exception:
+            self.remove(key)
+            program = None
+
+        if program is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return program
+
+    def store(self, key, program):
+
+        # Trees are written to a temporary file first, so that other runs
+        # never read a partially written one. Trees nested too deep to be
+        # pickled, and trees which can not be written, are not cached.
+        try:
+            data = pickle.dumps(program, pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            return False
+
+        return self.write(self.path(key), data)
+
+    def remove(self, key):
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def write(self, path, data):
+
+        # Returns False, if the file could not be written.
+        if not self.is_usable():
+            return False
+
+        try:
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            return False
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException as error:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+            if isinstance(error, OSError):
+                return False
+            raise
+
+        return True
+
+    def parse(self, data, maxIdentLength, maxStringLength, parserClass=Parser, lexerClass=LexerMain, jobs=1):
+
+        # Returns the tree of the source text given as bytes, from the cache
+        # if possible. Text is decoded like files given on the command line,
+        # and parsed on jobs processes, if there are more than one.
+        key = self.key(data, maxIdentLength, maxStringLength)
+
+        program = self.load(key)
+        if program is None:
+            textSource = StreamSource(io.BytesIO(data))
+            if jobs > 1:
+                program = parse_parallel(textSource.read_rest(), maxIdentLength, maxStringLength, jobs,
+                                         parserClass=parserClass, lexerClass=lexerClass)
+            else:
+                program = parserClass(maxIdentLength, maxStringLength, textSource, lexerClass).parse()
+            self.store(key, program)
+
+        return program
+
+    def read_stats(self):
+        try:
+            with open(os.path.join(self.directory, STATS_FILE), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0}
+
+    def save_stats(self):
+
+        # Adds hits and misses of this run to the totals kept in the cache
+        # directory. Runs saving them at the same time may lose some counts,
+        # and totals which can not be written are only returned.
+        stats = self.read_stats()
+        stats['hits'] += self.hits
+        stats['misses'] += self.misses
+
+        self.write(os.path.join(self.directory, STATS_FILE), json.dumps(stats).encode())
+        self.hits = self.misses = 0
+
+        return stats
@@ -0,0 +1,311 @@
+# Trees kept in one flat node table instead of one Python object per node.
+# Every node has a kind code, a run of child indexes and a run of literal
+# indexes, all stored in array.array columns; literal values (names, numbers,
+# strings, token types) are kept once each in a side table. Node 0 stands for
+# a missing node (None), lists and dicts of nodes are nodes of their own.
+#
+# A FlatTree is built directly by Parser, given as its nodeFactory:
+#
+#     tree = FlatTree()
+#     Parser(64, 256, textSource, nodeFactory=tree).parse()
+#
+# and it can be run by the interpreter through tree.program(), which gives
+# views of nodes with the interface of my_parser.nodes classes.
+
+import pickle
+from array import array
+
+import my_parser.nodes as nodes
+
+FORMAT_VERSION = 1
+
+# kinds of fields of node classes
+NODE = 0
+LITERAL = 1
+
+NO_NODE = 0
+
+# kind codes of lists and dicts of nodes; codes of node classes follow them
+LIST = 0
+DICT = 1
+
+# Fields of node classes, in the order of arguments of their constructors.
+# Node fields hold nodes, lists or dicts of nodes and None, literal fields
+# hold anything else.
+node_fields = {
+    nodes.Integer: (('value', LITERAL),),
+    nodes.Float: (('value', LITERAL), ('decimalValue', LITERAL), ('denominator', LITERAL)),
+    nodes.String: (('value', LITERAL),),
+    nodes.Boolean: (('value', LITERAL),),
+    nodes.Variable: (('name', LITERAL),),
+    nodes.ObjectVariable: (('parent_name', LITERAL), ('name', LITERAL)),
+    nodes.NotOperation: (('right', NODE),),
+    nodes.OrOperation: (('left', NODE), ('right', NODE)),
+    nodes.AndOperation: (('left', NODE), ('right', NODE)),
+    nodes.AddOperation: (('left', NODE), ('right', NODE)),
+    nodes.SubOperation: (('left', NODE), ('right', NODE)),
+    nodes.MulOperation: (('left', NODE), ('right', NODE)),
+    nodes.DivOperation: (('left', NODE), ('right', NODE)),
+    nodes.EqualOperation: (('left', NODE), ('right', NODE)),
+    nodes.NotEqualOperation: (('left', NODE), ('right', NODE)),
+    nodes.LessOperation: (('left', NODE), ('right', NODE)),
+    nodes.GreaterOperation: (('left', NODE), ('right', NODE)),
+    nodes.LessEqualOperation: (('left', NODE), ('right', NODE)),
+    nodes.GreaterEqualOperation: (('left', NODE), ('right', NODE)),
+    nodes.Class: (('name', LITERAL), ('member_variables', NODE), ('member_methods', NODE)),
+    nodes.Parameter: (('type', LITERAL), ('name', LITERAL), ('is_refer', LITERAL)),
+    nodes.FunctionDef: (('type', LITERAL), ('name', LITERAL), ('params', NODE), ('instructions', NODE)),
+    nodes.FunctionCall: (('name', NODE), ('params', NODE)),
+    nodes.ObjectMethod: (('parent_name', LITERAL), ('name', LITERAL), ('params', NODE)),
+    nodes.ReturnStat: (('return_value', NODE),),
+    nodes.IfElseStat: (('condition', NODE), ('instructions', NODE), ('else_instr', NODE)),
+    nodes.WhileStat: (('condition', NODE), ('instructions', NODE)),
+    nodes.AssignStat: (('left', NODE), ('right', NODE)),
+    nodes.InitStat: (('type', LITERAL), ('name', LITERAL), ('right', NODE)),
+    nodes.Program: (('functions_dict', NODE), ('classes_dict', NODE)),
+}
+
+node_classes = list(node_fields)
+kind_codes = {nodeClass: code for code, nodeClass in enumerate(node_classes, DICT + 1)}
+
+
+def kind_class(kind):
+    return node_classes[kind - DICT - 1]
+
+
+def literal_key(value):
+
+    # Equal values of different types (1, 1.0 and True) are different
+    # literals. Lists (names of object variables) are kept as tuples.
+    if isinstance(value, list):
+        return tuple, tuple(value)
+
+    return type(value), value
+
+
+class FlatTree:
+    def __init__(self):
+        self.kinds = array('B', [LIST])
+        self.childStarts = array('I', [0])
+        self.children = array('I')
+        self.literalStarts = array('I', [0])
+        self.literalIndexes = array('I')
+
+        self.literals = []
+        self.literalTable = {}
+
+        self.root = NO_NODE
+        self.symbolTable = None
+
+        # views of nodes (and lists and dicts of them), made on demand by
+        # node() and value()
+        self.views = {}
+
+        for nodeClass in node_classes:
+            if nodeClass is not nodes.Program:
+                setattr(self, nodeClass.__name__, self.constructor(nodeClass))
+
+    def __len__(self):
+
+        # number of nodes, with lists and dicts, without the missing node
+        return len(self.kinds) - 1
+
+    def constructor(self, nodeClass):
+
+        # Returns a function with the arguments of the nodeClass constructor,
+        # that adds a node to the table and returns its index.
+        kind = kind_codes[nodeClass]
+        fieldKinds = [fieldKind for _, fieldKind in node_fields[nodeClass]]
+
+        def construct(*values):
+            childIndexes = []
+            literalIndexes = []
+
+            for fieldKind, value in zip(fieldKinds, values):
+                if fieldKind == NODE:
+                    childIndexes.append(self.add_value(value))
+                else:
+                    literalIndexes.append(self.add_literal(value))
+
+            return self.add_node(kind, childIndexes, literalIndexes)
+
+        return construct
+
+    def Program(self, functions_dict, classes_dict, symbolTable=None):
+        self.root = self.add_node(kind_codes[nodes.Program],
+                                  [self.add_value(functions_dict), self.add_value(classes_dict)], [])
+        self.symbolTable = symbolTable
+
+        return self.root
+
+    def add_node(self, kind, childIndexes, literalIndexes):
+
+        # children are added first, so runs of children and literals of a
+        # node always end where runs of the next node start
+        index = len(self.kinds)
+
+        self.kinds.append(kind)
+        self.childStarts.append(len(self.children))
+        self.children.extend(childIndexes)
+        self.literalStarts.append(len(self.literalIndexes))
+        self.literalIndexes.extend(literalIndexes)
+
+        return index
+
+    def add_value(self, value):
+        if value is None:
+            return NO_NODE
+        if isinstance(value, list):
+            return self.add_node(LIST, [self.add_value(item) for item in value], [])
+        if isinstance(value, dict):
+            return self.add_node(DICT, [self.add_value(item) for item in value.values()],
+                                 [self.add_literal(tuple(value))])
+
+        return value
+
+    def add_literal(self, value):
+        key = literal_key(value)
+
+        index = self.literalTable.get(key)
+        if index is None:
+            index = self.literalTable[key] = len(self.literals)
+            self.literals.append(key[1])
+
+        return index
+
+    def child_indexes(self, index):
+        end = self.childStarts[index + 1] if index + 1 < len(self.kinds) else len(self.children)
+        return self.children[self.childStarts[index]:end]
+
+    def literal_values(self, index):
+        end = self.literalStarts[index + 1] if index + 1 < len(self.kinds) else len(self.literalIndexes)
+        return [self.literals[literal] for literal in self.literalIndexes[self.literalStarts[index]:end]]
+
+    def kind_name(self, index):
+        kind = self.kinds[index]
+
+        if kind == LIST:
+            return 'list'
+        if kind == DICT:
+            return 'dict'
+
+        return kind_class(kind).__name__
+
+    def walk(self, index=None):
+
+        # Yields indexes of nodes in preorder, lists and dicts included,
+        # without recursion. Missing nodes are skipped.
+        pending = [self.root if index is None else index]
+
+        while pending:
+            index = pending.pop()
+            if index == NO_NODE:
+                continue
+
+            yield index
+            pending.extend(reversed(self.child_indexes(index)))
+
+    def value(self, index):
+
+        # Returns the view of a node, a list or dict of views, or None. Lists
+        # and dicts are made once, and kept like views, so that reading a
+        # field (Program.classes_dict on every call) does not copy them.
+        if index == NO_NODE:
+            return None
+
+        kind = self.kinds[index]
+        if kind != LIST and kind != DICT:
+            return self.node(index)
+
+        value = self.views.get(index)
+        if value is None:
+            if kind == LIST:
+                value = [self.value(child) for child in self.child_indexes(index)]
+            else:
+                keys = self.literals[self.literalIndexes[self.literalStarts[index]]]
+                value = dict(zip(keys, [self.value(child) for child in self.child_indexes(index)]))
+
+            self.views[index] = value
+
+        return value
+
+    def node(self, index):
+
+        # views are kept, so a node is always represented by the same object
+        view = self.views.get(index)
+        if view is None:
+            view = self.views[index] = node_views[self.kinds[index]](self, index)
+
+        return view
+
+    def program(self):
+        return self.node(self.root)
+
+    def to_bytes(self):
+        columns = [self.kinds, self.childStarts, self.children, self.literalStarts, self.literalIndexes]
+
+        return pickle.dumps((FORMAT_VERSION, [column.tobytes() for column in columns], self.literals,
+                             self.root, self.symbolTable), pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data):
+        version, columns, literals, root, symbolTable = pickle.loads(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported flat tree format {version}.')
+
+        tree = cls()
+        for column, columnBytes in zip([tree.kinds, tree.childStarts, tree.children, tree.literalStarts,
+                                        tree.literalIndexes], columns):
+            del column[:]
+            column.frombytes(columnBytes)
+
+        tree.literals = literals
+        tree.literalTable = {literal_key(value): index for index, value in enumerate(literals)}
+        tree.root = root
+        tree.symbolTable = symbolTable
+
+        return tree
+
+
+def node_field(position, fieldKind):
+
+    # property reading a field of a node view from the table
+    if fieldKind == NODE:
+        def get(self):
+            tree = self.tree
+            return tree.value(tree.children[tree.childStarts[self.index] + position])
+    else:
+        def get(self):
+            tree = self.tree
+            value = tree.literals[tree.literalIndexes[tree.literalStarts[self.index] + position]]
+            return list(value) if type(value) is tuple else value
+
+    return property(get)
+
+
+def node_view(nodeClass):
+
+    # Subclass of nodeClass, with its fields read from a FlatTree, so that
+    # views can be used wherever nodes of nodeClass are. Fields are read
+    # only; views are not pickled, trees are.
+    namespace = {'__slots__': ('tree', 'index')}
+    positions = {NODE: 0, LITERAL: 0}
+
+    for name, fieldKind in node_fields[nodeClass]:
+        namespace[name] = node_field(positions[fieldKind], fieldKind)
+        positions[fieldKind] += 1
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    namespace['__init__'] = __init__
+    namespace['__module__'] = __name__
+
+    if nodeClass is nodes.Program:
+        namespace['symbolTable'] = property(lambda self: self.tree.symbolTable)
+
+    return type(nodeClass.__name__, (nodeClass,), namespace)
+
+
+node_views = [None, None] + [node_view(nodeClass) for nodeClass in node_classes]
@@ -0,0 +1,99 @@
+# Node factory for Parser, which makes every immutable leaf and expression
+# node only once: a node equal to one made before (same class, same values
+# and the very same child nodes) is taken from an interning table instead.
+# As children are interned before their parents, identical subtrees are
+# shared as a whole. Statements, definitions and programs are made as usual.
+#
+#     interner = NodeInterner()
+#     program = Parser(64, 256, textSource, nodeFactory=interner).parse()
+#     print(interner.dedup_ratio())
+
+import my_parser.nodes as nodes
+
+# Nodes which are never changed after parsing, neither by the parser nor by
+# the interpreter.
+interned_classes = [
+    nodes.Integer, nodes.Float, nodes.String, nodes.Boolean, nodes.Variable, nodes.ObjectVariable,
+    nodes.NotOperation, nodes.OrOperation, nodes.AndOperation, nodes.AddOperation, nodes.SubOperation,
+    nodes.MulOperation, nodes.DivOperation, nodes.EqualOperation, nodes.NotEqualOperation,
+    nodes.LessOperation, nodes.GreaterOperation, nodes.LessEqualOperation, nodes.GreaterEqualOperation,
+    nodes.FunctionCall, nodes.ObjectMethod
+]
+interned_types = frozenset(interned_classes)
+
+# other classes made by Parser, which are not interned
+plain_classes = [nodes.Class, nodes.Parameter, nodes.FunctionDef, nodes.ReturnStat, nodes.IfElseStat,
+                 nodes.WhileStat, nodes.AssignStat, nodes.InitStat, nodes.Program]
+
+
+def value_key(value):
+
+    # Interned nodes are compared by identity, lists (of names or of call
+    # arguments) by their items and other values by value. Values of a field
+    # have the same type in all nodes of a class, so 1 and True do not meet.
+    if type(value) in interned_types:
+        return id(value)
+    if isinstance(value, list):
+        return tuple(value_key(item) for item in value)
+
+    return value
+
+
+class NodeInterner:
+    def __init__(self):
+
+        # key of a node: the node, where keys are made by value_key from
+        # node classes and field values
+        self.table = {}
+
+        # numbers of requested and of made nodes, by node class name
+        self.requested = {}
+        self.made = {}
+
+        for nodeClass in interned_classes:
+            setattr(self, nodeClass.__name__, self.constructor(nodeClass))
+            self.requested[nodeClass.__name__] = 0
+            self.made[nodeClass.__name__] = 0
+
+        for nodeClass in plain_classes:
+            setattr(self, nodeClass.__name__, nodeClass)
+
+    def __len__(self):
+        return len(self.table)
+
+    def constructor(self, nodeClass):
+        table = self.table
+        name = nodeClass.__name__
+        requested = self.requested
+        made = self.made
+
+        def construct(*values):
+            requested[name] += 1
+            key = (nodeClass, *map(value_key, values))
+
+            node = table.get(key)
+            if node is None:
+                node = table[key] = nodeClass(*values)
+                made[name] += 1
+
+            return node
+
+        return construct
+
+    def clear(self):
+
+        # Drops the table, once a tree is parsed, so that it does not keep
+        # nodes alive; counts are kept. Nodes made later are not shared with
+        # nodes made before.
+        self.table.clear()
+
+    def dedup_ratio(self):
+
+        # part of requested nodes, which were taken from the table
+        requested = sum(self.requested.values())
+        return 1 - sum(self.made.values()) / requested if requested else 0.0
+
+    def stats(self):
+
+        # (requested, made) nodes of every class, which was requested
+        return {name: (count, self.made[name]) for name, count in self.requested.items() if count}
@@ -0,0 +1,281 @@
+# Keeps the tree of a program up to date while its text is being edited.
+# The text is kept split into top-level definitions (function and class
+# definitions, each with comments and white space before it), found by the
+# brace pre-scan of the parallel parser, and every definition is parsed by
+# its own parser. After an edit braces are matched again from the start of
+# the first definition touched by the edit, until a definition ends where
+# an old one (following the edit) ended after shifting. Only definitions in
+# between are parsed again; all others keep their trees.
+#
+# Errors are reported by a parser of the whole text, so that their messages
+# and positions are the same as without incremental parsing.
+
+from bisect import bisect_left
+
+import my_parser.nodes as nodes
+
+from lexer.lexer import LexerMain
+from lexer.source_read import StringSource
+from lexer.symbol_table import SymbolTable
+from my_parser.parser import Parser, brace_pattern, empty_block_pattern
+
+# kinds of definitions, reported together with names of changed ones
+FUNCTION = 'function'
+CLASS = 'class'
+
+
+def scan_definition_ends(text, start):
+
+    # Yields offsets right after definitions, matching braces from start,
+    # which lies inside the program block, outside of any definition. The
+    # offset of the brace closing the program block is yielded negated.
+    depth = 1
+
+    for found in brace_pattern.finditer(text, start):
+        brace = found.group()
+
+        if brace == '{':
+            depth += 1
+        elif brace == '}':
+            depth -= 1
+            if depth == 1:
+                yield found.end()
+            elif depth == 0:
+                yield -found.start()
+                return
+
+
+def node_slots(nodeClass):
+    return [name for base in nodeClass.__mro__ for name in getattr(base, '__slots__', ())]
+
+
+def same_tree(first, second):
+
+    # Compares trees field by field, without recursion, so that trees nested
+    # deep can be compared too. Printed trees are not enough: 2.5 and 2.50
+    # are printed the same, but are different Float nodes. Values are of the
+    # same types, so that 1, 1.0 and True differ.
+    pending = [(first, second)]
+
+    while pending:
+        first, second = pending.pop()
+
+        if type(first) is not type(second):
+            return False
+
+        if isinstance(first, list):
+            if len(first) != len(second):
+                return False
+            pending.extend(zip(first, second))
+        elif isinstance(first, dict):
+            if list(first) != list(second):
+                return False
+            pending.extend(zip(first.values(), second.values()))
+        elif type(first).__module__ == nodes.__name__:
+            pending.extend((getattr(first, name, None), getattr(second, name, None))
+                           for name in node_slots(type(first)))
+        elif first != second:
+            return False
+
+    return True
+
+
+class IncrementalParser:
+    def __init__(self, text, maxIdentLength=64, maxStringLength=256, parserClass=Parser, lexerClass=LexerMain):
+
+        self.maxIdentLength = maxIdentLength
+        self.maxStringLength = maxStringLength
+        self.parserClass = parserClass
+        self.lexerClass = lexerClass
+
+        self.text = text
+        self.symbolTable = SymbolTable()
+
+        # offset right after the brace opening the program block, and for
+        # every definition: the offset right after it and (kind, name, tree)
+        self.bodyStart = 0
+        self.ends = []
+        self.definitions = []
+
+        self.program = None
+
+        # definitions are out of date after an edit, which made the text
+        # invalid
+        self.upToDate = False
+
+        self.parse()
+
+    def parse(self):
+
+        # Parses the whole text, definition by definition. Returns (kind,
+        # name) of definitions, which were changed, added or removed.
+        oldKeys = [(kind, name) for kind, name, _ in self.definitions]
+
+        self.upToDate = False
+        self.ends = []
+        self.definitions = []
+
+        opening = brace_pattern.search(self.text)
+        if opening is not None and opening.group() == '{' and self.is_blank(0, opening.start()):
+            self.bodyStart = opening.end()
+            self.split(self.bodyStart)
+
+        if not self.upToDate:
+            # errors (and texts which can not be split) are left to a parser
+            # of the whole text
+            self.definitions = []
+            self.program = self.parserClass(self.maxIdentLength, self.maxStringLength, StringSource(self.text),
+                                            self.lexerClass).parse()
+        newKeys = [(kind, name) for kind, name, _ in self.definitions]
+
+        return list(dict.fromkeys(oldKeys + newKeys))
+
+    def split(self, start):
+
+        # Splits the text from start up to the end of the program block into
+        # definitions, and parses them.
+        ends = []
+        for end in scan_definition_ends(self.text, start):
+            if end <= 0:
+                if not self.is_blank(ends[-1] if ends else start, -end) or not self.is_blank(1 - end, len(self.text)):
+                    return
+                break
+
+            ends.append(end)
+        else:
+            return
+
+        definitions = self.parse_definitions(start, ends)
+        if definitions is None:
+            return
+
+        self.update(0, 0, ends, definitions, 0)
+
+    def is_blank(self, start, end):
+
+        # white space and comments only
+        return empty_block_pattern.fullmatch(self.text, start, end) is not None
+
+    def parse_definitions(self, start, ends):
+
+        # Returns (kind, name, tree) of every definition, or None, if one of
+        # them can not be parsed.
+        definitions = []
+
+        for end in ends:
+            definition = self.parse_definition(self.text[start:end])
+            if definition is None:
+                return None
+
+            definitions.append(definition)
+            start = end
+
+        return definitions
+
+    def parse_definition(self, text):
+        lexer = self.lexerClass(self.maxIdentLength, self.maxStringLength, StringSource('{' + text + '}'),
+                                symbolTable=self.symbolTable)
+
+        try:
+            program = self.parserClass(self.maxIdentLength, self.maxStringLength, lexer=lexer).parse()
+        except Exception:
+            return None
+
+        if program is None:
+            return None
+
+        definitions = [(FUNCTION, name, function) for name, function in program.functions_dict.items()] + \
+                      [(CLASS, name, classdef) for name, classdef in program.classes_dict.items()]
+
+        return definitions[0] if len(definitions) == 1 else None
+
+    def update(self, first, stop, ends, definitions, shift):
+
+        # Replaces definitions from first up to stop with new ones, shifts
+        # offsets of the following ones and makes the program of them all.
+        # Returns False, when a function or class is defined twice.
+        functions_dict = {}
+        classes_dict = {}
+
+        for kind, name, definition in self.definitions[:first] + definitions + self.definitions[stop:]:
+            merged = functions_dict if kind == FUNCTION else classes_dict
+            if name in merged:
+                self.upToDate = False
+                return False
+
+            merged[name] = definition
+
+        self.ends[first:] = ends + [end + shift for end in self.ends[stop:]]
+        self.definitions[first:stop] = definitions
+
+        self.program = nodes.Program(functions_dict, classes_dict, self.symbolTable)
+        self.upToDate = True
+
+        return True
+
+    def edit(self, offset, deleted, inserted):
+
+        # Replaces deleted chars at offset with the inserted text. Returns
+        # (kind, name) of definitions, which were changed, added or removed.
+        editEnd = offset + deleted
+        shift = len(inserted) - deleted
+
+        self.text = self.text[:offset] + inserted + self.text[editEnd:]
+
+        # Edits of the program opening brace, or of the text before it, and
+        # edits after an error are rare; the whole text is parsed again then.
+        ends = self.ends
+        first = bisect_left(ends, offset)
+
+        if not self.upToDate or offset < self.bodyStart:
+            return self.parse()
+
+        start = ends[first - 1] if first else self.bodyStart
+        stop = first
+        newEnds = []
+
+        for end in scan_definition_ends(self.text, start):
+
+            # definitions up to the end of the program block were scanned
+            if end <= 0:
+                if stop < len(ends) or not self.is_blank(newEnds[-1] if newEnds else start, -end) or \
+                        not self.is_blank(1 - end, len(self.text)):
+                    return self.parse()
+                break
+
+            # old definitions ending after the edit, from this one on, are
+            # the same
+            while stop < len(ends) and (ends[stop] <= editEnd or ends[stop] + shift < end):
+                stop += 1
+
+            newEnds.append(end)
+
+            # the definition ending at the same place is parsed again too, as
+            # the edit may lie inside of it
+            if stop < len(ends) and ends[stop] + shift == end:
+                stop += 1
+                break
+        else:
+            return self.parse()
+
+        definitions = self.parse_definitions(start, newEnds)
+        if definitions is None:
+            return self.parse()
+
+        # definitions which are parsed again, but did not change, keep their
+        # old trees
+        old = {(kind, name): tree for kind, name, tree in self.definitions[first:stop]}
+        changed = [(kind, name) for kind, name, _ in self.definitions[first:stop]]
+
+        for index, (kind, name, tree) in enumerate(definitions):
+            oldTree = old.get((kind, name))
+            if oldTree is not None and same_tree(oldTree, tree):
+                definitions[index] = (kind, name, oldTree)
+                changed.remove((kind, name))
+            else:
+                changed.append((kind, name))
+
+        if not self.update(first, stop, newEnds, definitions, shift):
+            return self.parse()
+
+        return list(dict.fromkeys(changed))
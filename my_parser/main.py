@@ -6,10 +6,11 @@
 
 from argparse import ArgumentParser
 
-from my_parser.parser import Parser
-from objbrowser import browse
+from my_parser.parallel_parser import parse_parallel
+from my_parser.parser import parser_engines
 
-from lexer.source_read import TextSource
+from lexer.regex_lexer import lexer_engines
+from lexer.source_read import open_source
 
 if __name__ == '__main__':
     arg_parser = ArgumentParser()
@@ -17,13 +18,39 @@ if __name__ == '__main__':
     arg_parser.add_argument('--file_path', type=str, default='../test_files/test_interpreter_code.txt')
     arg_parser.add_argument('--ident_length', type=int, default=64)
     arg_parser.add_argument('--string_length', type=int, default=256)
+    arg_parser.add_argument('--engine', choices=list(lexer_engines), default='default')
+    arg_parser.add_argument('--parser', choices=list(parser_engines), default='default')
+    arg_parser.add_argument('--jobs', type=int, default=1)
+    arg_parser.add_argument('--stream', action="store_true")
 
     args = arg_parser.parse_args()
 
-    textSource = TextSource(args.file_path)
+    # definitions are streamed by one parser, in the order of the text
+    if args.stream and args.jobs > 1:
+        arg_parser.error('--stream can not be used with --jobs')
 
-    parser = Parser(args.ident_length, args.string_length, textSource)
+    textSource = open_source(args.file_path)
 
-    program = parser.parse()
+    if args.stream:
+        # definitions are printed as soon as they are parsed, and dropped
+        parser = parser_engines[args.parser](args.ident_length, args.string_length, textSource,
+                                             lexer_engines[args.engine])
 
-    browse(program)
+        for definition in parser.iter_definitions():
+            print(definition, end='\n\n', flush=True)
+
+    else:
+        # the tree browser is only needed for whole programs
+        from objbrowser import browse
+
+        if args.jobs > 1:
+            # top-level definitions are parsed by several processes
+            program = parse_parallel(textSource.read_rest(), args.ident_length, args.string_length, args.jobs,
+                                     parserClass=parser_engines[args.parser], lexerClass=lexer_engines[args.engine])
+        else:
+            parser = parser_engines[args.parser](args.ident_length, args.string_length, textSource,
+                                                 lexer_engines[args.engine])
+
+            program = parser.parse()
+
+        browse(program)
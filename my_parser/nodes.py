@@ -1,4 +1,9 @@
+# Classes of the syntax tree nodes. Programs have a lot of nodes, so all of
+# them have __slots__ instead of a per-instance __dict__.
+
 class Integer:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -14,6 +19,8 @@ class Integer:
 
 
 class Float:
+    __slots__ = ('value', 'decimalValue', 'denominator')
+
     def __init__(self, value, decimalValue, denominator):
         self.value = value
         self.decimalValue = decimalValue
@@ -34,6 +41,8 @@ class Float:
 
 
 class String:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -49,6 +58,8 @@ class String:
 
 
 class Boolean:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -68,6 +79,8 @@ class Boolean:
 
 
 class Variable:
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -88,6 +101,8 @@ class Variable:
 
 
 class ObjectVariable:
+    __slots__ = ('parent_name', 'name')
+
     def __init__(self, parent_name, name):
         self.parent_name = parent_name
         self.name = name
@@ -116,6 +131,8 @@ class ObjectVariable:
 
 
 class NotOperation:
+    __slots__ = ('right',)
+
     def __init__(self, right):
         self.right = right
 
@@ -129,6 +146,8 @@ class NotOperation:
         visitor._visit_not_operation(self)
 
 class OrOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -147,6 +166,8 @@ class OrOperation:
 
 
 class AndOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -165,6 +186,8 @@ class AndOperation:
 
 
 class AddOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -183,6 +206,8 @@ class AddOperation:
 
 
 class SubOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -201,6 +226,8 @@ class SubOperation:
 
 
 class MulOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -219,6 +246,8 @@ class MulOperation:
 
 
 class DivOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -237,6 +266,8 @@ class DivOperation:
 
 
 class EqualOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -255,6 +286,8 @@ class EqualOperation:
 
 
 class NotEqualOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -273,6 +306,8 @@ class NotEqualOperation:
 
 
 class LessOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -291,6 +326,8 @@ class LessOperation:
 
 
 class GreaterOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -309,6 +346,8 @@ class GreaterOperation:
 
 
 class LessEqualOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -327,6 +366,8 @@ class LessEqualOperation:
 
 
 class GreaterEqualOperation:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -345,6 +386,8 @@ class GreaterEqualOperation:
 
 
 class Class:
+    __slots__ = ('name', 'member_variables', 'member_methods')
+
     def __init__(self, name, member_variables, member_methods):
         self.name = name
         self.member_variables = member_variables
@@ -366,6 +409,8 @@ class Class:
 
 
 class Parameter:
+    __slots__ = ('type', 'name', 'is_refer')
+
     def __init__(self, par_type, name, is_refer):
         self.type = par_type
         self.name = name
@@ -385,6 +430,8 @@ class Parameter:
 
 
 class FunctionDef:
+    __slots__ = ('type', 'name', 'params', 'instructions')
+
     def __init__(self, type, name, params, instructions):
         self.type = type
         self.name = name
@@ -407,7 +454,40 @@ class FunctionDef:
     def accept(self, visitor):
         visitor._visit_function_def_operation(self)
 
+
+# Function definition with instructions parsed on first use. body is called
+# once, with no arguments, and returns the list of instructions. Pickled
+# lazy definitions are plain FunctionDefs, with parsed instructions.
+class LazyFunctionDef(FunctionDef):
+    __slots__ = ('body', 'parsed')
+
+    def __init__(self, type, name, params, body):
+        self.type = type
+        self.name = name
+        self.params = params
+        self.body = body
+        self.parsed = False
+
+    @property
+    def instructions(self):
+        if not self.parsed:
+            self.body = self.body()
+            self.parsed = True
+
+        return self.body
+
+    @instructions.setter
+    def instructions(self, value):
+        self.body = value
+        self.parsed = True
+
+    def __reduce__(self):
+        return FunctionDef, (self.type, self.name, self.params, self.instructions)
+
+
 class FunctionCall:
+    __slots__ = ('name', 'params')
+
     def __init__(self, name, params):
         self.name = name
         self.params = params
@@ -433,6 +513,8 @@ class FunctionCall:
 
 
 class ObjectMethod:
+    __slots__ = ('parent_name', 'name', 'params')
+
     def __init__(self, parent_name, name, params):
         self.parent_name = parent_name
         self.name = name
@@ -463,6 +545,8 @@ class ObjectMethod:
 
 
 class ReturnStat:
+    __slots__ = ('return_value',)
+
     def __init__(self, return_value):
         self.return_value = return_value
 
@@ -477,6 +561,8 @@ class ReturnStat:
 
 
 class IfElseStat:
+    __slots__ = ('condition', 'instructions', 'else_instr')
+
     def __init__(self, condition, instructions, else_instr):
         self.condition = condition
         self.instructions = instructions
@@ -504,6 +590,8 @@ class IfElseStat:
 
 
 class WhileStat:
+    __slots__ = ('condition', 'instructions')
+
     def __init__(self, condition, instructions):
         self.condition = condition
         self.instructions = instructions
@@ -523,6 +611,8 @@ class WhileStat:
 
 
 class AssignStat:
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -541,6 +631,8 @@ class AssignStat:
 
 
 class InitStat:
+    __slots__ = ('type', 'name', 'right')
+
     def __init__(self, init_type, name, right):
         self.type = init_type
         self.name = name
@@ -561,6 +653,8 @@ class InitStat:
 
 
 class ClassInstance:
+    __slots__ = ('name', 'type_of_class', 'member_variables')
+
     def __init__(self, name, type_of_class):
         self.name = name
         self.type_of_class = type_of_class
@@ -601,10 +695,15 @@ class ClassInstance:
 
 
 class Program:
-    def __init__(self, functions_dict, classes_dict):
+    __slots__ = ('functions_dict', 'classes_dict', 'symbolTable')
+
+    def __init__(self, functions_dict, classes_dict, symbolTable=None):
         self.functions_dict = functions_dict
         self.classes_dict = classes_dict
 
+        # names of all identifiers, interned by the lexer
+        self.symbolTable = symbolTable
+
     def __repr__(self):
         print_string = "Program:"
         for key, value in self.functions_dict.items():
@@ -0,0 +1,133 @@
+# Parses programs with many top-level definitions on several processes. A
+# cheap pre-scan matches braces outside of string literals and comments and
+# finds the ends of top-level function and class definitions (closing braces
+# that leave the program block the only open one). The text is split at
+# some of those ends into chunks of similar size, and every chunk, wrapped
+# in its own program braces, is parsed by a separate parser. Definitions of
+# all chunks are merged, in order, into one Program.
+#
+# Errors are rare, and their messages and positions should not depend on
+# the way the text was split, so whenever a chunk can not be parsed, or two
+# chunks define the same function or class, the whole text is parsed again
+# by one parser, which reports the error exactly like a sequential run.
+
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+import my_parser.nodes as nodes
+
+from lexer.lexer import LexerMain
+from lexer.source_read import StringSource
+from lexer.symbol_table import SymbolTable
+from my_parser.parser import Parser, brace_pattern
+
+
+def find_definition_ends(text):
+
+    # Returns offsets right after the closing brace of every top-level
+    # definition. Unbalanced braces are left for the parser to report.
+    ends = []
+    depth = 0
+
+    for found in brace_pattern.finditer(text):
+        brace = found.group()
+
+        if brace == '{':
+            depth += 1
+        elif brace == '}':
+            depth -= 1
+            if depth == 1:
+                ends.append(found.end())
+            elif depth <= 0:
+                break
+
+    return ends
+
+
+def find_split_offsets(text, chunkCount):
+
+    # Returns offsets of chunk starts (after the first one, which is 0),
+    # chosen among definition ends, so that chunks have similar sizes.
+    ends = find_definition_ends(text)
+    offsets = []
+
+    for chunk in range(1, chunkCount):
+        index = bisect_left(ends, len(text) * chunk // chunkCount)
+
+        # the last definition end is left for the last chunk, which has to
+        # hold the rest of the program
+        if index < len(ends) - 1 and (not offsets or ends[index] > offsets[-1]):
+            offsets.append(ends[index])
+
+    return offsets
+
+
+def parse_chunk(text, maxIdentLength, maxStringLength, parserClass, lexerClass):
+
+    # Runs in a worker process. Errors are not sent back (lexer errors are
+    # not picklable), the text is parsed again by the caller instead.
+    try:
+        return parserClass(maxIdentLength, maxStringLength, StringSource(text), lexerClass).parse()
+    except Exception:
+        return None
+
+
+def merge_programs(programs):
+
+    # Returns one Program with definitions of all programs, or None, when a
+    # function or class is defined in more than one of them. Names are
+    # interned in a new symbol table, in the order of the source text.
+    symbolTable = SymbolTable()
+    functions_dict = {}
+    classes_dict = {}
+
+    for program in programs:
+        if program.symbolTable is not None:
+            for name in program.symbolTable.names:
+                symbolTable.intern(name)
+
+        for definitions, merged in [(program.functions_dict, functions_dict), (program.classes_dict, classes_dict)]:
+            for name, definition in definitions.items():
+                name = symbolTable.intern(name)
+                if name in merged:
+                    return None
+                merged[name] = definition
+
+    return nodes.Program(functions_dict, classes_dict, symbolTable)
+
+
+def parse_parallel(text, maxIdentLength=64, maxStringLength=256, workers=None, chunkCount=None,
+                   parserClass=Parser, lexerClass=LexerMain):
+
+    workers = workers or os.cpu_count() or 1
+    chunkCount = chunkCount or workers
+
+    starts = [0] + find_split_offsets(text, chunkCount)
+    stops = starts[1:] + [len(text)]
+
+    if len(starts) == 1:
+        return parserClass(maxIdentLength, maxStringLength, StringSource(text), lexerClass).parse()
+
+    # the first chunk opens the program block and the last one closes it,
+    # all other braces are added
+    chunks = [('{' if start else '') + text[start:stop] + ('}' if stop < len(text) else '')
+              for start, stop in zip(starts, stops)]
+    arguments = [(chunk, maxIdentLength, maxStringLength, parserClass, lexerClass) for chunk in chunks]
+
+    try:
+        if workers == 1:
+            programs = [parse_chunk(*chunk) for chunk in arguments]
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                programs = list(executor.map(parse_chunk, *zip(*arguments)))
+
+    # trees nested too deep can not be sent back by worker processes
+    except Exception:
+        programs = [None]
+
+    program = None if any(program is None for program in programs) else merge_programs(programs)
+    if program is None:
+        program = parserClass(maxIdentLength, maxStringLength, StringSource(text), lexerClass).parse()
+
+    return program
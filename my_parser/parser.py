@@ -1,17 +1,164 @@
+import re
+
 import my_parser.nodes as nodes
 
-from error.error_handlers import ParserError
+from error.error_handlers import LexerError, ParserError
 from lexer.lexer import LexerMain
+from lexer.parallel_lexer import prescan_pattern
+from lexer.source_read import StringSource
+from lexer.token import Position
 from lexer.types import TokenType, parameter_types, function_types
+from lexer.types import OR_PRECEDENCE, EQUALITY_PRECEDENCE, RELATION_PRECEDENCE, ADD_PRECEDENCE, MUL_PRECEDENCE
+
+# Binary operations: operator token type: (node class, operation name).
+binary_operations = {
+    TokenType.VERTICAL_LINE: (nodes.OrOperation, 'or'),
+    TokenType.AMPERSAND: (nodes.AndOperation, 'and'),
+    TokenType.EQUAL: (nodes.EqualOperation, 'equality'),
+    TokenType.NOT_EQUAL: (nodes.NotEqualOperation, 'equality'),
+    TokenType.LESS: (nodes.LessOperation, 'relation'),
+    TokenType.LESS_EQUAL: (nodes.LessEqualOperation, 'relation'),
+    TokenType.GREATER: (nodes.GreaterOperation, 'relation'),
+    TokenType.GREATER_EQUAL: (nodes.GreaterEqualOperation, 'relation'),
+    TokenType.PLUS_OR_CONC: (nodes.AddOperation, 'add'),
+    TokenType.MINUS: (nodes.SubOperation, 'add'),
+    TokenType.MUL_OR_REFER: (nodes.MulOperation, 'mul'),
+    TokenType.DIV: (nodes.DivOperation, 'mul'),
+}
+
+# equality and relation operators are not associative: 'a < b < c' is not
+# a valid condition.
+non_associative_precedences = frozenset([EQUALITY_PRECEDENCE, RELATION_PRECEDENCE])
+
+
+def node_operations(nodeFactory):
+
+    # binary_operations, with node constructors of the given factory
+    return {tokenType: (getattr(nodeFactory, operation.__name__), name)
+            for tokenType, (operation, name) in binary_operations.items()}
+
+
+boolean_values = {TokenType.K_TRUE: 'true', TokenType.K_FALSE: 'false'}
+
+# braces outside of string literals and comments, which are matched the same
+# way as by the lexers
+brace_pattern = re.compile(prescan_pattern.pattern + r'|[{}]')
+
+# text of a block without instructions
+empty_block_pattern = re.compile(r'(?:\s|//[^\n]*)*')
+
+
+def find_block_end(text, start):
+
+    # Returns the offset of the brace closing the block opened at start, or
+    # -1, if there is none.
+    depth = 0
+
+    for found in brace_pattern.finditer(text, start):
+        brace = found.group()
+
+        if brace == '{':
+            depth += 1
+        elif brace == '}':
+            depth -= 1
+            if depth == 0:
+                return found.start()
+
+    return -1
+
+
+def shift_position(position, origin):
+
+    # position in a text read from origin, as a position in the whole text
+    if position.row == 1:
+        return Position(origin.row, origin.column + position.column)
+
+    return Position(origin.row + position.row - 1, position.column)
+
+
+# Source text of lazily parsed function bodies, with everything needed to
+# parse them the same way as the rest of the program.
+class LazySource:
+    __slots__ = ('text', 'maxIdentLength', 'maxStringLength', 'parserClass', 'lexerClass', 'symbolTable')
+
+    def __init__(self, text, maxIdentLength, maxStringLength, parserClass, lexerClass, symbolTable):
+        self.text = text
+        self.maxIdentLength = maxIdentLength
+        self.maxStringLength = maxStringLength
+        self.parserClass = parserClass
+        self.lexerClass = lexerClass
+        self.symbolTable = symbolTable
+
+
+# Body of a LazyFunctionDef: a block starting at offset start of the source
+# text, at position origin. Calling it parses the block.
+class LazyBody:
+    __slots__ = ('source', 'start', 'origin')
+
+    def __init__(self, source, start, origin):
+        self.source = source
+        self.start = start
+        self.origin = origin
+
+    def __call__(self):
+        source = self.source
+        textSource = StringSource(source.text)
+        textSource.index = self.start
+
+        lexer = source.lexerClass(source.maxIdentLength, source.maxStringLength, textSource,
+                                  symbolTable=source.symbolTable)
+
+        # errors are reported at positions in the whole text
+        try:
+            return source.parserClass(source.maxIdentLength, source.maxStringLength, lexer=lexer)._parse_block()
+        except ParserError as error:
+            raise ParserError(error.illegal_token, shift_position(error.position, self.origin),
+                              error.additional_msg) from None
+        except LexerError as error:
+            raise LexerError(error.illegal_char, shift_position(error.position, self.origin),
+                             error.additional_msg) from None
 
 
 class Parser:
-    def __init__(self, maxIdentLength, maxStringLength, textSource=None):
-        self.lexer = LexerMain(maxIdentLength, maxStringLength, textSource)
+    def __init__(self, maxIdentLength, maxStringLength, textSource=None, lexerClass=LexerMain, lexer=None,
+                 nodeFactory=nodes, lazy=False):
+
+        # In lazy mode function bodies are only matched by braces, and they
+        # are parsed on first use, from the source text kept in memory.
+        self.lazySource = None
+        if lazy:
+            if lexer is not None or nodeFactory is not nodes:
+                raise ValueError('Lazy parsing needs a text source and builds node objects.')
+            if not isinstance(textSource, StringSource):
+                textSource = StringSource(textSource.read_rest())
+
+            self.lazySource = LazySource(textSource.text, maxIdentLength, maxStringLength, type(self), lexerClass,
+                                         None)
+            self.textBase = textSource.index
+
+        self.lexer = lexer if lexer is not None else lexerClass(maxIdentLength, maxStringLength, textSource)
+
+        # Nodes are made by nodeFactory: the nodes module, or an object with
+        # the same names of node constructors.
+        self.nodes = nodeFactory
+        self.operations = binary_operations if nodeFactory is nodes else node_operations(nodeFactory)
+
+        self.symbolTable = self.lexer.symbolTable
+        if self.lazySource is not None:
+            self.lazySource.symbolTable = self.symbolTable
+
         self.current_token = self.lexer.get_token()
         self.functions_dict = {}
         self.classes_dict = {}
 
+    @classmethod
+    def from_string(cls, text, maxIdentLength=64, maxStringLength=256, lexerClass=LexerMain):
+        return cls(maxIdentLength, maxStringLength, StringSource(text), lexerClass)
+
+    @classmethod
+    def from_tokens(cls, tokenBuffer):
+        return cls(None, None, lexer=tokenBuffer.reader())
+
     def parse(self):
         if not self._next_token(TokenType.LEFT_BRACKET):
             return None
@@ -19,6 +166,34 @@ class Parser:
         while self._parse_function_definition() or self._parse_class_definition():
             pass
 
+        self._parse_end_of_program()
+
+        return self.nodes.Program(self.functions_dict, self.classes_dict, self.symbolTable)
+
+    def iter_definitions(self):
+
+        # Yields function definitions and classes of the program, each one
+        # as soon as it is parsed. They are not kept by the parser: only
+        # their names stay in functions_dict and classes_dict, as keys of
+        # None values, for redefinition checks.
+        if not self._next_token(TokenType.LEFT_BRACKET):
+            return
+
+        while True:
+            if self._parse_function_definition():
+                name = next(reversed(self.functions_dict))
+                definition, self.functions_dict[name] = self.functions_dict[name], None
+            elif self._parse_class_definition():
+                name = next(reversed(self.classes_dict))
+                definition, self.classes_dict[name] = self.classes_dict[name], None
+            else:
+                break
+
+            yield definition
+
+        self._parse_end_of_program()
+
+    def _parse_end_of_program(self):
         if not self._next_token(TokenType.RIGHT_BRACKET):
             raise ParserError(self.current_token.value, self.current_token.end, "Program not ended with \'}\'.")
 
@@ -26,8 +201,6 @@ class Parser:
             raise ParserError(self.current_token.value, self.current_token.end,
                               "Unexpected data after program definition.")
 
-        return nodes.Program(self.functions_dict, self.classes_dict)
-
     def _parse_function_definition(self):
 
         func_type = self._parse_function_type()
@@ -81,7 +254,7 @@ class Parser:
 
         self._next_token(TokenType.VALUE_ID)
 
-        return nodes.Parameter(par_type, name, is_refer)
+        return self.nodes.Parameter(par_type, name, is_refer)
 
     def _parse_class_definition(self):
         if self.current_token.type != TokenType.K_CLASS:
@@ -107,7 +280,7 @@ class Parser:
             pass
 
         self._next_token(TokenType.RIGHT_BRACKET)
-        classdef = {name: nodes.Class(name, member_variables, member_methods)}
+        classdef = {name: self.nodes.Class(name, member_variables, member_methods)}
         self.classes_dict.update(classdef)
 
         return classdef
@@ -140,15 +313,74 @@ class Parser:
 
         self._next_token(TokenType.RIGHT_PARENT)
 
+        if self.lazySource is not None and self.current_token.type == TokenType.LEFT_BRACKET:
+            return nodes.LazyFunctionDef(member_type, name, params, self._skip_block())
+
         instructions = self._parse_block()
 
         if not instructions:
             raise ParserError(self.current_token.value, self.current_token.start, " Function is empty.")
 
-        function = nodes.FunctionDef(member_type, name, params, instructions)
+        function = self.nodes.FunctionDef(member_type, name, params, instructions)
 
         return function
 
+    def _skip_block(self):
+
+        # Skips a block, matching its braces, and returns its LazyBody. Only
+        # empty blocks and unmatched braces are reported right away.
+        start = self.textBase + self.lexer.startOffset
+        body = LazyBody(self.lazySource, start, self.current_token.start)
+
+        # Braces are matched in the text, if the lexer can move forward to
+        # the closing one, otherwise tokens of the block are read.
+        end = -1
+        if hasattr(self.lexer, 'skip_to') and not self.lexer.lookahead:
+            end = find_block_end(self.lazySource.text, start)
+
+        if end != -1:
+            self.lexer.skip_to(end - self.textBase)
+            self._next_token()
+            empty = empty_block_pattern.fullmatch(self.lazySource.text, start + 1, end) is not None
+        else:
+            empty = self._skip_block_tokens()
+
+        self._next_token(TokenType.RIGHT_BRACKET)
+
+        if empty:
+            raise ParserError(self.current_token.value, self.current_token.start, " Function is empty.")
+
+        return body
+
+    def _skip_block_tokens(self):
+
+        # Reads tokens up to the brace closing the current block. Returns
+        # True, when there are none between the braces.
+        depth = 0
+        count = 0
+
+        while True:
+            token_type = self.current_token.type
+
+            if token_type == TokenType.LEFT_BRACKET:
+                depth += 1
+            elif token_type == TokenType.RIGHT_BRACKET:
+                depth -= 1
+                if depth == 0:
+                    return count == 1
+            elif token_type == TokenType.EOT:
+                raise ParserError(self.current_token, self.current_token.start, "Block not ended with \'}\'.")
+
+            self._next_token()
+            count += 1
+
+            # LexerMain gives the previous token again, without moving on,
+            # for a char it can not recognize
+            offset = self.lexer.startOffset
+            if offset == self.lexer.endOffset and self.current_token.type != TokenType.EOT:
+                raise LexerError(self.lazySource.text[self.textBase + offset], self.lexer.lineIndex.position(offset),
+                                 "")
+
     def _parse_rest_of_init_statement(self, member_type, name):
 
         assignable = None
@@ -156,7 +388,7 @@ class Parser:
             self._next_token(TokenType.ASSIGN_OP)
             assignable = self._parse_assignable()
 
-        return nodes.InitStat(member_type, name, assignable)
+        return self.nodes.InitStat(member_type, name, assignable)
 
     def _parse_block(self):
         if self.current_token.type != TokenType.LEFT_BRACKET:
@@ -177,37 +409,26 @@ class Parser:
 
     def _parse_block_instruction(self):
 
-        instruction = self._parse_statement()
-        if instruction:
-            return instruction
+        parse = instruction_parsers.get(self.current_token.type)
+        if parse is None:
+            return None
 
-        instruction = self._parse_assign_or_function_call()
-        if instruction:
-            self._next_token(TokenType.SEMICOLON)
-            return instruction
+        return getattr(self, parse)()
 
-        instruction = self._parse_block()
-        if instruction:
-            return instruction
+    def _parse_statement(self):
 
-        return None
+        parse = statement_parsers.get(self.current_token.type)
+        if parse is None:
+            return None
 
-    def _parse_statement(self):
+        return getattr(self, parse)()
 
-        instruction = self._parse_if()
-        if instruction:
-            return instruction
-        instruction = self._parse_while()
-        if instruction:
-            return instruction
-        instruction = self._parse_return()
-        if instruction:
-            return instruction
-        instruction = self._parse_init()
-        if instruction:
-            return instruction
+    def _parse_simple_instruction(self):
 
-        return None
+        instruction = self._parse_assign_or_function_call()
+        self._next_token(TokenType.SEMICOLON)
+
+        return instruction
 
     def _parse_assign_or_function_call(self):
         if self.current_token.type != TokenType.VALUE_ID:
@@ -254,7 +475,7 @@ class Parser:
             self._next_token(TokenType.K_ELSE)
             else_instr = self._parse_block()
 
-        return nodes.IfElseStat(condition, instructions, else_instr)
+        return self.nodes.IfElseStat(condition, instructions, else_instr)
 
     def _parse_while(self):
         if self.current_token.type != TokenType.K_WHILE:
@@ -274,7 +495,7 @@ class Parser:
         if instructions is None:
             raise ParserError(self.current_token.value, self.current_token.end, "Couldn't parse while statement block.")
 
-        return nodes.WhileStat(condition, instructions)
+        return self.nodes.WhileStat(condition, instructions)
 
     def _parse_return(self):
         if self.current_token.type != TokenType.K_RETURN:
@@ -286,7 +507,7 @@ class Parser:
 
         self._next_token(TokenType.SEMICOLON)
 
-        return nodes.ReturnStat(return_value)
+        return self.nodes.ReturnStat(return_value)
 
     def _parse_assignable(self):
 
@@ -310,13 +531,25 @@ class Parser:
         assignable = self._parse_assignable()
 
         if object_name:
-            name = nodes.ObjectVariable(name, object_name)
+            name = self.nodes.ObjectVariable(name, object_name)
         else:
-            name = nodes.Variable(name)
+            name = self.nodes.Variable(name)
 
-        return nodes.AssignStat(name, assignable)
+        return self.nodes.AssignStat(name, assignable)
 
     def _parse_rest_of_function_call(self, name, object_name):
+        arguments = self._parse_call_arguments()
+        if arguments is None:
+            return None
+
+        if object_name:
+            name = self.nodes.ObjectVariable(name, object_name)
+        else:
+            name = self.nodes.Variable(name)
+
+        return self.nodes.FunctionCall(name, arguments)
+
+    def _parse_call_arguments(self):
         if self.current_token.type != TokenType.LEFT_PARENT:
             return None
 
@@ -335,12 +568,7 @@ class Parser:
 
         self._next_token(TokenType.RIGHT_PARENT)
 
-        if object_name:
-            name = nodes.ObjectVariable(name, object_name)
-        else:
-            name = nodes.Variable(name)
-
-        return nodes.FunctionCall(name, arguments)
+        return arguments
 
     def _parse_init(self):
         var_type = self._parse_parameter_type()
@@ -370,7 +598,7 @@ class Parser:
                 raise ParserError(self.current_token.value, self.current_token.end,
                                   "Couldn't find right operand of or operation.")
 
-            left = nodes.OrOperation(left, right)
+            left = self.nodes.OrOperation(left, right)
 
         return left
 
@@ -389,7 +617,7 @@ class Parser:
                 raise ParserError(self.current_token.value, self.current_token.end,
                                   "Couldn't find right operand of and operation.")
 
-            left = nodes.AndOperation(left, right)
+            left = self.nodes.AndOperation(left, right)
 
         return left
 
@@ -399,19 +627,16 @@ class Parser:
         if not left:
             return None
 
-        if self.current_token.type in [TokenType.EQUAL, TokenType.NOT_EQUAL]:
-            operator = self.current_token.type
-            self._next_token(operator)
+        if self.current_token.type.precedence == EQUALITY_PRECEDENCE:
+            operation = self.operations[self.current_token.type][0]
+            self._next_token()
 
             right = self._parse_relation_condition()
             if not right:
                 raise ParserError(self.current_token.value, self.current_token.end,
                                   "Couldn't find right operand of equality operation.")
 
-            if operator == TokenType.EQUAL:
-                left = nodes.EqualOperation(left, right)
-            else:
-                left = nodes.NotEqualOperation(left, right)
+            left = operation(left, right)
 
         return left
 
@@ -432,53 +657,41 @@ class Parser:
                                                                                     "negable expression.")
             return None
 
-        if self.is_a_relation_operation(TokenType.LESS_EQUAL):
+        if self.current_token.type.precedence == RELATION_PRECEDENCE:
+            operation = self.operations[self.current_token.type][0]
             right = self._parse_rest_of_relation_condition()
-            left = nodes.LessEqualOperation(left, right)
-        elif self.is_a_relation_operation(TokenType.GREATER_EQUAL):
-            self._next_token()
-            right = self._parse_expression()
-            left = nodes.GreaterEqualOperation(left, right)
-        elif self.is_a_relation_operation(TokenType.LESS):
-            self._next_token()
-            right = self._parse_expression()
-            left = nodes.LessOperation(left, right)
-        elif self.is_a_relation_operation(TokenType.GREATER):
-            self._next_token()
-            right = self._parse_expression()
-            left = nodes.GreaterOperation(left, right)
+            left = operation(left, right)
 
         if is_negated:
-            left = nodes.NotOperation(left)
+            left = self.nodes.NotOperation(left)
 
         return left
 
     def _parse_rest_of_relation_condition(self):
         self._next_token()
         right = self._parse_expression()
-        if right:
+        if not right:
             raise ParserError(self.current_token.value, self.current_token.end,
                               "Unable to parse second operand of relation condition.")
 
+        return right
+
     def _parse_expression(self):
 
         left = self._parse_multiply_expression()
         if not left:
             return None
 
-        while self.current_token.type in [TokenType.PLUS_OR_CONC, TokenType.MINUS]:
-            operator = self.current_token.type
-            self._next_token(operator)
+        while self.current_token.type.precedence == ADD_PRECEDENCE:
+            operation = self.operations[self.current_token.type][0]
+            self._next_token()
 
             right = self._parse_multiply_expression()
             if not right:
                 raise ParserError(self.current_token.value, self.current_token.end,
                                   "Couldn't find right operand of add operation.")
 
-            if operator == TokenType.PLUS_OR_CONC:
-                left = nodes.AddOperation(left, right)
-            else:
-                left = nodes.SubOperation(left, right)
+            left = operation(left, right)
 
         return left
 
@@ -488,41 +701,26 @@ class Parser:
         if not left:
             return None
 
-        while self.current_token.type in [TokenType.MUL_OR_REFER, TokenType.DIV]:
-            operator = self.current_token.type
-            self._next_token(operator)
+        while self.current_token.type.precedence == MUL_PRECEDENCE:
+            operation = self.operations[self.current_token.type][0]
+            self._next_token()
 
             right = self._parse_primary_expression()
             if not right:
                 raise ParserError(self.current_token.value, self.current_token.end,
                                   "Couldn't find right operand of mul operation.")
 
-            if operator == TokenType.MUL_OR_REFER:
-                left = nodes.MulOperation(left, right)
-            else:
-                left = nodes.DivOperation(left, right)
+            left = operation(left, right)
 
         return left
 
     def _parse_primary_expression(self):
 
-        expression = self._parse_integer_value()
-        if expression:
-            return expression
-        expression = self._parse_double_value()
-        if expression:
-            return expression
-        expression = self._parse_string_value()
-        if expression:
-            return expression
-        expression = self._parse_parenth_expression()
-        if expression:
-            return expression
-        expression = self._parse_variable_or_method()
-        if expression:
-            return expression
+        parse = primary_parsers.get(self.current_token.type)
+        if parse is None:
+            return None
 
-        return None
+        return getattr(self, parse)()
 
     def _parse_boolean_value(self):
 
@@ -535,7 +733,7 @@ class Parser:
 
         if value:
             self._next_token()
-            return nodes.Boolean(value)
+            return self.nodes.Boolean(value)
 
         return None
 
@@ -544,7 +742,7 @@ class Parser:
         if self.current_token.type == TokenType.VALUE_INT:
             value = self.current_token.value
             self._next_token(TokenType.VALUE_INT)
-            return nodes.Integer(value)
+            return self.nodes.Integer(value)
 
         return None
 
@@ -555,7 +753,7 @@ class Parser:
             decimal_value = self.current_token.decimalValue
             denominator = self.current_token.denominator
             self._next_token(TokenType.VALUE_DOUBLE)
-            return nodes.Float(value, decimal_value, denominator)
+            return self.nodes.Float(value, decimal_value, denominator)
 
         return None
 
@@ -564,7 +762,7 @@ class Parser:
         if self.current_token.type == TokenType.VALUE_STRING:
             value = self.current_token.value
             self._next_token(TokenType.VALUE_STRING)
-            return nodes.String(value)
+            return self.nodes.String(value)
 
         return None
 
@@ -595,15 +793,15 @@ class Parser:
             object_name.append(self.current_token.value)
             self._next_token(TokenType.VALUE_ID)
 
-        expression = self._parse_rest_of_function_call(name, object_name)
-        if expression:
+        arguments = self._parse_call_arguments()
+        if arguments is not None:
             if object_name:
-                return nodes.ObjectMethod(name, object_name, expression.params)
-            return expression
+                return self.nodes.ObjectMethod(name, object_name, arguments)
+            return self.nodes.FunctionCall(self.nodes.Variable(name), arguments)
 
         if object_name:
-            return nodes.ObjectVariable(name, object_name)
-        return nodes.Variable(name)
+            return self.nodes.ObjectVariable(name, object_name)
+        return self.nodes.Variable(name)
 
     def _next_token(self, token_type=None):
         if not token_type or token_type == self.current_token.type:
@@ -613,33 +811,385 @@ class Parser:
         raise ParserError(self.current_token, self.current_token.start,
                           f'Expected:{token_type}, got:{self.current_token}')
 
-    def is_a_relation_operation(self, operator):
-        return self.current_token.type == operator
-
     def _parse_function_type(self):
-        if self.current_token.type not in function_types:
+        fun_type = self.current_token.type
+        if fun_type not in function_types:
             return None
 
-        fun_type = self.current_token.type
-        self._next_token(self.current_token.type)
+        self._next_token()
 
         return fun_type
 
     def _parse_parameter_type(self):
-        if self.current_token.type not in parameter_types:
+        par_type = self.current_token.type
+        if par_type not in parameter_types:
             return None
 
-        par_type = self.current_token.type
-        self._next_token(self.current_token.type)
+        self._next_token()
 
         return par_type
 
     @staticmethod
     def is_token_relation_operator(token):
-        if token in [TokenType.LESS,
-                     TokenType.LESS_EQUAL,
-                     TokenType.GREATER,
-                     TokenType.GREATER_EQUAL]:
-            return True
+        return token.precedence == RELATION_PRECEDENCE
+
+
+# Names of parsing methods chosen by the type of the first token (FIRST sets
+# of the alternatives), so that one lookup replaces trying them one by one.
+# Methods are looked up by name on the parser, so subclasses may override
+# them. StackParser parses if and while statements and nested blocks in its
+# own loop, so overriding their entries has no effect there.
+statement_parsers = {
+    TokenType.K_IF: '_parse_if',
+    TokenType.K_WHILE: '_parse_while',
+    TokenType.K_RETURN: '_parse_return',
+}
+statement_parsers.update(dict.fromkeys(parameter_types, '_parse_init'))
+
+instruction_parsers = dict(statement_parsers)
+instruction_parsers[TokenType.VALUE_ID] = '_parse_simple_instruction'
+instruction_parsers[TokenType.LEFT_BRACKET] = '_parse_block'
+
+primary_parsers = {
+    TokenType.VALUE_INT: '_parse_integer_value',
+    TokenType.VALUE_DOUBLE: '_parse_double_value',
+    TokenType.VALUE_STRING: '_parse_string_value',
+    TokenType.LEFT_PARENT: '_parse_parenth_expression',
+    TokenType.VALUE_ID: '_parse_variable_or_method',
+}
+
+
+# Parser with conditions and expressions parsed by precedence climbing: one
+# loop over operators, ordered by their precedence, replaces the chain of
+# methods (one per precedence level), which every operand had to pass
+# through. Trees are the same as the ones built by Parser.
+class PrattParser(Parser):
+
+    def _parse_condition(self):
+        return self._parse_operators(OR_PRECEDENCE)
+
+    def _parse_expression(self):
+        return self._parse_operators(ADD_PRECEDENCE)
+
+    def _parse_operators(self, minPrecedence):
+
+        # Booleans and negations are relations, so they only appear where
+        # a relation may. A negation covers the whole relation after it.
+        # Only equality and looser operators may follow both of them.
+        tokenType = self.current_token.type
+        parse = primary_parsers.get(tokenType)
+        maxPrecedence = MUL_PRECEDENCE
+
+        if parse is not None:
+            left = getattr(self, parse)()
+        elif minPrecedence > RELATION_PRECEDENCE:
+            return None
+        elif tokenType in boolean_values:
+            self._next_token()
+            left = self.nodes.Boolean(boolean_values[tokenType])
+            maxPrecedence = EQUALITY_PRECEDENCE
+        elif tokenType == TokenType.EXCLAMATION:
+            self._next_token()
+            left = self._parse_operators(ADD_PRECEDENCE)
+            if not left:
+                raise ParserError(self.current_token.value, self.current_token.end, "Exclamation mark left without any "
+                                                                                    "negable expression.")
+
+            if self.current_token.type.precedence == RELATION_PRECEDENCE:
+                left = self._parse_binary_operation(left, RELATION_PRECEDENCE)
+
+            left = self.nodes.NotOperation(left)
+            maxPrecedence = EQUALITY_PRECEDENCE
+        else:
+            return None
+
+        # Operators binding looser than minPrecedence are left for the caller.
+        # After an operation, only operators up to its precedence (or below
+        # it, if it is not associative) may follow, others were refused by
+        # its right operand.
+        precedence = self.current_token.type.precedence
+        while minPrecedence <= precedence <= maxPrecedence:
+            left = self._parse_binary_operation(left, precedence)
+            maxPrecedence = precedence - 1 if precedence in non_associative_precedences else precedence
+            precedence = self.current_token.type.precedence
+
+        return left
+
+    def _parse_binary_operation(self, left, precedence):
+
+        operation, name = self.operations[self.current_token.type]
+        self._next_token()
+
+        right = self._parse_operators(precedence + 1)
+        if not right:
+            raise ParserError(self.current_token.value, self.current_token.end,
+                              f"Couldn't find right operand of {name} operation.")
+
+        return operation(left, right)
+
+
+# Kinds of frames of StackParser: what waits for the operand being parsed.
+RIGHT_OPERAND = 0
+NEGATED_OPERAND = 1
+NEGATED_RELATION = 2
+PARENTHESES = 3
+FIRST_ARGUMENT = 4
+NEXT_ARGUMENT = 5
+
+# Kinds of statements of StackParser, which wait for a block to end.
+NESTED_BLOCK = 0
+WHILE_BLOCK = 1
+IF_BLOCK = 2
+ELSE_BLOCK = 3
+
+literal_parsers = {
+    TokenType.VALUE_INT: '_parse_integer_value',
+    TokenType.VALUE_DOUBLE: '_parse_double_value',
+    TokenType.VALUE_STRING: '_parse_string_value',
+}
+
+
+# Parser without recursion in blocks, statements, conditions and expressions,
+# so programs may be nested arbitrarily deep. Parsing methods, which would
+# call each other, are replaced with loops and explicit stacks of frames,
+# each holding what a method would keep in its local variables. Trees are
+# the same as the ones built by Parser. If and while statements and nested
+# blocks are parsed by the loop of _parse_block, so overriding _parse_if,
+# _parse_while or _parse_block (their entries in statement_parsers and
+# instruction_parsers) has no effect on them: only an outermost block calls
+# _parse_block. Other entries of the tables are still looked up by name.
+class StackParser(PrattParser):
+
+    def _parse_block(self):
+        if self.current_token.type != TokenType.LEFT_BRACKET:
+            return None
+
+        self._next_token(TokenType.LEFT_BRACKET)
+
+        # Statements waiting for their block to end, innermost last, with
+        # instructions of the block they are a part of.
+        statements = []
+        instructions = []
+
+        while True:
+            tokenType = self.current_token.type
+
+            if tokenType == TokenType.LEFT_BRACKET:
+                self._next_token()
+                statements.append((instructions, NESTED_BLOCK, None, None))
+                instructions = []
+                continue
+
+            if tokenType == TokenType.K_IF or tokenType == TokenType.K_WHILE:
+                condition = self._parse_statement_condition()
+                kind = IF_BLOCK if tokenType == TokenType.K_IF else WHILE_BLOCK
+                statements.append((instructions, kind, condition, None))
+
+                if self.current_token.type == TokenType.LEFT_BRACKET:
+                    self._next_token()
+                    instructions = []
+                    continue
 
-        return False
+                if kind == WHILE_BLOCK:
+                    raise ParserError(self.current_token.value, self.current_token.end,
+                                      "Couldn't parse while statement block.")
+
+                # if statement without a block
+                block = None
+
+            else:
+                parse = statement_parsers.get(tokenType)
+                if parse is None and tokenType == TokenType.VALUE_ID:
+                    parse = '_parse_simple_instruction'
+
+                if parse is not None:
+                    instructions.append(getattr(self, parse)())
+                    continue
+
+                self._next_token(TokenType.RIGHT_BRACKET)
+                block = instructions
+
+            # Passes the block, which has just ended, to the statement waiting
+            # for it. An empty nested block ends the outer block too, as it
+            # does in Parser.
+            while True:
+                if not statements:
+                    return block
+
+                instructions, kind, condition, thenBlock = statements.pop()
+
+                if kind == NESTED_BLOCK:
+                    instruction = block
+                elif kind == WHILE_BLOCK:
+                    instruction = self.nodes.WhileStat(condition, block)
+                elif kind == ELSE_BLOCK:
+                    instruction = self.nodes.IfElseStat(condition, thenBlock, block)
+                elif self.current_token.type != TokenType.K_ELSE:
+                    instruction = self.nodes.IfElseStat(condition, block, [])
+                else:
+                    self._next_token()
+                    if self.current_token.type == TokenType.LEFT_BRACKET:
+                        self._next_token()
+                        statements.append((instructions, ELSE_BLOCK, condition, block))
+                        instructions = []
+                        break
+
+                    instruction = self.nodes.IfElseStat(condition, block, None)
+
+                if instruction:
+                    instructions.append(instruction)
+                    break
+
+                self._next_token(TokenType.RIGHT_BRACKET)
+                block = instructions
+
+    def _parse_statement_condition(self):
+
+        # parses 'if (condition)' or 'while (condition)'
+        self._next_token()
+        self._next_token(TokenType.LEFT_PARENT)
+
+        condition = self._parse_condition()
+        if condition is None:
+            raise ParserError(self.current_token.value, self.current_token.end, "Couldn't find a valid condition.")
+
+        self._next_token(TokenType.RIGHT_PARENT)
+
+        return condition
+
+    def _parse_operators(self, minPrecedence):
+
+        # Frames waiting for an operand, innermost last: (kind, minPrecedence
+        # of the waiting frame, its left operand, operator or called name,
+        # and two more values depending on the kind). Each pass of the loop
+        # reads an operand, or opens a frame waiting for one.
+        frames = []
+
+        while True:
+            tokenType = self.current_token.type
+            parse = literal_parsers.get(tokenType)
+            maxPrecedence = MUL_PRECEDENCE
+
+            if parse is not None:
+                left = getattr(self, parse)()
+
+            elif tokenType == TokenType.VALUE_ID:
+                name = self.current_token.value
+                self._next_token()
+
+                object_name = []
+                while self.current_token.type == TokenType.DOT:
+                    self._next_token()
+                    object_name.append(self.current_token.value)
+                    self._next_token(TokenType.VALUE_ID)
+
+                if self.current_token.type == TokenType.LEFT_PARENT:
+                    self._next_token()
+                    frames.append((FIRST_ARGUMENT, minPrecedence, name, object_name, []))
+                    minPrecedence = OR_PRECEDENCE
+                    continue
+
+                left = self.nodes.ObjectVariable(name, object_name) if object_name else self.nodes.Variable(name)
+
+            elif tokenType == TokenType.LEFT_PARENT:
+                self._next_token()
+                frames.append((PARENTHESES, minPrecedence, None, None, None))
+                minPrecedence = OR_PRECEDENCE
+                continue
+
+            elif minPrecedence <= RELATION_PRECEDENCE and tokenType in boolean_values:
+                self._next_token()
+                left = self.nodes.Boolean(boolean_values[tokenType])
+                maxPrecedence = EQUALITY_PRECEDENCE
+
+            elif minPrecedence <= RELATION_PRECEDENCE and tokenType == TokenType.EXCLAMATION:
+                self._next_token()
+                frames.append((NEGATED_OPERAND, minPrecedence, None, None, None))
+                minPrecedence = ADD_PRECEDENCE
+                continue
+
+            else:
+                left = None
+
+            while True:
+
+                # opens a frame for the right operand of an operator, which
+                # binds tighter than the waiting one
+                if left is not None:
+                    precedence = self.current_token.type.precedence
+                    if minPrecedence <= precedence <= maxPrecedence:
+                        frames.append((RIGHT_OPERAND, minPrecedence, left, self.current_token.type, None))
+                        self._next_token()
+                        minPrecedence = precedence + 1
+                        break
+
+                # passes the finished operand to the frame waiting for it
+                if not frames:
+                    return left
+
+                kind, minPrecedence, waiting, first, second = frames.pop()
+
+                if kind == RIGHT_OPERAND:
+                    operation, name = self.operations[first]
+                    if left is None:
+                        raise ParserError(self.current_token.value, self.current_token.end,
+                                          f"Couldn't find right operand of {name} operation.")
+
+                    left = operation(waiting, left)
+                    precedence = first.precedence
+                    maxPrecedence = precedence - 1 if precedence in non_associative_precedences else precedence
+
+                elif kind == NEGATED_OPERAND:
+                    if left is None:
+                        raise ParserError(self.current_token.value, self.current_token.end,
+                                          "Exclamation mark left without any negable expression.")
+
+                    if self.current_token.type.precedence == RELATION_PRECEDENCE:
+                        frames.append((NEGATED_RELATION, minPrecedence, left, self.current_token.type, None))
+                        self._next_token()
+                        minPrecedence = RELATION_PRECEDENCE + 1
+                        break
+
+                    left = self.nodes.NotOperation(left)
+                    maxPrecedence = EQUALITY_PRECEDENCE
+
+                elif kind == NEGATED_RELATION:
+                    operation, name = self.operations[first]
+                    if left is None:
+                        raise ParserError(self.current_token.value, self.current_token.end,
+                                          f"Couldn't find right operand of {name} operation.")
+
+                    left = self.nodes.NotOperation(operation(waiting, left))
+                    maxPrecedence = EQUALITY_PRECEDENCE
+
+                elif kind == PARENTHESES:
+                    self._next_token(TokenType.RIGHT_PARENT)
+                    if left is None:
+                        raise ParserError(self.current_token.value, self.current_token.end,
+                                          "Couldn't parse parentheses.")
+
+                    maxPrecedence = MUL_PRECEDENCE
+
+                else:
+                    # arguments of a call, only the first one is optional
+                    # like in Parser
+                    if left is not None or kind == NEXT_ARGUMENT:
+                        second.append(left)
+
+                        if self.current_token.type == TokenType.COMMA:
+                            self._next_token()
+                            frames.append((NEXT_ARGUMENT, minPrecedence, waiting, first, second))
+                            minPrecedence = OR_PRECEDENCE
+                            break
+
+                    self._next_token(TokenType.RIGHT_PARENT)
+
+                    if first:
+                        left = self.nodes.ObjectMethod(waiting, first, second)
+                    else:
+                        left = self.nodes.FunctionCall(self.nodes.Variable(waiting), second)
+
+                    maxPrecedence = MUL_PRECEDENCE
+
+
+parser_engines = {'default': Parser, 'pratt': PrattParser, 'stack': StackParser}
@@ -0,0 +1,91 @@
+# Contains tests checking that trees loaded from the AST cache are the same
+# as the parsed ones, and that changed sources or settings are parsed again.
+
+import os
+import tempfile
+import unittest
+
+from my_parser.ast_cache import AstCache
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_interpreter_code.txt'
+
+
+class AstCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = AstCache(self.directory.name)
+
+        with open(TEST_SOURCE, 'rb') as file:
+            self.data = file.read()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_hit_and_miss(self):
+        expected = repr(Parser.from_string(self.data.decode()).parse())
+
+        self.assertEqual(expected, repr(self.cache.parse(self.data, 64, 256)))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        self.assertEqual(expected, repr(self.cache.parse(self.data, 64, 256)))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key(self):
+        key = self.cache.key(self.data, 64, 256)
+
+        self.assertEqual(key, self.cache.key(self.data, 64, 256))
+        self.assertNotEqual(key, self.cache.key(self.data, 64, 128))
+        self.assertNotEqual(key, self.cache.key(self.data, 32, 256))
+        self.assertNotEqual(key, self.cache.key(self.data + b' ', 64, 256))
+
+    def test_broken_entry(self):
+        key = self.cache.key(self.data, 64, 256)
+        self.cache.parse(self.data, 64, 256)
+
+        with open(self.cache.path(key), 'r+b') as file:
+            file.truncate(10)
+
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(os.path.exists(self.cache.path(key)))
+        self.assertIsNotNone(self.cache.parse(self.data, 64, 256))
+
+    def test_stats(self):
+        self.cache.parse(self.data, 64, 256)
+        self.assertEqual(self.cache.save_stats(), {'hits': 0, 'misses': 1})
+
+        cache = AstCache(self.directory.name)
+        cache.parse(self.data, 64, 256)
+        cache.parse(self.data, 64, 256)
+        self.assertEqual(cache.save_stats(), {'hits': 2, 'misses': 1})
+
+    def test_unusable_directory(self):
+
+        # a directory can not be made under a regular file
+        path = os.path.join(self.directory.name, 'file')
+        with open(path, 'w'):
+            pass
+
+        cache = AstCache(os.path.join(path, 'cache'))
+        self.assertIsNotNone(cache.parse(self.data, 64, 256))
+        self.assertIsNotNone(cache.parse(self.data, 64, 256))
+        self.assertEqual(cache.save_stats(), {'hits': 0, 'misses': 2})
+
+    def test_directory_writable_by_others(self):
+        self.cache.parse(self.data, 64, 256)
+        os.chmod(self.directory.name, 0o777)
+
+        self.assertIsNotNone(self.cache.parse(self.data, 64, 256))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_entry_writable_by_others(self):
+        key = self.cache.key(self.data, 64, 256)
+        self.cache.parse(self.data, 64, 256)
+        os.chmod(self.cache.path(key), 0o666)
+
+        self.assertIsNone(self.cache.load(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
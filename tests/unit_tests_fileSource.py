@@ -2,9 +2,14 @@
 
 # Contains tests checking the actions performed by the FileSource class.
 
+import io
+import os
+import tempfile
 import unittest
 
-from lexer.source_read import TextSource
+from lexer.lexer import LexerMain
+from lexer.source_read import TextSource, StringSource, BufferedFileSource, MmapFileSource, StreamSource, \
+    BinaryFileSource
 
 TEST_SOURCE_1_LINE = '../test_files/test_lexer_singleLineReadExample.txt'
 TEST_SOURCE_2_LINES = '../test_files/test_lexer_twoLineReadExample.txt'
@@ -32,6 +37,71 @@ class TestSource(unittest.TestCase):
         self.assertEqual("test1 sampleId1\ntest2 sample_2", text, msg='Error in first line.')
         self.assertEqual(True, file_source.is_end_of_text(), msg='Error when checking EOF')
 
+    def test_source_backends(self):
+
+        with open(TEST_SOURCE_2_LINES, 'r') as file:
+            expected = file.read()
+
+        # small block size forces reading the file in several blocks
+        sources = [StringSource(expected),
+                   StringSource(expected.encode('utf-8')),
+                   BufferedFileSource(TEST_SOURCE_2_LINES, blockSize=4),
+                   MmapFileSource(TEST_SOURCE_2_LINES),
+                   BinaryFileSource(TEST_SOURCE_2_LINES, blockSize=4),
+                   StreamSource(io.BytesIO(expected.encode('utf-8')), blockSize=4)]
+
+        for source in sources:
+            text = ""
+            while not source.is_end_of_text():
+                text += source.read_char()
+
+            self.assertEqual(expected, text, msg=f'Error in {source.__class__.__name__}.')
+            self.assertEqual(True, source.is_end_of_text(), msg='Error when checking EOF')
+
+    def test_mmap_source_multibyte_chars(self):
+
+        expected = "zażółć €𝄞\n"
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'multibyte.txt')
+            with open(path, 'wb') as file:
+                file.write(expected.encode('utf-8'))
+
+            text = ""
+            source = MmapFileSource(path)
+            while not source.is_end_of_text():
+                text += source.read_char()
+            del source
+
+        self.assertEqual(expected, text)
+
+    def test_stream_source_split_chars(self):
+
+        # blocks of 3 bytes split multibyte chars and "\r\n" pairs
+        source = StreamSource(io.BytesIO("ab\r\nżółć €\r\n".encode('utf-8')), blockSize=3)
+
+        text = ""
+        while not source.is_end_of_text():
+            text += source.read_char()
+
+        self.assertEqual("ab\nżółć €\n", text)
+
+    def test_binary_source_positions(self):
+
+        # the first block is plain ASCII, the following ones need decoding
+        text = 'a = "xy";\nb = "żółć €";\r\n c = d;\n'
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mixed.txt')
+            with open(path, 'wb') as file:
+                file.write(text.encode('utf-8'))
+
+            expected = [token.print_location() for token in LexerMain(64, 256, TextSource(path))]
+            locations = [token.print_location() for token in LexerMain(64, 256, BinaryFileSource(path, 8))]
+
+        self.assertEqual(expected, locations)
+        self.assertEqual('at: (3:5)', locations[-3])
+
 
 if __name__ == '__main__':
     unittest.main()
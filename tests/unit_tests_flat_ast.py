@@ -0,0 +1,70 @@
+# Contains tests checking that flat trees built by the parser are seen
+# through their views like trees of node objects, and that they can be
+# serialized and interpreted.
+
+import unittest
+
+import my_parser.nodes as nodes
+
+import my_interpreter.lib_methods as lib
+from lexer.source_read import TextSource
+from my_interpreter.visitor import Visitor, Interpreter
+from my_parser.flat_ast import FlatTree
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_interpreter_code.txt'
+
+
+def parse_flat(path):
+    tree = FlatTree()
+    Parser(64, 256, TextSource(path), nodeFactory=tree).parse()
+
+    return tree
+
+
+class FlatTreeTest(unittest.TestCase):
+
+    def test_same_tree(self):
+        for path in [TEST_SOURCE, '../test_files/test_parser_simple_function.txt']:
+            expected = Parser(64, 256, TextSource(path)).parse()
+
+            self.assertEqual(repr(expected), repr(parse_flat(path).program()))
+
+    def test_views(self):
+        tree = parse_flat(TEST_SOURCE)
+        program = tree.program()
+
+        self.assertIsInstance(program, nodes.Program)
+        self.assertIs(program.functions_dict['main'], tree.program().functions_dict['main'])
+        self.assertIsInstance(program.functions_dict['main'], nodes.FunctionDef)
+
+    def test_fields_not_copied(self):
+        program = parse_flat(TEST_SOURCE).program()
+
+        self.assertIs(program.classes_dict, program.classes_dict)
+        self.assertIs(program.functions_dict['main'].instructions, program.functions_dict['main'].instructions)
+
+    def test_walk(self):
+        tree = parse_flat(TEST_SOURCE)
+        kinds = [tree.kind_name(index) for index in tree.walk()]
+
+        self.assertEqual(len(kinds), len(tree))
+        self.assertEqual(kinds[0], 'Program')
+        self.assertIn('FunctionDef', kinds)
+
+    def test_serialization(self):
+        tree = parse_flat(TEST_SOURCE)
+        copy = FlatTree.from_bytes(tree.to_bytes())
+
+        self.assertEqual(repr(tree.program()), repr(copy.program()))
+        self.assertEqual(list(tree.walk()), list(copy.walk()))
+
+    def test_interpret(self):
+        program = Interpreter(Visitor(parse_flat(TEST_SOURCE).program()), lib)
+        program.interpret()
+
+        self.assertEqual(program.return_val, 'szesnascie')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# Contains tests checking that trees with shared equal leaves and
+# expressions are the same as trees made without sharing, and that they
+# are interpreted the same way.
+
+import unittest
+
+import my_parser.nodes as nodes
+
+import my_interpreter.lib_methods as lib
+from lexer.source_read import StringSource, TextSource
+from my_interpreter.visitor import Visitor, Interpreter
+from my_parser.hash_consing import NodeInterner
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_interpreter_code.txt'
+
+
+def parse_shared(textSource, interner=None):
+    if interner is None:
+        interner = NodeInterner()
+
+    return Parser(64, 256, textSource, nodeFactory=interner).parse()
+
+
+def interpret(program):
+    interpreter = Interpreter(Visitor(program), lib)
+    interpreter.interpret()
+
+    return interpreter.return_val
+
+
+class HashConsingTest(unittest.TestCase):
+
+    def test_same_tree(self):
+        for path in [TEST_SOURCE, '../test_files/test_parser_simple_function.txt']:
+            expected = Parser(64, 256, TextSource(path)).parse()
+
+            self.assertEqual(repr(expected), repr(parse_shared(TextSource(path))))
+
+    def test_shared_nodes(self):
+        program = parse_shared(StringSource('{Integer main() { a = 1 + x; a = 1 + x; c = 1.0 + x; return 1; }}'))
+        first, second, third, returned = program.functions_dict['main'].instructions
+
+        self.assertIs(first.right, second.right)
+        self.assertIs(first.right.left, returned.return_value)
+        self.assertIsNot(first.right, third.right)
+        self.assertIsInstance(third.right.left, nodes.Float)
+
+        # statements are not shared
+        self.assertIsNot(first, second)
+        self.assertIs(first.left, second.left)
+
+    def test_stats(self):
+        interner = NodeInterner()
+        parse_shared(StringSource('{Integer main() { a = x; b = x; return 2; }}'), interner)
+
+        self.assertEqual(interner.stats()['Variable'], (4, 3))
+        self.assertEqual(interner.stats()['Integer'], (1, 1))
+        self.assertAlmostEqual(interner.dedup_ratio(), 1 / 5)
+
+        interner.clear()
+        self.assertEqual(len(interner), 0)
+        self.assertEqual(interner.stats()['Variable'], (4, 3))
+
+    def test_interpret(self):
+        self.assertEqual(interpret(parse_shared(TextSource(TEST_SOURCE))), 'szesnascie')
+
+    def test_refer_arguments(self):
+
+        # the same argument node is passed twice by value, before an argument
+        # passed by reference
+        text = '{Integer f(Integer a, Integer b, Integer * c) { c = a + b + 1; return c; }' \
+               'Integer main() { Integer x = 2; Integer y = 0; f(x, x, y); return y; }}'
+
+        self.assertEqual(interpret(parse_shared(StringSource(text))), 5)
+        self.assertEqual(interpret(Parser(64, 256, StringSource(text)).parse()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# Contains tests checking that tokens updated after source text edits are
+# the same as tokens of the whole edited text.
+
+import unittest
+
+from lexer.incremental_lexer import IncrementalLexer
+
+TEST_SOURCE = '../test_files/test_code.txt'
+
+
+class IncrementalLexerTest(unittest.TestCase):
+
+    def assertSameTokens(self, expected, buffer):
+
+        self.assertEqual(len(expected), len(buffer))
+        for token, view in zip(expected, buffer):
+            self.assertEqual(token, view)
+            self.assertEqual(token.print_location(), view.print_location())
+            self.assertEqual((token.startOffset, token.endOffset), (view.startOffset, view.endOffset))
+
+    def test_edits(self):
+
+        with open(TEST_SOURCE, 'r') as file:
+            text = file.read()
+
+        lexer = IncrementalLexer(text)
+        line = text.index('\n', 200) + 1
+        edits = [(0, 0, '// new first line\n'), (120, 3, 'abc'), (len(text) // 2, 10, '\n"a\nb"\n'),
+                 (line, 0, '// '), (line, 3, '')]
+
+        for offset, deleted, inserted in edits:
+            text = text[:offset] + inserted + text[offset + deleted:]
+            lexer.edit(offset, deleted, inserted)
+
+            self.assertSameTokens(IncrementalLexer(text).buffer, lexer.buffer)
+
+    def test_edits_far_apart(self):
+
+        with open(TEST_SOURCE, 'r') as file:
+            text = file.read()
+
+        # offsets after every edit are shifted lazily, edits elsewhere have to
+        # see them shifted anyway
+        lexer = IncrementalLexer(text)
+        for offset in [len(text) - 1, 0, len(text) // 2, 10, len(text) // 3, len(text)]:
+            text = text[:offset] + '\n x1 \n' + text[offset:]
+            lexer.edit(offset, 0, '\n x1 \n')
+
+            self.assertEqual(text, lexer.text)
+            self.assertSameTokens(IncrementalLexer(text).buffer, lexer.buffer)
+
+    def test_changed_range(self):
+
+        lexer = IncrementalLexer('a = 1;\nb = 2;\nc = 3;\n')
+
+        # "2" becomes "20", only that token changes and the following are shifted
+        self.assertEqual((6, 7, 7), lexer.edit(12, 0, '0'))
+        self.assertEqual(20, lexer.buffer[6].value)
+        self.assertEqual((13, 14), (lexer.buffer[7].startOffset, lexer.buffer[7].endOffset))
+        self.assertEqual('at: (3:0)', lexer.buffer[8].print_location())
+
+    def test_error_recovery(self):
+
+        lexer = IncrementalLexer('a = 1;\nb = 2;\n')
+
+        with self.assertRaises(Exception) as raised:
+            lexer.edit(11, 0, '0')
+        self.assertEqual('Unable to recognize: "0" at: (2:5)', raised.exception.message)
+
+        lexer.edit(11, 1, '')
+        self.assertSameTokens(IncrementalLexer('a = 1;\nb = 2;\n').buffer, lexer.buffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# Contains tests checking that trees updated after source text edits are
+# the same as trees of the whole edited text, and that only definitions
+# touched by an edit are parsed again.
+
+import unittest
+
+from lexer.source_read import StringSource
+from my_parser.incremental_parser import IncrementalParser, FUNCTION, CLASS
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_interpreter_code.txt'
+
+
+def parse_error(function):
+    try:
+        function()
+    except Exception as error:
+        return type(error), str(error)
+
+    return None
+
+
+class IncrementalParserTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(TEST_SOURCE, 'r') as file:
+            self.text = file.read()
+
+        self.parser = IncrementalParser(self.text)
+
+    def assertSameTree(self):
+        expected = Parser(64, 256, StringSource(self.parser.text)).parse()
+        self.assertEqual(repr(expected), repr(self.parser.program))
+
+    def test_initial_tree(self):
+        self.assertSameTree()
+
+    def test_edit_function(self):
+        program = self.parser.program
+        offset = self.text.index('return', self.text.index('main'))
+
+        changed = self.parser.edit(offset, 0, 'Integer added = 1;\n')
+
+        self.assertEqual([(FUNCTION, 'main')], changed)
+        self.assertSameTree()
+
+        # other definitions keep their trees
+        for name, function in program.functions_dict.items():
+            if name != 'main':
+                self.assertIs(function, self.parser.program.functions_dict[name])
+        for name, classdef in program.classes_dict.items():
+            self.assertIs(classdef, self.parser.program.classes_dict[name])
+
+    def test_add_and_remove_definitions(self):
+        end = self.text.rindex('}')
+
+        self.assertEqual([(FUNCTION, 'added')], self.parser.edit(end, 0, 'Void added() { a = 1; }\n'))
+        self.assertSameTree()
+
+        self.assertEqual([(CLASS, 'Added')], self.parser.edit(end, 0, 'class Added { Integer a; }\n'))
+        self.assertSameTree()
+
+        start = self.parser.text.index('class Added')
+        self.assertEqual([(CLASS, 'Added')], self.parser.edit(start, len('class Added { Integer a; }\n'), ''))
+        self.assertSameTree()
+
+    def test_white_space_edit(self):
+        offset = self.text.index('return', self.text.index('main'))
+
+        self.assertEqual([], self.parser.edit(offset, 0, '\n   '))
+        self.assertSameTree()
+
+    def test_same_printed_tree(self):
+
+        # 2.5 and 2.50 are printed the same, but are different floats
+        parser = IncrementalParser('{Double main() { return 2.5; }}')
+        offset = parser.text.index('2.5') + 3
+
+        self.assertEqual([(FUNCTION, 'main')], parser.edit(offset, 0, '0'))
+
+        value = parser.program.functions_dict['main'].instructions[0].return_value
+        self.assertEqual((2, 50, 2), (value.value, value.decimalValue, value.denominator))
+
+    def test_errors(self):
+        end = self.text.rindex('}')
+
+        # redefinitions and syntax errors are reported like by a parser of
+        # the whole text, and the tree is right again after a fix
+        for inserted in ['Integer main() { return 1; }\n', 'Void broken() { a = 1 2; }\n', 'Void f() { a = "}\n']:
+            text = self.text[:end] + inserted + self.text[end:]
+            expected = parse_error(lambda: Parser(64, 256, StringSource(text)).parse())
+
+            self.assertIsNotNone(expected)
+            self.assertEqual(expected, parse_error(lambda: self.parser.edit(end, 0, inserted)))
+
+            self.parser.edit(end, len(inserted), '')
+            self.assertSameTree()
+
+
+if __name__ == '__main__':
+    unittest.main()
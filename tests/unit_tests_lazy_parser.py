@@ -0,0 +1,79 @@
+# Contains tests checking that lazily parsed function bodies give the same
+# trees, results and errors as bodies parsed up front.
+
+import pickle
+import unittest
+
+import my_parser.nodes as nodes
+
+import my_interpreter.lib_methods as lib
+from lexer.lexer import LexerMain
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import StringSource, TextSource
+from my_interpreter.visitor import Visitor, Interpreter
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_interpreter_code.txt'
+
+
+def parse_error(text, **kwargs):
+    try:
+        program = Parser(64, 256, StringSource(text), **kwargs).parse()
+        repr(program)
+    except Exception as error:
+        return type(error), str(error)
+
+    return None
+
+
+class LazyParserTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(TEST_SOURCE, 'r') as file:
+            self.text = file.read()
+
+    def test_same_tree(self):
+        expected = repr(Parser(64, 256, TextSource(TEST_SOURCE)).parse())
+
+        self.assertEqual(expected, repr(Parser(64, 256, TextSource(TEST_SOURCE), lazy=True).parse()))
+        self.assertEqual(expected, repr(Parser(64, 256, StringSource(self.text), RegexLexer, lazy=True).parse()))
+
+    def test_bodies_parsed_on_first_use(self):
+        program = Parser(64, 256, StringSource(self.text), lazy=True).parse()
+        main = program.functions_dict['main']
+
+        self.assertIsInstance(main, nodes.LazyFunctionDef)
+        self.assertFalse(main.parsed)
+
+        instructions = main.instructions
+
+        self.assertTrue(main.parsed)
+        self.assertIs(instructions, main.instructions)
+
+    def test_interpret(self):
+        program = Interpreter(Visitor(Parser(64, 256, StringSource(self.text), lazy=True).parse()), lib)
+        program.interpret()
+
+        self.assertEqual(program.return_val, 'szesnascie')
+
+    def test_pickled_as_function_def(self):
+        program = Parser(64, 256, StringSource(self.text), lazy=True).parse()
+        loaded = pickle.loads(pickle.dumps(program))
+
+        self.assertIs(type(loaded.functions_dict['main']), nodes.FunctionDef)
+        self.assertEqual(repr(program), repr(loaded))
+
+    def test_errors(self):
+
+        # errors in bodies are reported on first use, at the same positions
+        for body in ['a = 1 2;', 'b = 1;\n    c = = 2;', 'a = "}";\n  b = 00;', '']:
+            text = '{\nVoid f()\n  {\n    ' + body + '\n  }\n}\n'
+            for lexerClass in [LexerMain, RegexLexer]:
+                expected = parse_error(text, lexerClass=lexerClass)
+
+                self.assertIsNotNone(expected)
+                self.assertEqual(expected, parse_error(text, lexerClass=lexerClass, lazy=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,8 @@
 import unittest
 
 from lexer.lexer import LexerMain
+from lexer.source_read import StringSource
+from lexer.types import TokenType
 
 
 class TestSource(unittest.TestCase):
@@ -37,6 +39,88 @@ class TestSource(unittest.TestCase):
 
         self.assertEqual(True, lexer.is_eot_token(), 'Error when checking EOF')
 
+    def test_string_source(self):
+
+        from lexer.source_read import TextSource
+        with open('../test_files/test_code.txt', 'r') as file:
+            text = file.read()
+
+        file_lexer = LexerMain(64, 256, TextSource('../test_files/test_code.txt'))
+        string_lexer = LexerMain.from_string(text)
+
+        while not file_lexer.is_eot_token():
+            expected = file_lexer.get_token()
+            token = string_lexer.get_token()
+
+            self.assertEqual(expected, token)
+            self.assertEqual(expected.print_location(), token.print_location())
+
+        self.assertEqual(True, string_lexer.is_eot_token(), 'Error when checking EOF')
+
+    def test_positions(self):
+
+        lexer = LexerMain.from_string("a\n  bb\n\n\tc = 00")
+
+        locations = [lexer.get_token().print_location() for _ in range(4)]
+        self.assertEqual(['at: (1:0)', 'at: (2:2)', 'at: (4:1)', 'at: (4:3)'], locations)
+
+        with self.assertRaises(Exception) as raised:
+            lexer.get_token()
+        self.assertEqual('Unable to recognize: "0" at: (4:6)', raised.exception.message)
+
+    def test_shared_tokens(self):
+
+        lexer = LexerMain(64, 256, StringSource("a + b + 1"), trackPositions=False)
+        tokens = [lexer.get_token() for _ in range(5)]
+
+        self.assertIs(tokens[1], tokens[3])
+        self.assertEqual(None, tokens[0].start)
+        self.assertEqual(1, tokens[4].value)
+
+    def test_span_values(self):
+
+        lexer = LexerMain.from_string('"a\\"b\\\\" // note\nname')
+        token = lexer.get_token()
+
+        self.assertEqual(None, token._value)
+        self.assertEqual('a"b\\', token.value)
+        self.assertEqual('name', lexer.get_token().value)
+
+    def test_interned_identifiers(self):
+
+        lexer = LexerMain.from_string("value = other + value")
+        tokens = [lexer.get_token() for _ in range(5)]
+
+        self.assertIs(tokens[0].value, tokens[4].value)
+        self.assertEqual(['value', 'other'], lexer.symbolTable.names)
+        self.assertEqual(1, lexer.symbolTable.symbol_id('other'))
+
+    def test_iteration_and_lookahead(self):
+
+        with open('../test_files/test_code.txt', 'r') as file:
+            text = file.read()
+
+        expected = list(LexerMain.from_string(text))
+        self.assertEqual(TokenType.EOT, expected[-1].type)
+
+        lexer = LexerMain.from_string(text)
+        tokens = lexer.get_tokens(10)
+
+        while not lexer.is_eot_token():
+            start = lexer.startOffset
+            peeked = [lexer.peek(k) for k in (3, 1, 2)]
+
+            # reading ahead doesn't change the current token
+            self.assertEqual(start, lexer.startOffset)
+
+            tokens.append(lexer.get_token())
+            self.assertEqual(peeked[1], tokens[-1])
+            tokens.extend(lexer.get_tokens(2))
+
+        self.assertEqual(expected, tokens)
+        self.assertEqual([], lexer.get_tokens(10))
+        self.assertEqual(TokenType.EOT, lexer.peek(1).type)
+
 
 if __name__ == '__main__':
     unittest.main()
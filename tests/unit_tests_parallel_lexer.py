@@ -0,0 +1,59 @@
+# Contains tests checking that parallel tokenization of a text split into
+# chunks gives the same tokens as the sequential lexer.
+
+import unittest
+
+from lexer.lexer import LexerMain
+from lexer.parallel_lexer import find_split_offsets, tokenize_parallel
+from lexer.source_read import StringSource
+from lexer.token_buffer import TokenBuffer
+
+TEST_SOURCE = '../test_files/test_code.txt'
+
+
+class ParallelLexerTest(unittest.TestCase):
+
+    def assertSameTokens(self, text, **kwargs):
+
+        expected = TokenBuffer.from_lexer(LexerMain(64, 256, StringSource(text)))
+        buffer = tokenize_parallel(text, **kwargs)
+
+        self.assertEqual(len(expected), len(buffer))
+        for view, token in zip(buffer, expected):
+            self.assertEqual(token, view)
+            self.assertEqual(token.print_location(), view.print_location())
+
+    def test_same_tokens_as_lexer(self):
+
+        with open(TEST_SOURCE, 'r') as file:
+            text = file.read()
+
+        self.assertSameTokens(text, workers=1, chunkCount=7)
+        self.assertSameTokens(text * 3, workers=2, chunkCount=5)
+
+    def test_no_split_inside_strings(self):
+
+        text = 'a = "x\n// y\n\\"\nz";\n// "\nb = 1;\n'
+
+        self.assertEqual([text.index('// "'), text.index('b')], find_split_offsets(text, 4))
+        self.assertSameTokens(text, workers=1, chunkCount=4)
+
+    def test_error_position(self):
+
+        text = 'a = 1;\nb = 2;\nc = 00;\n'
+
+        with self.assertRaises(Exception) as raised:
+            tokenize_parallel(text, workers=1, chunkCount=3)
+        self.assertEqual('Unable to recognize: "0" at: (3:5)', raised.exception.message)
+
+    def test_unknown_char(self):
+
+        text = 'a = 1;\nb = 2;\nc = $;\nd = 4;\n'
+
+        with self.assertRaises(Exception) as raised:
+            tokenize_parallel(text, workers=1, chunkCount=3)
+        self.assertEqual('Unable to recognize: "$" at: (3:4)', raised.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
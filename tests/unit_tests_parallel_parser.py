@@ -0,0 +1,60 @@
+# Contains tests checking that programs split between top-level definitions
+# and parsed in parts give the same trees and errors as the sequential parser.
+
+import unittest
+
+from lexer.source_read import StringSource
+from my_parser.parallel_parser import find_definition_ends, find_split_offsets, parse_parallel
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_interpreter_code.txt'
+
+
+def parse_error(function):
+    try:
+        function()
+    except Exception as error:
+        return type(error), str(getattr(error, 'message', error))
+
+    return None
+
+
+class ParallelParserTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(TEST_SOURCE, 'r') as file:
+            self.text = file.read()
+
+    def test_same_tree_as_parser(self):
+        expected = repr(Parser(64, 256, StringSource(self.text)).parse())
+
+        for chunkCount in [2, 3, 100]:
+            self.assertEqual(expected, repr(parse_parallel(self.text, workers=1, chunkCount=chunkCount)))
+        self.assertEqual(expected, repr(parse_parallel(self.text, workers=2)))
+
+    def test_no_split_inside_strings_and_comments(self):
+        text = '{\nVoid f() { a = "}}"; }\n// }\nVoid g() { b = 1; }\nclass A { Integer c; }\n}\n'
+
+        self.assertEqual([text.index('\n// }'), text.index('\nclass'), text.rindex('}') - 1],
+                         find_definition_ends(text))
+        self.assertEqual([text.index('\n// }'), text.index('\nclass')], find_split_offsets(text, 10))
+
+    def test_redefinition(self):
+        text = '{\nVoid f() { a = 1; }\nVoid g() { a = 1; }\nVoid f() { a = 2; }\n}\n'
+
+        expected = parse_error(lambda: Parser(64, 256, StringSource(text)).parse())
+
+        self.assertIsNotNone(expected)
+        self.assertEqual(expected, parse_error(lambda: parse_parallel(text, workers=1, chunkCount=3)))
+
+    def test_error_position(self):
+        text = self.text.replace('return', 'return return', 1)
+
+        expected = parse_error(lambda: Parser(64, 256, StringSource(text)).parse())
+
+        self.assertIsNotNone(expected)
+        self.assertEqual(expected, parse_error(lambda: parse_parallel(text, workers=1, chunkCount=4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
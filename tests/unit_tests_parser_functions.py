@@ -1,7 +1,7 @@
 import unittest
 
 import nodes
-from my_parser.parser import Parser
+from my_parser.parser import Parser, PrattParser, StackParser
 
 from lexer.source_read import TextSource
 from lexer.types import TokenType
@@ -9,6 +9,25 @@ from lexer.types import TokenType
 TEST_SOURCE_1_LINE = '../test_files/test_lexer_singleLineReadExample.txt'
 
 
+def count_calls(parserClass, names, text):
+
+    # Parses text with a subclass of parserClass, which overrides methods of
+    # the given names, and returns how many times each of them was called.
+    calls = dict.fromkeys(names, 0)
+
+    def counted(name):
+        def method(self):
+            calls[name] += 1
+            return getattr(parserClass, name)(self)
+
+        return method
+
+    subclass = type('Counting' + parserClass.__name__, (parserClass,), {name: counted(name) for name in names})
+    subclass.from_string(text).parse()
+
+    return calls
+
+
 def put_line_in_lexer_text_source(parser, line):
     parser.lexer.textSource.text = line[1:]
     parser.lexer.current_char = line[0]
@@ -127,6 +146,12 @@ class ParserFunctionsTest(unittest.TestCase):
         self.assertEqual(par[2].instructions[0].right.left, nodes.Variable("a"))
         self.assertEqual(par[2].instructions[0].right.right, nodes.Variable("b"))
 
+    def test_overridden_parsers(self):
+        calls = count_calls(type(self.parser), ['_parse_while', '_parse_integer_value', '_parse_return'],
+                            '{ Integer main() { while (a) { x = 1; } return 2; } }')
+
+        self.assertEqual(calls, {'_parse_while': 1, '_parse_integer_value': 2, '_parse_return': 1})
+
     def test(self):
         line = "class Klasa{Integer a = 0;Integer b;Boolean c;Integer someMethod(){a = a + b;return a;}Void addOne(" \
                "Integer * x){x = x + 1;}} "
@@ -149,5 +174,76 @@ class ParserFunctionsTest(unittest.TestCase):
         self.assertEqual(par, expected)
 
 
+# Runs the tests above with conditions and expressions parsed by
+# precedence climbing, which should build the same trees.
+class PrattParserFunctionsTest(ParserFunctionsTest):
+
+    def setUp(self) -> None:
+        self.parser = PrattParser(64, 256, TextSource(TEST_SOURCE_1_LINE))
+
+    def test_same_trees(self):
+        conditions = ["a + b * c - d / e", "a - b - c", "a < b + 1 == c > d", "!a + 1 >= b & true | c != false",
+                      "!(a | b) == !c", "(a + b) * f(x, y <= z) - o.m(1, \"s\").b", "true == false & 1.5 < 2"]
+
+        for condition in conditions:
+            expected = Parser.from_string(condition)._parse_condition()
+            result = PrattParser.from_string(condition)._parse_condition()
+            self.assertEqual(repr(expected), repr(result))
+
+        for path in ['../test_files/test_interpreter_code.txt', '../test_files/test_parser_simple_function.txt']:
+            with open(path, 'r') as file:
+                text = file.read()
+            self.assertEqual(repr(Parser.from_string(text).parse()), repr(PrattParser.from_string(text).parse()))
+
+    def test_non_associative_operators(self):
+        for condition in ["a < b < c", "a == b != c", "!a < b > c", "true < a"]:
+            parser = PrattParser.from_string(condition)
+            parser._parse_condition()
+            self.assertNotEqual(parser.current_token.type, TokenType.EOT)
+
+
+# Runs the tests above with the parser without recursion.
+class StackParserFunctionsTest(PrattParserFunctionsTest):
+
+    def setUp(self) -> None:
+        self.parser = StackParser(64, 256, TextSource(TEST_SOURCE_1_LINE))
+
+    def test_same_blocks(self):
+        blocks = ["{ if (a) { x = 1; } else { if (b) { y = 2; } } while (c) { { z = 3; } } return; }",
+                  "{ if (a) { } else { y = 1; } Integer i = f(1, (2)); }"]
+
+        for block in blocks:
+            expected = Parser.from_string(block)._parse_block()
+            result = StackParser.from_string(block)._parse_block()
+            self.assertEqual(repr(expected), repr(result))
+
+    def test_overridden_parsers(self):
+
+        # while statements are parsed by the block loop itself
+        calls = count_calls(StackParser, ['_parse_integer_value', '_parse_return'],
+                            '{ Integer main() { while (a) { x = 1; } return 2; } }')
+
+        self.assertEqual(calls, {'_parse_integer_value': 2, '_parse_return': 1})
+
+    def test_deep_nesting(self):
+        depth = 5000
+        text = "{ " + "while (a) { " * depth + "x = " + "(" * depth + "1" + ")" * depth + " + " + "f(" * depth + \
+               ")" * depth + ";" + " }" * depth + " }"
+
+        instructions = StackParser.from_string(text)._parse_block()
+
+        for _ in range(depth):
+            self.assertEqual(instructions[0].__class__.__name__, "WhileStat")
+            instructions = instructions[0].instructions
+
+        expression = instructions[0].right
+        self.assertEqual(expression.left.value, 1)
+
+        call = expression.right
+        for _ in range(depth - 1):
+            call = call.params[0]
+        self.assertEqual(call, nodes.FunctionCall(nodes.Variable("f"), []))
+
+
 if __name__ == '__main__':
     unittest.main()
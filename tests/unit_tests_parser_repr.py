@@ -24,6 +24,66 @@ class ParserTest(unittest.TestCase):
 
         self.assertEqual(program_repr, expected_repr)
 
+    def test_string_source(self):
+        with open('../test_files/test_parser_simple_function.txt', 'r') as file:
+            text = file.read()
+
+        parser = Parser.from_string(text)
+
+        program = parser.parse()
+
+        expected_repr = "Program:\nFunction:\nName:pow\nType:TokenType.K_VOID\nParameters:\nParameter:\nName:x\nType" \
+                        ":TokenType.K_DOUBLE\nRefer:True\nInstructions:\nAssign:\nLeft assign " \
+                        "operand:\nVariable:\nx\nRight assign operand:\nMul:\nLeft mul operand:\nVariable:\nx\nRight " \
+                        "mul operand:\nVariable:\nx"
+
+        self.assertEqual(program.__repr__(), expected_repr)
+
+    def test_slotted_nodes(self):
+        import my_parser.nodes as nodes
+
+        for node_class in vars(nodes).values():
+            if isinstance(node_class, type) and node_class.__module__ == nodes.__name__:
+                self.assertIn('__slots__', vars(node_class))
+
+        with open('../test_files/test_interpreter_code.txt', 'r') as file:
+            program = Parser.from_string(file.read()).parse()
+
+        self.assertFalse(hasattr(program, '__dict__'))
+        for function in program.functions_dict.values():
+            self.assertFalse(hasattr(function, '__dict__'))
+            for instruction in function.instructions:
+                self.assertFalse(hasattr(instruction, '__dict__'))
+
+    def test_iter_definitions(self):
+        with open('../test_files/test_interpreter_code.txt', 'r') as file:
+            text = file.read()
+
+        program = Parser.from_string(text).parse()
+        parser = Parser.from_string(text)
+
+        definitions = list(parser.iter_definitions())
+        expected = list(program.functions_dict.values()) + list(program.classes_dict.values())
+
+        self.assertEqual(sorted(map(repr, expected)), sorted(map(repr, definitions)))
+
+        # only names of streamed definitions are kept
+        self.assertEqual(list(program.functions_dict), list(parser.functions_dict))
+        self.assertEqual({None}, set(parser.functions_dict.values()) | set(parser.classes_dict.values()))
+
+    def test_iter_definitions_errors(self):
+
+        # definitions before an error are still streamed, then the error of
+        # parse is raised
+        for text in ['{\nVoid f() { a = 1; }\nVoid f() { a = 2; }\n}', '{\nVoid f() { a = 1; }\n} x']:
+            with self.assertRaises(Exception) as raised:
+                Parser.from_string(text).parse()
+
+            definitions = Parser.from_string(text).iter_definitions()
+
+            self.assertEqual('f', next(definitions).name)
+            with self.assertRaises(type(raised.exception)):
+                next(definitions)
 
 if __name__ == '__main__':
     unittest.main()
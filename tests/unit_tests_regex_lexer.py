@@ -0,0 +1,59 @@
+# Contains tests checking if the regex lexer engine produces the same
+# tokens and errors as the default LexerMain engine.
+
+import unittest
+
+from lexer.lexer import LexerMain
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import TextSource
+from lexer.token import TokenWithValue
+from lexer.types import TokenType
+
+TEST_SOURCE = '../test_files/test_code.txt'
+
+
+def get_all_tokens(lexer):
+    tokens = []
+
+    while not lexer.is_eot_token():
+        tokens.append(lexer.get_token())
+
+    return tokens
+
+
+class RegexLexerTest(unittest.TestCase):
+
+    def test_same_tokens_as_lexer_main(self):
+
+        expected = get_all_tokens(LexerMain(64, 256, TextSource(TEST_SOURCE)))
+        tokens = get_all_tokens(RegexLexer(64, 256, TextSource(TEST_SOURCE)))
+
+        self.assertEqual(expected, tokens)
+        self.assertEqual([token.print_location() for token in expected],
+                         [token.print_location() for token in tokens])
+
+    def test_multiline_string_and_comments(self):
+
+        line = "a = \"first\nse\\\"cond\"; // comment\n  b // last"
+        tokens = get_all_tokens(RegexLexer.from_string(line))
+
+        self.assertEqual(TokenWithValue(TokenType.VALUE_STRING, 'first\nse"cond'), tokens[2])
+        self.assertEqual(TokenWithValue(TokenType.VALUE_ID, 'b'), tokens[4])
+        self.assertEqual('at: (3:2)', tokens[4].print_location())
+        self.assertEqual(TokenType.EOT, tokens[5].type)
+
+    def test_errors(self):
+
+        lines = ["a = 00.5;", "\n  \"too long string\"", "long_identifier_name"]
+
+        for line in lines:
+            with self.assertRaises(Exception) as expected:
+                get_all_tokens(LexerMain.from_string(line, 8, 8))
+            with self.assertRaises(Exception) as raised:
+                get_all_tokens(RegexLexer.from_string(line, 8, 8))
+
+            self.assertEqual(expected.exception.message, raised.exception.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# Contains tests checking the columnar TokenBuffer storage and parsing
+# of an already tokenized text.
+
+import unittest
+
+from lexer.lexer import LexerMain
+from lexer.regex_lexer import RegexLexer
+from lexer.source_read import TextSource
+from lexer.token_buffer import TokenBuffer
+from lexer.types import TokenType
+from my_parser.parser import Parser
+
+TEST_SOURCE = '../test_files/test_code.txt'
+TEST_PARSER_SOURCE = '../test_files/test_parser_simple_function.txt'
+
+
+class TokenBufferTest(unittest.TestCase):
+
+    def test_same_tokens_as_lexer(self):
+
+        for lexerClass in [LexerMain, RegexLexer]:
+            buffer = TokenBuffer.from_lexer(lexerClass(64, 256, TextSource(TEST_SOURCE)))
+            lexer = LexerMain(64, 256, TextSource(TEST_SOURCE))
+
+            for view in buffer:
+                token = lexer.get_token()
+
+                self.assertEqual(token, view)
+                self.assertEqual(token.print_location(), view.print_location())
+
+            self.assertEqual(True, lexer.is_eot_token())
+
+    def test_offsets_and_values(self):
+
+        buffer = TokenBuffer.from_string("x = 2.50; y = x;")
+
+        self.assertEqual(TokenType.VALUE_DOUBLE, buffer[2].type)
+        self.assertEqual((2, 50, 2), (buffer[2].value, buffer[2].decimalValue, buffer[2].denominator))
+        self.assertEqual((4, 8), (buffer[2].startOffset, buffer[2].endOffset))
+        self.assertEqual(TokenType.EOT, buffer[-1].type)
+
+        # identifier "x" is stored in the values table only once
+        self.assertEqual(buffer.valueIndexes[0], buffer.valueIndexes[6])
+
+    def test_parser_from_tokens(self):
+
+        with open(TEST_PARSER_SOURCE, 'r') as file:
+            text = file.read()
+
+        expected = Parser.from_string(text).parse()
+        program = Parser.from_tokens(TokenBuffer.from_string(text)).parse()
+
+        self.assertEqual(expected.__repr__(), program.__repr__())
+
+
+if __name__ == '__main__':
+    unittest.main()